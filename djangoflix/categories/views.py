@@ -1,18 +1,20 @@
 """Views for Category API."""
 from categories.serializers import CategorySerializer
 
-from rest_framework import authentication, permissions
+from rest_framework import permissions
 from rest_framework import viewsets
 
+from core.conditional import StaleWhileRevalidateMixin
 from core.models import Category
+from user.authentication import CachedTokenAuthentication
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(StaleWhileRevalidateMixin, viewsets.ModelViewSet):
     """View for playlist APIs."""
 
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
@@ -1,6 +1,7 @@
 """
 Django admin customization.
 """
+from django import forms
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
@@ -10,8 +11,30 @@ from core import models
 from core.db.models import PlaylistTypeChoices
 
 
+class TaggedItemForm(forms.ModelForm):
+    """Edit the tag as text; it is interned into the Tag table on save."""
+
+    tag = forms.SlugField(max_length=50)
+
+    class Meta:
+        model = models.TaggedItem
+        fields = ["tag"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.tag_id is not None:
+            self.initial["tag"] = self.instance.tag.name
+
+    def clean_tag(self):
+        # Reuse an existing row so validate_unique can see duplicates; a
+        # new name is only created when the item is saved.
+        name = self.cleaned_data["tag"]
+        return models.Tag.objects.filter(name=name).first() or name
+
+
 class TaggedItemInline(GenericTabularInline):
     model = models.TaggedItem
+    form = TaggedItemForm
     extra = 0
 
 
@@ -193,6 +216,7 @@ admin.site.register(models.Category)
 
 
 class TaggedItemAdmin(admin.ModelAdmin):
+    form = TaggedItemForm
     fields = ["tag", "content_type", "object_id", "content_object"]
     readonly_fields = ["content_object"]
 
@@ -201,3 +225,5 @@ class TaggedItemAdmin(admin.ModelAdmin):
 
 
 admin.site.register(models.TaggedItem, TaggedItemAdmin)
+
+admin.site.register(models.Tag)
@@ -0,0 +1,280 @@
+"""Caches for catalog pages, fragments and API representations."""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404
+from django.template.loader import get_template
+from django.utils.cache import patch_cache_control
+from django.utils.safestring import mark_safe
+
+from core.singleflight import get_or_compute, get_or_revalidate
+
+CATALOG_VERSION_KEY = "catalog:version"
+CATALOG_CHANGED_KEY = "catalog:changed"
+
+# Stored counters that change a row without touching ``updated``; cached
+# fragments and representations are keyed on them.
+FRAGMENT_COUNTER_FIELDS = ["season_count", "episode_count"]
+
+
+def _initial_version():
+    # Start from the clock so a cache flush never reissues an old version.
+    return time.time_ns() // 1000
+
+
+def catalog_version():
+    """Return the current catalog version."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _initial_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def catalog_changed_at():
+    """Unix time of the last catalog change, or of the cache start."""
+    changed_at = cache.get(CATALOG_CHANGED_KEY)
+    if changed_at is None:
+        cache.add(CATALOG_CHANGED_KEY, time.time(), timeout=None)
+        changed_at = cache.get(CATALOG_CHANGED_KEY)
+    return changed_at
+
+
+def bump_catalog_version():
+    """Orphan every cached catalog page."""
+    cache.set(CATALOG_CHANGED_KEY, time.time(), timeout=None)
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, _initial_version(), timeout=None)
+        return cache.get(CATALOG_VERSION_KEY)
+
+
+def generation_scope(model):
+    """Name the generation scope that covers every row of ``model``."""
+    return model._meta.concrete_model._meta.label_lower
+
+
+def object_scope(model, pk):
+    """Name the generation scope of one row of ``model``."""
+    return f"{generation_scope(model)}:{pk}"
+
+
+def show_scope(show_id):
+    """Name the generation scope of one show, its seasons and episodes."""
+    return f"show:{show_id}"
+
+
+def _generation_key(scope):
+    return f"generation:{scope}"
+
+
+def get_generations(scopes):
+    """Return {scope: generation} for ``scopes`` with one ``get_many``.
+
+    Scopes never bumped are seeded from the clock. With the two tier
+    backend the lookup is answered in-process for ``L1_TIMEOUT`` seconds,
+    so embedding generations in the representation keys costs no round
+    trip on hot paths.
+    """
+    keys = {_generation_key(scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        cache.add(key, _initial_version(), timeout=None)
+        found[key] = cache.get(key)
+    return {scope: found[key] for key, scope in keys.items()}
+
+
+def generation_stamps(scope_lists):
+    """Return one stamp per list of scopes, read with a single lookup."""
+    scope_lists = [sorted(set(scopes)) for scopes in scope_lists]
+    generations = get_generations(
+        {scope for scopes in scope_lists for scope in scopes}
+    )
+    return [
+        ";".join(f"{scope}={generations[scope]}" for scope in scopes)
+        for scopes in scope_lists
+    ]
+
+
+def generation_stamp(scopes):
+    """Join the generations of ``scopes`` for use inside a cache key."""
+    return generation_stamps([scopes])[0]
+
+
+def bump_generations(scopes):
+    """Move ``scopes`` to a new generation on every node at once.
+
+    Returns {scope: new generation}.
+    """
+    generations = {}
+    for scope in set(scopes):
+        key = _generation_key(scope)
+        try:
+            generations[scope] = cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), timeout=None)
+            generations[scope] = cache.get(key)
+    return generations
+
+
+def missing_object_key(request, ignore_case=False):
+    path = request.path.lower() if ignore_case else request.path
+    path = hashlib.md5(path.encode()).hexdigest()
+    return f"catalog:missing:{catalog_version()}:{path}"
+
+
+def page_cache_key(request):
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"catalog:page:{catalog_version()}:{url}"
+
+
+def stale_page_cache_key(request):
+    # Unversioned: the entry records the version it was rendered at.
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"catalog:stale-page:{url}"
+
+
+def is_ok(response):
+    return response.status_code == 200
+
+
+class CachedPageMixin:
+    """Serve anonymous GET requests from the shared cache.
+
+    Rendered responses are stored under the request URL and the catalog
+    version, so a catalog change makes every stored page unreachable at
+    once and the next request renders afresh. Entries also expire after
+    ``CATALOG_CACHE_TIMEOUT`` seconds, which bounds how late a scheduled
+    publish shows up. Concurrent misses on one URL render it once.
+
+    With ``page_cache_stale`` the last page rendered is kept for
+    ``CATALOG_STALE_TIMEOUT`` seconds more and served at once after a
+    catalog change or expiry while a background thread renders the new
+    one, with a matching ``stale-while-revalidate`` header.
+    """
+
+    page_cache_enabled = True
+    page_cache_stale = False
+
+    def dispatch(self, request, *args, **kwargs):
+        cacheable = (
+            self.page_cache_enabled
+            and request.method in ("GET", "HEAD")
+            and not request.user.is_authenticated
+        )
+        if not cacheable:
+            return super().dispatch(request, *args, **kwargs)
+
+        dispatch = super().dispatch
+
+        def render():
+            response = dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+            return response
+
+        timeout = getattr(settings, "CATALOG_CACHE_TIMEOUT", 300)
+        if not self.page_cache_stale:
+            return get_or_compute(
+                page_cache_key(request), render, timeout, cacheable=is_ok
+            )
+
+        stale_timeout = getattr(settings, "CATALOG_STALE_TIMEOUT", 60)
+        entry = get_or_revalidate(
+            stale_page_cache_key(request),
+            render,
+            timeout,
+            stale_timeout,
+            version=catalog_version(),
+            cacheable=is_ok,
+        )
+        response = entry["value"]
+        if is_ok(response):
+            patch_cache_control(
+                response,
+                max_age=max(0, int(entry["fresh_until"] - time.time())),
+                stale_while_revalidate=stale_timeout,
+            )
+        return response
+
+
+class MissingObjectCacheMixin:
+    """Remember detail lookups that found nothing.
+
+    A 404 is stored under the path and the catalog version for
+    ``MISSING_OBJECT_CACHE_TIMEOUT`` seconds, so repeated hits on unknown
+    slugs skip the database. Creating or publishing anything bumps the
+    version and clears every entry; the short timeout covers scheduled
+    publishing. Views that match slugs case-insensitively set
+    ``missing_object_ignore_case`` so every spelling shares one entry.
+    """
+
+    missing_object_ignore_case = False
+
+    def get(self, request, *args, **kwargs):
+        key = missing_object_key(request, self.missing_object_ignore_case)
+        if cache.get(key):
+            raise Http404
+        try:
+            return super().get(request, *args, **kwargs)
+        except Http404:
+            timeout = getattr(settings, "MISSING_OBJECT_CACHE_TIMEOUT", 60)
+            cache.set(key, True, timeout)
+            raise
+
+
+def fragment_cache_key(template_name, obj):
+    """Key a rendered fragment on the object's id, ``updated`` stamp and
+    stored child counters, so any change to them misses the cache.
+    """
+    updated = getattr(obj, "updated", None)
+    parts = [
+        template_name,
+        obj._meta.label_lower,
+        obj.pk,
+        updated.timestamp() if updated else "",
+    ]
+    parts += [getattr(obj, field, "") for field in FRAGMENT_COUNTER_FIELDS]
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return f"catalog:fragment:{digest}"
+
+
+def render_fragments(template_name, objects, context_name="instance"):
+    """Render ``template_name`` once per object, reusing cached output.
+
+    All keys are fetched with one ``get_many`` and only the objects that
+    missed are rendered and stored with one ``set_many``.
+    """
+    objects = list(objects)
+    keys = [fragment_cache_key(template_name, obj) for obj in objects]
+    cached = cache.get_many(keys)
+    template = get_template(template_name)
+    rendered = {}
+    fragments = []
+    for key, obj in zip(keys, objects):
+        html = cached.get(key)
+        if html is None:
+            html = rendered[key] = template.render({context_name: obj})
+        fragments.append(mark_safe(html))
+    if rendered:
+        cache.set_many(
+            rendered, getattr(settings, "FRAGMENT_CACHE_TIMEOUT", 3600)
+        )
+    return fragments
+
+
+def representation_cache_key(obj, stamp=""):
+    """Key a serialized object on its model, id, ``updated`` stamp and
+    stored counters, plus ``stamp``: the generations of the related
+    models nested in it. Any change to them misses the cache.
+    """
+    label = obj._meta.concrete_model._meta.label_lower
+    updated = getattr(obj, "updated", None)
+    parts = [label, obj.pk, updated.timestamp() if updated else "", stamp]
+    parts += [getattr(obj, field, "") for field in FRAGMENT_COUNTER_FIELDS]
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return f"catalog:repr:{label}:{obj.pk}:{digest}"
@@ -0,0 +1,196 @@
+"""Cache backend with an in-process LRU in front of a shared cache."""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# One LRU per shared alias and limits, shared by the process's threads.
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+class LocalStore:
+    """Bounded map of key -> (pickled value, expiry) with hit counters."""
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, pickled, timeout):
+        expires = time.monotonic() + timeout
+        with self.lock:
+            self.entries[key] = (pickled, expires)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class TwoTierCache(BaseCache):
+    """Serve hot keys from a per-process LRU, backed by a shared cache.
+
+    ``LOCATION`` names the shared cache alias. Local entries live for at
+    most ``OPTIONS["L1_TIMEOUT"]`` seconds, which bounds how long another
+    node's write can go unseen; writes, deletes and ``incr`` from this
+    process update both tiers at once. Version bumps move keys to a new
+    name, so entries under the old version are dropped locally too.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared_alias = location
+        max_size = options.get("L1_MAX_ENTRIES", 1000)
+        timeout = options.get("L1_TIMEOUT", 5)
+        with _stores_lock:
+            self._store = _stores.setdefault(
+                (location, max_size, timeout), LocalStore(max_size, timeout)
+            )
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _local_key(self, key, version):
+        return self.shared.make_key(key, version=version)
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self._store.timeout
+        return min(timeout, self._store.timeout)
+
+    def _remember(self, key, value, timeout=DEFAULT_TIMEOUT):
+        local_timeout = self._local_timeout(timeout)
+        if local_timeout <= 0:
+            self._store.delete(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._store.set(key, pickled, local_timeout)
+
+    def get(self, key, default=None, version=None):
+        local_key = self._local_key(key, version)
+        pickled = self._store.get(local_key)
+        if pickled is not None:
+            return pickle.loads(pickled)
+        value = self.shared.get(key, self._missing_key, version=version)
+        if value is self._missing_key:
+            return default
+        self._remember(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = []
+        for key in keys:
+            pickled = self._store.get(self._local_key(key, version))
+            if pickled is None:
+                missing.append(key)
+            else:
+                found[key] = pickle.loads(pickled)
+        if missing:
+            shared = self.shared.get_many(missing, version=version)
+            for key, value in shared.items():
+                self._remember(self._local_key(key, version), value)
+            found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._remember(self._local_key(key, version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            local_key = self._local_key(key, version)
+            if key in failed:
+                self._store.delete(local_key)
+            else:
+                self._remember(local_key, value, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        local_key = self._local_key(key, version)
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._remember(local_key, value, timeout)
+        else:
+            # Another writer got there first; read their value next time.
+            self._store.delete(local_key)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self._store.delete(self._local_key(key, version))
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        local_key = self._local_key(key, version)
+        try:
+            value = self.shared.incr(key, delta, version=version)
+        except ValueError:
+            self._store.delete(local_key)
+            raise
+        self._remember(local_key, value)
+        return value
+
+    def has_key(self, key, version=None):
+        if self._store.get(self._local_key(key, version)) is not None:
+            return True
+        return self.shared.has_key(key, version=version)  # noqa: W601
+
+    def delete(self, key, version=None):
+        self._store.delete(self._local_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self._store.delete(*(self._local_key(key, version) for key in keys))
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self._store.clear()
+        self.shared.clear()
+
+    def clear_local(self):
+        """Drop this process's entries, keeping the shared tier."""
+        self._store.clear()
+
+    def stats(self):
+        """Return local hit and miss counts and the current size."""
+        store = self._store
+        with store.lock:
+            return {
+                "hits": store.hits,
+                "misses": store.misses,
+                "size": len(store.entries),
+                "max_size": store.max_size,
+            }
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
@@ -0,0 +1,184 @@
+"""Conditional GET support for the API viewsets."""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.response import Response
+
+from core.cache import catalog_changed_at, catalog_version
+from core.singleflight import get_or_revalidate
+
+
+def list_cache_key(request):
+    parts = [
+        request.user.pk,
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+    ]
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return f"catalog:list:{digest}"
+
+
+class ConditionalGetMixin:
+    """Answer unchanged list and detail requests with 304 Not Modified.
+
+    The validators come from the rows the response would contain (count,
+    highest id and latest ``last_modified_field``): one aggregate query
+    for a detail, and the current page's keys for a paginated list. They
+    are combined with ``get_validator_version()``, by default the catalog
+    version, which moves on every catalog save or delete, including
+    nested tags and categories. Nothing is serialized to decide on a 304.
+    """
+
+    last_modified_field = "updated"
+
+    def get_validator_version(self):
+        """Return a value that moves whenever the response may change."""
+        return catalog_version()
+
+    def get_validators(self, queryset):
+        """Return the row count, ETag and Last-Modified for ``queryset``."""
+        aggregates = {"count": Count("pk"), "max_id": Max("pk")}
+        if self.last_modified_field:
+            aggregates["updated"] = Max(self.last_modified_field)
+        values = queryset.order_by().aggregate(**aggregates)
+        return self.build_validators(values)
+
+    def get_list_validators(self, queryset):
+        """Validators of the requested page, read without a full scan."""
+        if self.paginator is None:
+            return self.get_validators(queryset)
+        fields = [queryset.model._meta.pk.name]
+        if self.last_modified_field:
+            fields.append(self.last_modified_field)
+        queryset = queryset.select_related(None).prefetch_related(None)
+        page = self.paginate_queryset(queryset.only(*fields))
+        values = {
+            "count": len(page),
+            "max_id": max((obj.pk for obj in page), default=None),
+        }
+        if self.last_modified_field:
+            values["updated"] = max(
+                (getattr(obj, self.last_modified_field) for obj in page),
+                default=None,
+            )
+        return self.build_validators(values)
+
+    def build_validators(self, values):
+        request = self.request
+        parts = [
+            self.get_validator_version(),
+            values["count"],
+            values["max_id"],
+            values.get("updated"),
+            request.user.pk,
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+        ]
+        etag = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+        last_modified = catalog_changed_at()
+        if values.get("updated") is not None:
+            last_modified = max(last_modified, values["updated"].timestamp())
+        return values["count"], quote_etag(etag), math.ceil(last_modified)
+
+    def conditional_response(
+        self, validators, view, request, *args, **kwargs
+    ):
+        count, etag, last_modified = validators
+        if count:
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                return response
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(
+            self.get_list_validators(queryset),
+            super().list,
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Let get_object() turn a malformed lookup into a 404.
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(
+            self.get_validators(queryset),
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+
+class StaleWhileRevalidateMixin(ConditionalGetMixin):
+    """Serve list responses from the cache, refreshing stale ones late.
+
+    The serialized list is stored per user and URL together with its
+    validators, so a stale body keeps its own ETag. After a catalog
+    change or ``CATALOG_CACHE_TIMEOUT`` seconds the entry is stale: it is
+    still served for up to ``CATALOG_STALE_TIMEOUT`` seconds while one
+    background thread rebuilds it.
+    """
+
+    def list(self, request, *args, **kwargs):
+        build_list = super(ConditionalGetMixin, self).list
+
+        def compute():
+            queryset = self.filter_queryset(self.get_queryset())
+            count, etag, last_modified = self.get_list_validators(queryset)
+            return {
+                "data": build_list(request, *args, **kwargs).data,
+                "count": count,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+
+        stale_timeout = getattr(settings, "CATALOG_STALE_TIMEOUT", 60)
+        entry = get_or_revalidate(
+            list_cache_key(request),
+            compute,
+            getattr(settings, "CATALOG_CACHE_TIMEOUT", 300),
+            stale_timeout,
+            version=catalog_version(),
+        )
+        cached = entry["value"]
+        response = None
+        if cached["count"]:
+            response = get_conditional_response(
+                request,
+                etag=cached["etag"],
+                last_modified=cached["last_modified"],
+            )
+        if response is None:
+            response = Response(cached["data"])
+            response["ETag"] = cached["etag"]
+            response["Last-Modified"] = http_date(cached["last_modified"])
+        patch_cache_control(
+            response,
+            private=True,
+            max_age=max(0, int(entry["fresh_until"] - time.time())),
+            stale_while_revalidate=stale_timeout,
+        )
+        return response
@@ -0,0 +1,49 @@
+from django.db import models
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor,
+)
+
+
+class InternedForeignKeyDescriptor(ForwardManyToOneDescriptor):
+    """Accept a plain string as an unsaved row, resolved on save."""
+
+    def __set__(self, instance, value):
+        if isinstance(value, str):
+            model = self.field.remote_field.model
+            value = model(**{self.field.interned_field: value})
+        super().__set__(instance, value)
+
+
+class InternedForeignKey(models.ForeignKey):
+    """ForeignKey to a dictionary table whose manager provides ``intern``.
+
+    Assigning a string only stores an unsaved row, so code that used to
+    store the text directly keeps working without touching the database.
+    The owning model calls ``intern`` from ``save`` to look up (or create)
+    the matching row.
+    """
+
+    forward_related_accessor_class = InternedForeignKeyDescriptor
+    interned_field = "name"
+
+    def pending(self, instance):
+        """Return the unsaved row assigned to ``instance``, if any."""
+        value = self.get_cached_value(instance, None)
+        if value is not None and value.pk is None:
+            return value
+        return None
+
+    def intern(self, instance, using=None):
+        """Replace a pending row on ``instance`` with the stored one."""
+        value = self.pending(instance)
+        if value is not None:
+            manager = self.remote_field.model._default_manager
+            if using is not None:
+                manager = manager.db_manager(using)
+            name = getattr(value, self.interned_field)
+            setattr(instance, self.name, manager.intern(name))
+
+    def validate(self, value, model_instance):
+        if value is None and self.pending(model_instance) is not None:
+            return
+        super().validate(value, model_instance)
@@ -1,4 +1,19 @@
-from core.db.models import PublishStateOptions
+from functools import partial
+
+from core.cache import (
+    bump_catalog_version,
+    bump_generations,
+    generation_scope,
+    object_scope,
+    show_scope,
+)
+from core.db.models import PlaylistTypeChoices, PublishStateOptions
+from core.snapshots import home_snapshot_rebuilder
+from django.apps import apps
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat, Substr
+from django.contrib.contenttypes.models import ContentType
 from django.utils import timezone
 from django.utils.text import slugify
 from .utils import get_unique_slug
@@ -13,6 +28,132 @@ def publish_state_pre_save(sender, instance, *args, **kwargs):
         instance.published_timestamp = None
 
 
+def catalog_changed(sender, *args, **kwargs):
+    """Invalidate the cached catalog pages once the change commits.
+
+    Bumping earlier would let a request render the old rows in between
+    and cache them under the new version.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+def _show_ids(playlist_ids):
+    """Return the ids of the shows that ``playlist_ids`` belong to."""
+    Playlist = apps.get_model("core", "Playlist")
+    rows = Playlist._base_manager.filter(
+        id__in=set(playlist_ids) - {None},
+        type__in=[PlaylistTypeChoices.SHOW, PlaylistTypeChoices.SEASON],
+    ).values_list("type", "id", "parent_id")
+    return {
+        playlist_id if kind == PlaylistTypeChoices.SHOW else parent_id
+        for kind, playlist_id, parent_id in rows
+    } - {None}
+
+
+def _video_scopes(playlist_ids):
+    """Return the scopes of the videos listed on ``playlist_ids``."""
+    PlaylistItem = apps.get_model("core", "PlaylistItem")
+    Video = apps.get_model("core", "Video")
+    playlist_ids = set(playlist_ids) - {None}
+    if not playlist_ids:
+        return set()
+    video_ids = PlaylistItem.objects.filter(
+        playlist_id__in=playlist_ids
+    ).values_list("video_id", flat=True)
+    return {object_scope(Video, video_id) for video_id in video_ids}
+
+
+def _playlist_scopes(playlist_ids):
+    """Return the scopes of ``playlist_ids`` and of the videos nesting
+    them.
+    """
+    Playlist = apps.get_model("core", "Playlist")
+    playlist_ids = set(playlist_ids) - {None}
+    scopes = {object_scope(Playlist, pk) for pk in playlist_ids}
+    return scopes | _video_scopes(playlist_ids)
+
+
+def _generation_scopes(instance, created=False):
+    Category = apps.get_model("core", "Category")
+    Playlist = apps.get_model("core", "Playlist")
+    PlaylistItem = apps.get_model("core", "PlaylistItem")
+    Tag = apps.get_model("core", "Tag")
+    TaggedItem = apps.get_model("core", "TaggedItem")
+    Video = apps.get_model("core", "Video")
+    scopes = {generation_scope(type(instance))}
+    show_ids = set()
+    if isinstance(instance, Playlist):
+        previous = getattr(instance, "_counter_previous", None) or {}
+        scopes |= _playlist_scopes([instance.pk])
+        if instance.type == PlaylistTypeChoices.SHOW:
+            show_ids.add(instance.pk)
+        show_ids.update({instance.parent_id, previous.get("parent_id")})
+    elif isinstance(instance, PlaylistItem):
+        scopes.add(object_scope(Video, instance.video_id))
+        show_ids.update(_show_ids([instance.playlist_id]))
+    elif isinstance(instance, Video):
+        scopes.add(object_scope(Video, instance.pk))
+        playlist_ids = PlaylistItem.objects.filter(
+            video_id=instance.pk
+        ).values_list("playlist_id", flat=True)
+        show_ids.update(_show_ids(playlist_ids))
+    elif isinstance(instance, Category):
+        scopes.add(object_scope(Category, instance.pk))
+        playlist_ids = Playlist._base_manager.filter(
+            category_id=instance.pk
+        ).values_list("id", flat=True)
+        scopes |= _video_scopes(playlist_ids)
+    elif isinstance(instance, TaggedItem):
+        playlist_type = ContentType.objects.get_for_model(Playlist)
+        if instance.content_type_id == playlist_type.id:
+            scopes |= _playlist_scopes([instance.object_id])
+    elif isinstance(instance, Tag) and not created:
+        playlist_ids = TaggedItem._base_manager.filter(
+            tag_id=instance.pk,
+            content_type=ContentType.objects.get_for_model(Playlist),
+        ).values_list("object_id", flat=True)
+        scopes |= _playlist_scopes(playlist_ids)
+    scopes.update(show_scope(show_id) for show_id in show_ids - {None})
+    return scopes
+
+
+def generations_changed(sender, instance, *args, **kwargs):
+    """Bump the model's generation, and those of the rows and shows that
+    nest the instance, once the change commits, so no node caches the
+    old rows under the new generation.
+    """
+    scopes = _generation_scopes(instance, kwargs.get("created", False))
+    transaction.on_commit(partial(bump_generations, scopes))
+
+
+def playlist_videos_generations_changed(
+    sender, instance, action, reverse, pk_set, *args, **kwargs
+):
+    # A clear sends no pk_set, so its links are read before they go.
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    PlaylistItem = apps.get_model("core", "PlaylistItem")
+    Video = apps.get_model("core", "Video")
+    if reverse:
+        video_ids = [instance.pk]
+        playlist_ids = pk_set
+        if playlist_ids is None:
+            playlist_ids = PlaylistItem.objects.filter(
+                video_id=instance.pk
+            ).values_list("playlist_id", flat=True)
+    else:
+        playlist_ids = [instance.pk]
+        video_ids = pk_set
+        if video_ids is None:
+            video_ids = PlaylistItem.objects.filter(
+                playlist_id=instance.pk
+            ).values_list("video_id", flat=True)
+    scopes = {generation_scope(PlaylistItem)}
+    scopes.update(object_scope(Video, video_id) for video_id in video_ids)
+    scopes.update(show_scope(show_id) for show_id in _show_ids(playlist_ids))
+    transaction.on_commit(partial(bump_generations, scopes))
+
+
 def slugify_pre_save(sender, instance, *args, **kwargs):
     title = instance.title
     slug = instance.slug
@@ -23,4 +164,201 @@ def slugify_pre_save(sender, instance, *args, **kwargs):
 def unique_slugify_pre_save(sender, instance, *args, **kwargs):
     slug = instance.slug
     if slug is None:
-        instance.slug = get_unique_slug(instance, size=5)
+        instance.slug = get_unique_slug(instance)
+        instance._slug_generated = True
+
+
+def _rated_playlists(content_type_id, object_id):
+    """Return the playlist queryset a rating row points at, if any."""
+    Playlist = apps.get_model("core", "Playlist")
+    playlist_type = ContentType.objects.get_for_model(Playlist)
+    if content_type_id != playlist_type.id:
+        return None
+    return Playlist.objects.filter(id=object_id)
+
+
+def rating_pre_save(sender, instance, *args, **kwargs):
+    instance._rating_previous = None
+    if instance.pk is None:
+        return
+    previous = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list("content_type_id", "object_id", "value")
+        .first()
+    )
+    instance._rating_previous = previous
+
+
+def rating_post_save(sender, instance, created, *args, **kwargs):
+    previous = getattr(instance, "_rating_previous", None)
+    current = (instance.content_type_id, instance.object_id)
+    if previous is not None and previous[:2] != current:
+        old_qs = _rated_playlists(*previous[:2])
+        if old_qs is not None:
+            old_qs.apply_rating_change(removed=previous[2])
+        previous = None
+    qs = _rated_playlists(*current)
+    if qs is not None:
+        removed = previous[2] if previous is not None else None
+        qs.apply_rating_change(removed=removed, added=instance.value)
+
+
+def rating_post_delete(sender, instance, *args, **kwargs):
+    qs = _rated_playlists(instance.content_type_id, instance.object_id)
+    if qs is not None:
+        qs.apply_rating_change(removed=instance.value)
+
+
+PLAYLIST_COUNTER_FIELDS = [
+    "parent_id",
+    "type",
+    "state",
+    "published_timestamp",
+]
+
+
+def playlist_pre_save(sender, instance, *args, **kwargs):
+    instance._counter_previous = None
+    if instance.pk is not None:
+        instance._counter_previous = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values(*PLAYLIST_COUNTER_FIELDS)
+            .first()
+        )
+
+
+def _refresh_playlist_counters(parent_ids=()):
+    Playlist = apps.get_model("core", "Playlist")
+    parent_ids = set(parent_ids) - {None}
+    if parent_ids:
+        Playlist.objects.filter(id__in=parent_ids).refresh_counters(
+            episodes=False
+        )
+
+
+def playlist_post_save(sender, instance, created, *args, **kwargs):
+    previous = getattr(instance, "_counter_previous", None)
+    if previous is None:
+        _refresh_playlist_counters(parent_ids=[instance.parent_id])
+        return
+    current = {
+        field: getattr(instance, field) for field in PLAYLIST_COUNTER_FIELDS
+    }
+    if current == previous:
+        return
+    _refresh_playlist_counters(
+        parent_ids=[previous["parent_id"], instance.parent_id]
+    )
+
+
+def playlist_post_delete(sender, instance, *args, **kwargs):
+    _refresh_playlist_counters(parent_ids=[instance.parent_id])
+
+
+def playlist_path_pre_save(sender, instance, *args, **kwargs):
+    """Derive ``path`` from the parent and remember the stored one."""
+    paths = {}
+    if instance.pk is not None or instance.parent_id is not None:
+        paths = dict(
+            sender._base_manager.filter(
+                pk__in=[instance.pk, instance.parent_id]
+            ).values_list("pk", "path")
+        )
+    instance._previous_path = paths.get(instance.pk)
+    if instance.parent_id is None:
+        instance.path = "/"
+        return
+    parent_path = paths.get(instance.parent_id, "/")
+    if instance.pk is not None and (
+        instance.parent_id == instance.pk or f"/{instance.pk}/" in parent_path
+    ):
+        raise ValueError(f"Playlist {instance.pk} cannot be its own ancestor")
+    instance.path = f"{parent_path}{instance.parent_id}/"
+
+
+def _rebase_descendants(old_prefix, new_prefix):
+    """Move every path under ``old_prefix`` to ``new_prefix``."""
+    if old_prefix == new_prefix:
+        return
+    Playlist = apps.get_model("core", "Playlist")
+    Playlist._base_manager.filter(path__startswith=old_prefix).update(
+        path=Concat(
+            Value(new_prefix),
+            Substr("path", len(old_prefix) + 1),
+            output_field=CharField(),
+        )
+    )
+
+
+def playlist_path_post_save(sender, instance, created, *args, **kwargs):
+    previous = getattr(instance, "_previous_path", None)
+    if previous is not None and previous != instance.path:
+        _rebase_descendants(
+            f"{previous}{instance.pk}/", instance.descendant_path
+        )
+
+
+def playlist_path_post_delete(sender, instance, *args, **kwargs):
+    # SET_NULL has already detached the children; they become roots.
+    _rebase_descendants(instance.descendant_path, "/")
+
+
+def _refresh_episode_counts(playlist_ids):
+    Playlist = apps.get_model("core", "Playlist")
+    playlist_ids = set(playlist_ids) - {None}
+    if playlist_ids:
+        Playlist.objects.filter(id__in=playlist_ids).refresh_counters(
+            seasons=False
+        )
+
+
+def playlist_item_pre_save(sender, instance, *args, **kwargs):
+    instance._previous_playlist_id = None
+    if instance.pk is not None:
+        instance._previous_playlist_id = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("playlist_id", flat=True)
+            .first()
+        )
+
+
+def playlist_item_post_save(sender, instance, created, *args, **kwargs):
+    previous = getattr(instance, "_previous_playlist_id", None)
+    if created or previous != instance.playlist_id:
+        _refresh_episode_counts([previous, instance.playlist_id])
+
+
+def playlist_item_post_delete(sender, instance, *args, **kwargs):
+    _refresh_episode_counts([instance.playlist_id])
+
+
+def playlist_videos_changed(
+    sender, instance, action, reverse, pk_set, *args, **kwargs
+):
+    """Keep episode counts current for ``Playlist.videos`` changes.
+
+    ``add``, ``remove`` and ``clear`` on the relation bypass the
+    PlaylistItem save and delete signals.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            _refresh_episode_counts([instance.pk])
+        return
+    if action == "pre_clear":
+        instance._cleared_playlist_ids = list(
+            instance.playlist_item.values_list("id", flat=True)
+        )
+    elif action == "post_clear":
+        _refresh_episode_counts(
+            getattr(instance, "_cleared_playlist_ids", [])
+        )
+    elif action in ("post_add", "post_remove"):
+        _refresh_episode_counts(pk_set or [])
+
+
+def featured_playlist_changed(sender, instance, *args, **kwargs):
+    """Rebuild the home snapshot once a featured playlist change commits."""
+    previous = getattr(instance, "_counter_previous", None) or {}
+    featured = PlaylistTypeChoices.PLAYLIST
+    if featured in (instance.type, previous.get("type")):
+        transaction.on_commit(home_snapshot_rebuilder.schedule)
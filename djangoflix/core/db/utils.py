@@ -1,34 +1,107 @@
-import string
-import random
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils.text import slugify
 
+# Room kept for a "-N" suffix when reading existing slugs by prefix.
+SLUG_SUFFIX_RESERVE = 4
+SLUG_LOOKUPS_PER_QUERY = 100
 
-def get_random_string(size=4, chars=string.ascii_lowercase + string.digits):
-    return "".join([random.choice(chars) for _ in range(size)])
 
+def _has_parent(model):
+    return any(field.name == "parent" for field in model._meta.get_fields())
 
-def get_unique_slug(instance, new_slug=None, size=10, max_size=50):
-    title = instance.title
 
-    if new_slug is None:
-        slug = slugify(title)
-    else:
-        slug = new_slug
-    slug = slug[:max_size]
-    Klass = instance.__class__
-    parent = None
-    try:
-        parent = instance.parent
-    except Exception:
-        pass
+def _slug_candidates(base, max_size):
+    """Yield ``base``, ``base-2``, ``base-3``... within ``max_size``."""
+    yield base
+    number = 2
+    while True:
+        suffix = f"-{number}"
+        yield base[: max_size - len(suffix)] + suffix
+        number += 1
 
-    if parent is not None:
-        qs = Klass.objects.filter(parent=parent, slug=slug)
-    else:
-        qs = Klass.objects.filter(slug=slug)
 
-    if qs.exists():
-        rand_str = get_random_string(size=size)
-        new_slug = slugify(title) + rand_str
-        return get_unique_slug(instance, new_slug=new_slug)
+def assign_unique_slugs(instances, max_size=50):
+    """Give every instance without a slug one that is free in its scope.
+
+    The scope is the instance's parent when the model has one, so
+    "season-1" can repeat across shows. Existing slugs sharing a prefix
+    with the new ones are read in a single query (per hundred prefixes)
+    and each instance takes the lowest free numeric suffix. Instances in
+    the same batch never collide with each other. Nothing is saved.
+    """
+    pending = [obj for obj in instances if obj.slug is None]
+    if not pending:
+        return instances
+
+    model = pending[0]._meta.concrete_model
+    scoped = _has_parent(model)
+    stems = {}
+    for obj in pending:
+        scope = obj.parent_id if scoped else None
+        stem = slugify(obj.title)[: max_size - SLUG_SUFFIX_RESERVE]
+        stems.setdefault(scope, set()).add(stem)
+
+    lookups = []
+    for scope, scope_stems in stems.items():
+        for stem in scope_stems:
+            lookup = Q(slug__startswith=stem)
+            if scoped and scope is None:
+                lookup &= Q(parent__isnull=True)
+            elif scoped:
+                lookup &= Q(parent_id=scope)
+            lookups.append(lookup)
+
+    taken = {scope: set() for scope in stems}
+    fields = ["parent_id", "slug"] if scoped else ["slug"]
+    exclude = [obj.pk for obj in pending if obj.pk is not None]
+    for start in range(0, len(lookups), SLUG_LOOKUPS_PER_QUERY):
+        end = start + SLUG_LOOKUPS_PER_QUERY
+        query = Q()
+        for lookup in lookups[start:end]:
+            query |= lookup
+        rows = (
+            model._base_manager.filter(query)
+            .exclude(pk__in=exclude)
+            .values_list(*fields)
+        )
+        for row in rows:
+            taken[row[0] if scoped else None].add(row[-1])
+
+    for obj in pending:
+        used = taken[obj.parent_id if scoped else None]
+        base = slugify(obj.title)[:max_size]
+        for candidate in _slug_candidates(base, max_size):
+            if candidate not in used:
+                break
+        used.add(candidate)
+        obj.slug = candidate
+    return instances
+
+
+def get_unique_slug(instance, max_size=50):
+    """Return a slug for ``instance`` that is free in its parent scope."""
+    current = instance.slug
+    instance.slug = None
+    assign_unique_slugs([instance], max_size=max_size)
+    slug, instance.slug = instance.slug, current
     return slug
+
+
+def save_with_unique_slug(instance, save, *args, retries=3, **kwargs):
+    """Call ``save``, re-allocating a generated slug on a unique clash.
+
+    Two concurrent inserts can pick the same suffix between the lookup
+    and the INSERT. The database constraint rejects the loser, which
+    reads its scope again and retries a bounded number of times.
+    """
+    for attempt in range(retries + 1):
+        instance._slug_generated = False
+        try:
+            with transaction.atomic(using=kwargs.get("using")):
+                return save(*args, **kwargs)
+        except IntegrityError:
+            generated = getattr(instance, "_slug_generated", False)
+            if attempt == retries or not generated:
+                raise
+            instance.slug = None
@@ -0,0 +1,86 @@
+"""Sparse fieldsets and opt-in relation expansion for the API viewsets."""
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _names(value):
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class SparseFieldsetMixin:
+    """Honour ``?fields=a,b`` and ``?expand=rel`` on read requests.
+
+    Without either parameter the full representation is returned. With
+    them, the response holds the listed fields, or every plain field if
+    only ``expand`` is given, plus the expanded relations. The queryset
+    is narrowed to match: ``only()`` the columns used, and just the
+    ``select_related``/``prefetch_related`` of ``get_expansions()`` for
+    the relations requested, so nothing else is queried or serialized.
+    """
+
+    def get_expansions(self):
+        """Map each expandable relation to a function of the queryset."""
+        return {}
+
+    def get_requested_fields(self):
+        """Return the field names to serialize, or None for all of them."""
+        if getattr(self, "_requested_fields", False) is not False:
+            return self._requested_fields
+        self._requested_fields = None
+        params = self.request.query_params
+        if self.request.method not in SAFE_METHODS or not (
+            "fields" in params or "expand" in params
+        ):
+            return None
+
+        serializer_class = self.get_serializer_class()
+        available = list(serializer_class().fields)
+        expandable = getattr(serializer_class.Meta, "expandable_fields", [])
+        fields = _names(params.get("fields", ""))
+        expand = _names(params.get("expand", ""))
+        errors = {}
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            errors["fields"] = f"Unknown fields: {', '.join(unknown)}."
+        unknown = [name for name in expand if name not in expandable]
+        if unknown:
+            errors["expand"] = f"Cannot expand: {', '.join(unknown)}."
+        if errors:
+            raise ValidationError(errors)
+
+        if not fields:
+            fields = [name for name in available if name not in expandable]
+        self._requested_fields = fields + [
+            name for name in expand if name not in fields
+        ]
+        return self._requested_fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        expansions = self.get_expansions()
+        queryset = queryset.select_related(None).prefetch_related(None)
+        for name in fields:
+            if name in expansions:
+                queryset = expansions[name](queryset)
+        model_fields = {
+            field.name: field
+            for field in queryset.model._meta.concrete_fields
+        }
+        columns = [queryset.model._meta.pk.name]
+        columns += [
+            name
+            for name in fields
+            if name in model_fields
+            and (not model_fields[name].is_relation or name in expansions)
+        ]
+        return queryset.only(*columns)
@@ -0,0 +1,214 @@
+"""Django command to benchmark the published catalog query paths"""
+
+import time
+from itertools import cycle, islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.db.models import PlaylistTypeChoices, PublishStateOptions
+from core.models import (
+    MovieProxy,
+    Playlist,
+    PlaylistItem,
+    TVShowProxy,
+    TVShowSeasonProxy,
+    Video,
+)
+
+SEED_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    """Django command to print plans and timings for catalog queries"""
+
+    help = (
+        "Print the query plan and timing of each published-catalog query. "
+        "Use --seed on a scratch database to load a synthetic catalog "
+        "first, e.g. --seed 1000000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Number of synthetic playlists to create before running.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per query; the best time is reported.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if options["seed"]:
+            self.seed(options["seed"])
+
+        for label, queryset in self.query_paths():
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(self.explain(queryset))
+            best = min(self.timed(queryset) for _ in range(options["repeat"]))
+            self.stdout.write(f"best of {options['repeat']}: {best:.2f} ms\n")
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def timed(self, queryset):
+        start = time.perf_counter()
+        list(queryset.all())
+        return (time.perf_counter() - start) * 1000
+
+    def query_paths(self):
+        show = TVShowProxy.objects.all().published().order_by("id").first()
+        season = (
+            TVShowSeasonProxy.objects.all()
+            .published()
+            .select_related("parent")
+            .order_by("id")
+            .first()
+        )
+        paths = [
+            ("Published playlists", Playlist.objects.published()),
+            (
+                "Featured playlists",
+                Playlist.objects.featured_playlist().published(),
+            ),
+            ("Movies", MovieProxy.objects.all().published()),
+            ("TV shows", TVShowProxy.objects.all().published()),
+        ]
+        if show is not None:
+            paths.append(
+                ("Seasons of a show", TVShowProxy(pk=show.pk).seasons)
+            )
+            paths.append(
+                (
+                    "Everything below a show",
+                    Playlist.objects.descendants_of(show),
+                )
+            )
+        if season is not None:
+            paths.append(
+                (
+                    "Season by show and season slug",
+                    TVShowSeasonProxy.objects.all()
+                    .published()
+                    .filter(
+                        parent__slug__iexact=season.parent.slug.upper(),
+                        slug__iexact=season.slug.upper(),
+                    ),
+                )
+            )
+            paths.append(
+                (
+                    "Season episodes in order",
+                    PlaylistItem.objects.filter(playlist_id=season.pk),
+                )
+            )
+        return paths
+
+    def seed(self, total):
+        """Create ``total`` playlists: 70% top level, 30% seasons."""
+        user, _ = get_user_model().objects.get_or_create(
+            email="catalog-benchmark@example.com"
+        )
+        now = timezone.now()
+        prefix = f"bench-{int(now.timestamp())}"
+        states = cycle(
+            [PublishStateOptions.PUBLISH] * 3 + [PublishStateOptions.DRAFT]
+        )
+
+        def published(state):
+            return now if state == PublishStateOptions.PUBLISH else None
+
+        videos = (
+            Video(
+                user=user,
+                title=f"Benchmark video {i}",
+                slug=f"{prefix}-video-{i}",
+                video_id=f"{prefix}-video-{i}",
+                state=PublishStateOptions.PUBLISH,
+                published_timestamp=now,
+            )
+            for i in range(max(total // 10, 1))
+        )
+        self.bulk_create(Video, videos)
+        video_ids = list(
+            Video.objects.filter(slug__startswith=prefix).values_list(
+                "id", flat=True
+            )
+        )
+
+        # One in seven top level rows is a show with three seasons.
+        kinds = cycle(
+            [PlaylistTypeChoices.SHOW, PlaylistTypeChoices.PLAYLIST]
+            + [PlaylistTypeChoices.MOVIE] * 5
+        )
+        top_level = total - total * 3 // 10
+        playlists = (
+            Playlist(
+                type=kind,
+                title=f"Benchmark {kind} {i}",
+                slug=f"{prefix}-{i}",
+                state=state,
+                published_timestamp=published(state),
+            )
+            for i, kind, state in zip(range(top_level), kinds, states)
+        )
+        self.bulk_create(Playlist, playlists)
+
+        shows = Playlist.objects.filter(
+            type=PlaylistTypeChoices.SHOW, slug__startswith=prefix
+        ).values_list("id", flat=True)
+        seasons = (
+            Playlist(
+                type=PlaylistTypeChoices.SEASON,
+                parent_id=show_id,
+                path=f"/{show_id}/",
+                order=number,
+                title=f"Season {number}",
+                slug=f"season-{number}",
+                state=state,
+                published_timestamp=published(state),
+            )
+            for show_id in list(shows)
+            for number, state in zip((1, 2, 3), states)
+        )
+        self.bulk_create(Playlist, seasons)
+
+        season_ids = Playlist.objects.filter(
+            type=PlaylistTypeChoices.SEASON, parent__slug__startswith=prefix
+        ).values_list("id", flat=True)
+        items = (
+            PlaylistItem(
+                playlist_id=season_id,
+                video_id=video_ids[(season_id + order) % len(video_ids)],
+                order=order,
+            )
+            for season_id in list(season_ids)
+            for order in range(1, 11)
+        )
+        self.bulk_create(PlaylistItem, items)
+
+        # Fresh statistics so the planner knows about the new rows.
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def bulk_create(self, model, objs):
+        """Insert a generator of rows in fixed-size batches."""
+        objs = iter(objs)
+        created = 0
+        while True:
+            batch = list(islice(objs, SEED_BATCH_SIZE))
+            if not batch:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            created += len(batch)
+        self.stdout.write(f"Seeded {created} {model._meta.verbose_name}")
@@ -0,0 +1,368 @@
+"""Django command to bulk load a catalog of shows, movies and videos"""
+
+import csv
+import io
+import json
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils.dateparse import parse_datetime
+
+from core.db.models import PlaylistTypeChoices, PublishStateOptions
+from core.db.receivers import publish_state_pre_save
+from core.cache import (
+    bump_catalog_version,
+    bump_generations,
+    generation_scope,
+    object_scope,
+)
+from core.db.utils import assign_unique_slugs
+from core.models import Playlist, PlaylistItem, Video
+from core.snapshots import build_home_snapshot
+
+PLAYLIST_TYPES = {
+    "show": PlaylistTypeChoices.SHOW,
+    "season": PlaylistTypeChoices.SEASON,
+    "movie": PlaylistTypeChoices.MOVIE,
+    "playlist": PlaylistTypeChoices.PLAYLIST,
+}
+PLAYLIST_KINDS = {value: kind for kind, value in PLAYLIST_TYPES.items()}
+
+
+def read_jsonl(stream):
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            raise CommandError(f"Line {number}: invalid JSON ({exc})")
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if value != ""}
+
+
+def _copy_value(value):
+    """Format a value for the text format of Postgres COPY."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_insert(model, objs, using):
+    """Insert ``objs`` with a single Postgres COPY, skipping the pk."""
+    connection = connections[using]
+    fields = [f for f in model._meta.concrete_fields if not f.primary_key]
+    buffer = io.StringIO()
+    for obj in objs:
+        values = [
+            field.get_db_prep_save(field.pre_save(obj, True), connection)
+            for field in fields
+        ]
+        buffer.write("\t".join(map(_copy_value, values)) + "\n")
+    buffer.seek(0)
+    quote = connection.ops.quote_name
+    sql = "COPY {} ({}) FROM STDIN".format(
+        quote(model._meta.db_table),
+        ", ".join(quote(field.column) for field in fields),
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
+
+
+class CatalogLoader:
+    """Buffer catalog records and write them in dependency order.
+
+    Only the key -> playlist id and path maps and the ids of videos that
+    existed before the import outlive a batch, so memory never grows with
+    the number of new episodes.
+    """
+
+    def __init__(
+        self, user, batch_size=1000, use_copy=False, using="default"
+    ):
+        self.user = user
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.using = using
+        self.keys = {}
+        self.paths = {}
+        self.counts = Counter()
+        self.existing_video_ids = set()
+        self._reset()
+
+    def _reset(self):
+        self.playlists = []
+        self.episodes = []
+        self.videos = {}
+
+    def add(self, record):
+        kind = str(record.get("type", "")).lower()
+        if not record.get("title"):
+            raise CommandError(f"Record without a title: {record}")
+        if kind == "episode":
+            self._add_episode(record)
+        elif kind in PLAYLIST_TYPES:
+            self._add_playlist(kind, record)
+        else:
+            raise CommandError(f"Unknown record type {kind!r}")
+        if len(self.playlists) + len(self.episodes) >= self.batch_size:
+            self.flush()
+
+    def _publish_fields(self, record):
+        fields = {"state": record.get("state", PublishStateOptions.DRAFT)}
+        if fields["state"] not in PublishStateOptions.values:
+            raise CommandError(f"Unknown state {fields['state']!r}")
+        if record.get("published_timestamp"):
+            timestamp = parse_datetime(record["published_timestamp"])
+            if timestamp is None:
+                raise CommandError(f"Invalid published_timestamp in {record}")
+            fields["published_timestamp"] = timestamp
+        return fields
+
+    def _add_video(self, video_id, record):
+        if video_id not in self.videos:
+            self.videos[video_id] = Video(
+                user=self.user,
+                video_id=video_id,
+                title=record["title"],
+                description=record.get("description"),
+                **self._publish_fields(record),
+            )
+
+    def _add_playlist(self, kind, record):
+        key = record.get("key")
+        if key is not None and key in self.keys:
+            raise CommandError(f"Duplicate key {key!r}")
+        if key is not None:
+            self.keys[key] = None
+        playlist = Playlist(
+            type=PLAYLIST_TYPES[kind],
+            title=record["title"],
+            description=record.get("description"),
+            order=int(record.get("order", 1)),
+            **self._publish_fields(record),
+        )
+        video_id = record.get("video_id")
+        if video_id:
+            self._add_video(video_id, record)
+        self.playlists.append((key, record.get("parent"), playlist, video_id))
+
+    def _add_episode(self, record):
+        if not record.get("parent") or not record.get("video_id"):
+            raise CommandError(
+                f"Episode needs a parent and a video_id: {record}"
+            )
+        self._add_video(record["video_id"], record)
+        self.episodes.append(
+            (
+                record["parent"],
+                record["video_id"],
+                int(record.get("order", 1)),
+            )
+        )
+
+    def flush(self):
+        if not self.playlists and not self.episodes:
+            return
+        with transaction.atomic(using=self.using):
+            video_ids = self._flush_videos()
+            parent_ids = self._flush_playlists(video_ids)
+            episode_playlist_ids = self._flush_episodes(video_ids)
+            self._refresh_counters(parent_ids, episode_playlist_ids)
+        self._reset()
+
+    def _refresh_counters(self, parent_ids, playlist_ids):
+        """Recount what the batch touched; bulk inserts skip the counter
+        receivers.
+        """
+        playlists = Playlist.objects.using(self.using)
+        if parent_ids:
+            playlists.filter(id__in=parent_ids).refresh_counters(
+                episodes=False
+            )
+        if playlist_ids:
+            playlists.filter(id__in=playlist_ids).refresh_counters(
+                seasons=False
+            )
+
+    def _insert(self, model, objs):
+        if self.use_copy:
+            copy_insert(model, objs, self.using)
+        else:
+            model.objects.using(self.using).bulk_create(objs)
+
+    def _flush_videos(self):
+        """Insert new videos and map every video_id in the batch to a pk."""
+        queryset = Video.objects.using(self.using)
+        video_ids = dict(
+            queryset.filter(video_id__in=self.videos).values_list(
+                "video_id", "id"
+            )
+        )
+        self.existing_video_ids.update(video_ids.values())
+        new_videos = [
+            video
+            for video_id, video in self.videos.items()
+            if video_id not in video_ids
+        ]
+        if not new_videos:
+            return video_ids
+        for video in new_videos:
+            publish_state_pre_save(Video, video)
+        assign_unique_slugs(new_videos)
+        self._insert(Video, new_videos)
+        self.counts["video"] += len(new_videos)
+        if self.use_copy:
+            return dict(
+                queryset.filter(video_id__in=self.videos).values_list(
+                    "video_id", "id"
+                )
+            )
+        video_ids.update((video.video_id, video.id) for video in new_videos)
+        return video_ids
+
+    def _flush_playlists(self, video_ids):
+        """Insert playlists level by level so parents get ids first.
+
+        Returns the ids of their parents.
+        """
+        parent_ids = set()
+        pending = self.playlists
+        while pending:
+            ready, waiting = [], []
+            for entry in pending:
+                parent_key = entry[1]
+                if parent_key is None or self.keys.get(parent_key):
+                    ready.append(entry)
+                else:
+                    waiting.append(entry)
+            if not ready:
+                missing = {entry[1] for entry in waiting}
+                raise CommandError(f"Unknown parent keys: {sorted(missing)}")
+            objs = []
+            for key, parent_key, playlist, video_id in ready:
+                if parent_key is not None:
+                    playlist.parent_id = self.keys[parent_key]
+                    playlist.path = self.paths[parent_key]
+                    parent_ids.add(playlist.parent_id)
+                if video_id:
+                    playlist.video_id = video_ids[video_id]
+                publish_state_pre_save(Playlist, playlist)
+                objs.append(playlist)
+            assign_unique_slugs(objs)
+            Playlist.objects.using(self.using).bulk_create(objs)
+            for key, _, playlist, _ in ready:
+                if key is not None:
+                    self.keys[key] = playlist.id
+                    self.paths[key] = playlist.descendant_path
+                self.counts[PLAYLIST_KINDS[playlist.type]] += 1
+            pending = waiting
+        return parent_ids
+
+    def _flush_episodes(self, video_ids):
+        """Insert the batch's episodes and return their playlist ids."""
+        items = []
+        for parent_key, video_id, order in self.episodes:
+            playlist_id = self.keys.get(parent_key)
+            if playlist_id is None:
+                raise CommandError(f"Unknown parent key {parent_key!r}")
+            items.append(
+                PlaylistItem(
+                    playlist_id=playlist_id,
+                    video_id=video_ids[video_id],
+                    order=order,
+                )
+            )
+        if items:
+            self._insert(PlaylistItem, items)
+            self.counts["episode"] += len(items)
+        return {item.playlist_id for item in items}
+
+
+class Command(BaseCommand):
+    """Django command to import a catalog file"""
+
+    help = (
+        "Bulk load shows, seasons, movies, playlists and episodes from a "
+        "JSONL or CSV file. Parents must appear before their children."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Catalog file to import.")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Email of the user who owns the imported videos.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            help="File format; guessed from the extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of records written per batch.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create even when Postgres COPY is available.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        path = options["path"]
+        fmt = options["format"] or (
+            "csv" if path.endswith(".csv") else "jsonl"
+        )
+        try:
+            user = get_user_model().objects.get(email=options["user"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user with email {options['user']!r}")
+
+        use_copy = (
+            connections["default"].vendor == "postgresql"
+            and not options["no_copy"]
+        )
+        loader = CatalogLoader(
+            user, batch_size=options["batch_size"], use_copy=use_copy
+        )
+        reader = read_csv if fmt == "csv" else read_jsonl
+        with open(path, newline="") as stream:
+            for record in reader(stream):
+                loader.add(record)
+        loader.flush()
+        # Bulk inserts skip the save signals that invalidate caches.
+        bump_catalog_version()
+        # Existing videos may now list new playlists.
+        bump_generations(
+            [
+                generation_scope(model)
+                for model in (Playlist, PlaylistItem, Video)
+            ]
+            + [object_scope(Video, pk) for pk in loader.existing_video_ids]
+        )
+        # Inline, as a background thread would die with the command.
+        build_home_snapshot()
+
+        summary = ", ".join(
+            f"{count} {label}"
+            for label, count in sorted(loader.counts.items())
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {summary or 'nothing'}")
+        )
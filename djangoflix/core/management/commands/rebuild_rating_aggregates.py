@@ -0,0 +1,38 @@
+"""Django command to rebuild the stored playlist rating aggregates"""
+
+from django.core.management.base import BaseCommand
+
+from core.models import Playlist
+
+
+class Command(BaseCommand):
+    """Django command to recompute rating aggregates for every playlist"""
+
+    help = "Recompute Playlist rating count, sum, min, max and histogram."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of playlists rebuilt per GROUP BY query.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        chunk_size = options["chunk_size"]
+        total = 0
+        last_id = 0
+        while True:
+            chunk = Playlist.objects.filter(id__gt=last_id).order_by("id")
+            ids = chunk[:chunk_size].rebuild_rating_aggregates()
+            if not ids:
+                break
+            last_id = ids[-1]
+            total += len(ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt rating aggregates for {total} playlists"
+            )
+        )
@@ -0,0 +1,113 @@
+"""Django command to reconcile the stored catalog counters"""
+
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.cache import (
+    bump_catalog_version,
+    bump_generations,
+    generation_scope,
+    show_scope,
+)
+from core.db.models import PlaylistTypeChoices, PublishStateOptions
+from core.models import Playlist
+
+SCHEDULED_COUNTERS_KEY = "catalog:counters:scheduled-at"
+
+
+def refresh_scheduled_counters(since, now):
+    """Recount the shows whose seasons went live after ``since``.
+
+    A show's ``season_count`` only counts seasons already published, and
+    nothing is saved when a scheduled ``published_timestamp`` passes.
+    Without ``since`` every show with a published season is checked.
+    Only shows whose count changed are updated, and the caches are
+    bumped only then. Returns the ids of the updated shows.
+    """
+    seasons = Playlist.objects.filter(
+        type=PlaylistTypeChoices.SEASON,
+        state=PublishStateOptions.PUBLISH,
+        published_timestamp__lte=now,
+        parent__isnull=False,
+    )
+    if since is not None:
+        seasons = seasons.filter(published_timestamp__gt=since)
+    shows = Playlist.objects.filter(
+        id__in=seasons.values("parent_id")
+    ).stale_counters(episodes=False)
+    show_ids = list(shows.values_list("id", flat=True))
+    if show_ids:
+        Playlist.objects.filter(id__in=show_ids).refresh_counters(
+            episodes=False
+        )
+        bump_catalog_version()
+        bump_generations(
+            [generation_scope(Playlist)]
+            + [show_scope(show_id) for show_id in show_ids]
+        )
+    return show_ids
+
+
+class Command(BaseCommand):
+    """Django command to recount seasons and episodes"""
+
+    help = (
+        "Recount Playlist.season_count and Playlist.episode_count, fixing "
+        "any drift. With --scheduled, only recount the shows whose seasons "
+        "went live since the last run; run it every few minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of rows recounted per UPDATE statement.",
+        )
+        parser.add_argument(
+            "--scheduled",
+            action="store_true",
+            help="Only recount shows whose seasons went live since last run.",
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command"""
+        if options["scheduled"]:
+            self.handle_scheduled()
+            return
+        chunk_size = options["chunk_size"]
+        total = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Playlist.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            Playlist.objects.filter(
+                id__gte=ids[0], id__lte=ids[-1]
+            ).refresh_counters()
+            last_id = ids[-1]
+            total += len(ids)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reconciled counters for {total} "
+                f"{Playlist._meta.verbose_name_plural}"
+            )
+        )
+
+    def handle_scheduled(self):
+        now = timezone.now()
+        since = cache.get(SCHEDULED_COUNTERS_KEY)
+        if since is not None:
+            since = datetime.fromtimestamp(since, dt_timezone.utc)
+        show_ids = refresh_scheduled_counters(since, now)
+        cache.set(SCHEDULED_COUNTERS_KEY, now.timestamp(), timeout=None)
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted seasons for {len(show_ids)} shows")
+        )
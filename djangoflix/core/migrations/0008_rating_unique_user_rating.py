@@ -0,0 +1,43 @@
+# Generated by Django 4.0.10 on 2026-10-17 05:56
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def delete_duplicate_ratings(apps, schema_editor):
+    """Keep only the latest rating per (user, content_type, object_id)."""
+    Rating = apps.get_model("core", "Rating")
+    db_alias = schema_editor.connection.alias
+    duplicates = (
+        Rating.objects.using(db_alias)
+        .values("user", "content_type", "object_id")
+        .order_by()
+        .annotate(latest=Max("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in duplicates.iterator():
+        Rating.objects.using(db_alias).filter(
+            user=row["user"],
+            content_type=row["content_type"],
+            object_id=row["object_id"],
+        ).exclude(id=row["latest"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_playlist_rating_aggregates"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_ratings, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="rating",
+            constraint=models.UniqueConstraint(
+                fields=("user", "content_type", "object_id"),
+                name="unique_user_rating",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.0.10 on 2026-10-17 05:59
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def _dedupe_slugs(queryset, scope_fields):
+    """Suffix every duplicate slug in a scope with its row id."""
+    duplicates = (
+        queryset.filter(slug__isnull=False)
+        .values(*scope_fields, "slug")
+        .order_by()
+        .annotate(first=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in duplicates.iterator():
+        lookup = {field: row[field] for field in scope_fields}
+        rows = queryset.filter(slug=row["slug"], **lookup).exclude(
+            id=row["first"]
+        )
+        for obj in rows:
+            suffix = f"-{obj.id}"
+            obj.slug = obj.slug[: 50 - len(suffix)] + suffix
+            obj.save(update_fields=["slug"])
+
+
+def dedupe_slugs(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Playlist = apps.get_model("core", "Playlist")
+    Video = apps.get_model("core", "Video")
+    playlists = Playlist.objects.using(db_alias)
+    _dedupe_slugs(playlists.filter(parent__isnull=True), [])
+    _dedupe_slugs(playlists.filter(parent__isnull=False), ["parent"])
+    _dedupe_slugs(Video.objects.using(db_alias), [])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_rating_unique_user_rating"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_slugs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="playlist",
+            constraint=models.UniqueConstraint(
+                fields=("parent", "slug"), name="unique_playlist_parent_slug"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="playlist",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("parent__isnull", True)),
+                fields=("slug",),
+                name="unique_playlist_root_slug",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="video",
+            constraint=models.UniqueConstraint(
+                fields=("slug",), name="unique_video_slug"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:02
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_unique_slugs"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="playlist",
+            index=models.Index(
+                fields=["state", "published_timestamp"],
+                name="playlist_state_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlist",
+            index=models.Index(
+                fields=["type", "parent"], name="playlist_type_parent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlist",
+            index=models.Index(
+                condition=models.Q(("state", "PU")),
+                fields=["type", "published_timestamp"],
+                name="playlist_published_type_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlist",
+            index=models.Index(
+                django.db.models.functions.text.Upper("slug"),
+                name="playlist_slug_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlistitem",
+            index=models.Index(
+                fields=["playlist", "order", "-timestamp"],
+                name="playlistitem_order_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="video",
+            index=models.Index(
+                condition=models.Q(("active", True), ("state", "PU")),
+                fields=["published_timestamp"],
+                name="video_published_idx",
+            ),
+        ),
+    ]
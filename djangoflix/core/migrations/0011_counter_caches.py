@@ -0,0 +1,64 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def _count(queryset, field):
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def fill_counters(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Playlist = apps.get_model("core", "Playlist")
+    PlaylistItem = apps.get_model("core", "PlaylistItem")
+    Video = apps.get_model("core", "Video")
+    seasons = Playlist.objects.using(db_alias).filter(
+        type="SEA", state="PU", published_timestamp__lte=timezone.now()
+    )
+    Playlist.objects.using(db_alias).update(
+        season_count=_count(seasons, "parent"),
+        episode_count=_count(
+            PlaylistItem.objects.using(db_alias), "playlist"
+        ),
+    )
+    Video.objects.using(db_alias).update(
+        featured_playlist_count=_count(
+            Playlist.objects.using(db_alias), "video"
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_catalog_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="playlist",
+            name="episode_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="playlist",
+            name="season_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="video",
+            name="featured_playlist_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:10
+
+import core.db.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_counter_caches"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.SlugField(unique=True)),
+            ],
+        ),
+        migrations.RenameField(
+            model_name="taggeditem",
+            old_name="tag",
+            new_name="tag_text",
+        ),
+        migrations.AddField(
+            model_name="taggeditem",
+            name="tag",
+            field=core.db.fields.InternedForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tagged_items",
+                to="core.tag",
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:10
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def intern_tags(apps, schema_editor):
+    """Point every TaggedItem at a Tag row and drop duplicate rows."""
+    db_alias = schema_editor.connection.alias
+    Tag = apps.get_model("core", "Tag")
+    TaggedItem = apps.get_model("core", "TaggedItem")
+    items = TaggedItem.objects.using(db_alias)
+
+    names = items.values_list("tag_text", flat=True).distinct()
+    Tag.objects.using(db_alias).bulk_create(
+        [Tag(name=name) for name in names.iterator()],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    for tag in Tag.objects.using(db_alias).iterator():
+        items.filter(tag_text=tag.name).update(tag=tag)
+
+    duplicates = (
+        items.values("content_type", "object_id", "tag")
+        .order_by()
+        .annotate(first=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for row in duplicates.iterator():
+        items.filter(
+            content_type=row["content_type"],
+            object_id=row["object_id"],
+            tag=row["tag"],
+        ).exclude(id=row["first"]).delete()
+
+
+def restore_tag_text(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Tag = apps.get_model("core", "Tag")
+    TaggedItem = apps.get_model("core", "TaggedItem")
+    for tag in Tag.objects.using(db_alias).iterator():
+        TaggedItem.objects.using(db_alias).filter(tag=tag).update(
+            tag_text=tag.name
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_tag"),
+    ]
+
+    operations = [
+        migrations.RunPython(intern_tags, restore_tag_text),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:10
+
+import core.db.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_intern_tags"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="taggeditem",
+            name="tag_text",
+        ),
+        migrations.AlterField(
+            model_name="taggeditem",
+            name="tag",
+            field=core.db.fields.InternedForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tagged_items",
+                to="core.tag",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="taggeditem",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "tag"),
+                name="unique_tagged_item",
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.0.10 on 2026-10-17 06:13
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def fill_paths(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Playlist = apps.get_model("core", "Playlist")
+    parents = dict(
+        Playlist.objects.using(db_alias)
+        .filter(parent__isnull=False)
+        .values_list("id", "parent_id")
+        .iterator()
+    )
+    paths = {}
+    for playlist_id in parents:
+        # Walk up to a root or to a playlist whose path is already known.
+        chain = []
+        node = playlist_id
+        while node in parents and node not in paths and node not in chain:
+            chain.append(node)
+            node = parents[node]
+        prefix = f"{paths.get(node, '/')}{node}/"
+        for pk in reversed(chain):
+            paths[pk] = prefix
+            prefix = f"{prefix}{pk}/"
+
+    playlists = [Playlist(id=pk, path=path) for pk, path in paths.items()]
+    Playlist.objects.using(db_alias).bulk_update(
+        playlists, ["path"], batch_size=BATCH_SIZE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_taggeditem_tag_constraint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="playlist",
+            name="path",
+            field=models.CharField(
+                db_index=True, default="/", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
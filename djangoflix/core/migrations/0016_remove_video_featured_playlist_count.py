@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-17 07:46
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_playlist_path"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="video",
+            name="featured_playlist_count",
+        ),
+    ]
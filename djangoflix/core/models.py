@@ -5,8 +5,29 @@ Database models.
 from django.utils import timezone
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import pre_save
-from django.db.models import Avg, Max, Min
+from django.db.models.signals import (
+    pre_save,
+    pre_delete,
+    post_save,
+    post_delete,
+    m2m_changed,
+)
+from django.db import connections, router, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Length, Upper
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
@@ -21,7 +42,41 @@ from core.db.models import (
     PlaylistTypeChoices,
     RatingChoices,
 )
-from core.db.receivers import publish_state_pre_save, unique_slugify_pre_save
+from core.db.fields import InternedForeignKey
+from core.db.utils import save_with_unique_slug
+from core.db.receivers import (
+    catalog_changed,
+    featured_playlist_changed,
+    generations_changed,
+    playlist_videos_generations_changed,
+    publish_state_pre_save,
+    unique_slugify_pre_save,
+    rating_pre_save,
+    rating_post_save,
+    rating_post_delete,
+    playlist_pre_save,
+    playlist_post_save,
+    playlist_post_delete,
+    playlist_path_pre_save,
+    playlist_path_post_save,
+    playlist_path_post_delete,
+    playlist_item_pre_save,
+    playlist_item_post_save,
+    playlist_item_post_delete,
+    playlist_videos_changed,
+)
+
+
+def count_subquery(queryset, field):
+    """Correlated COUNT of ``queryset`` rows whose ``field`` is OuterRef pk."""
+    counts = (
+        queryset.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
 
 
 class UserManager(BaseUserManager):
@@ -60,6 +115,16 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
 
 
+class VideoQuerySet(models.QuerySet):
+    """Query set for Video Model"""
+
+    def published(self):
+        now = timezone.now()
+        return self.filter(
+            state=PublishStateOptions.PUBLISH, published_timestamp__lte=now
+        )
+
+
 class Video(models.Model):
     """Video object"""
 
@@ -84,13 +149,37 @@ class Video(models.Model):
         auto_now_add=False, auto_now=False, blank=True, null=True
     )
 
+    objects = VideoQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["slug"], name="unique_video_slug")
+        ]
+        indexes = [
+            models.Index(
+                fields=["published_timestamp"],
+                condition=models.Q(
+                    state=PublishStateOptions.PUBLISH, active=True
+                ),
+                name="video_published_idx",
+            ),
+        ]
+
     @property
     def is_published(self):
         return self.active
 
     def get_playlist_ids(self):
+        # Lists prefetch "playlist_featured" to avoid a query per video.
+        if "playlist_featured" in getattr(
+            self, "_prefetched_objects_cache", {}
+        ):
+            return [playlist.id for playlist in self.playlist_featured.all()]
         return list(self.playlist_featured.all().values_list("id", flat=True))
 
+    def save(self, *args, **kwargs):
+        save_with_unique_slug(self, super().save, *args, **kwargs)
+
     def __str__(self):
         return self.title
 
@@ -112,21 +201,174 @@ class VideoPublishedProxy(Video):
 pre_save.connect(publish_state_pre_save, sender=Video)
 pre_save.connect(unique_slugify_pre_save, sender=Video)
 
+post_save.connect(catalog_changed, sender=Video)
+post_delete.connect(catalog_changed, sender=Video)
+post_save.connect(catalog_changed, sender=VideoAllProxy)
+post_delete.connect(catalog_changed, sender=VideoAllProxy)
+post_save.connect(catalog_changed, sender=VideoPublishedProxy)
+post_delete.connect(catalog_changed, sender=VideoPublishedProxy)
+post_save.connect(generations_changed, sender=Video)
+post_delete.connect(generations_changed, sender=Video)
+post_save.connect(generations_changed, sender=VideoAllProxy)
+post_delete.connect(generations_changed, sender=VideoAllProxy)
+post_save.connect(generations_changed, sender=VideoPublishedProxy)
+post_delete.connect(generations_changed, sender=VideoPublishedProxy)
+
+
+class TagManager(models.Manager):
+    """Manager for Tag Model"""
+
+    def intern(self, name):
+        """Return the Tag for ``name``, creating it if needed."""
+        tag, _ = self.get_or_create(name=name)
+        return tag
+
+    def intern_many(self, names):
+        """Return a {name: Tag} map, creating missing tags in bulk."""
+        names = set(names)
+        tags = {tag.name: tag for tag in self.filter(name__in=names)}
+        missing = [Tag(name=name) for name in names if name not in tags]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            tags.update(
+                (tag.name, tag)
+                for tag in self.filter(name__in=[t.name for t in missing])
+            )
+        return tags
+
+
+class Tag(models.Model):
+    """Tag dictionary object"""
+
+    name = models.SlugField(unique=True)
+
+    objects = TagManager()
+
+    def __str__(self):
+        return self.name
+
+
+post_save.connect(catalog_changed, sender=Tag)
+post_delete.connect(catalog_changed, sender=Tag)
+post_save.connect(generations_changed, sender=Tag)
+post_delete.connect(generations_changed, sender=Tag)
+
+
+class TaggedItemManager(models.Manager):
+    """Manager for TaggedItem Model"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("tag")
+
 
 class TaggedItem(models.Model):
     """Tag object"""
 
-    tag = models.SlugField()
+    tag = InternedForeignKey(
+        Tag, related_name="tagged_items", on_delete=models.CASCADE
+    )
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
+    objects = TaggedItemManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "tag"],
+                name="unique_tagged_item",
+            )
+        ]
+
     def __str__(self):
-        return self.tag
+        return self.tag.name
+
+    def save(self, *args, **kwargs):
+        # A tag assigned as text is only looked up or created here, in the
+        # same transaction as the row that uses it.
+        using = kwargs.get("using") or router.db_for_write(
+            TaggedItem, instance=self
+        )
+        with transaction.atomic(using=using):
+            self._meta.get_field("tag").intern(self, using=using)
+            super().save(*args, **kwargs)
+
+
+post_save.connect(catalog_changed, sender=TaggedItem)
+post_delete.connect(catalog_changed, sender=TaggedItem)
+post_save.connect(generations_changed, sender=TaggedItem)
+post_delete.connect(generations_changed, sender=TaggedItem)
+
+
+class RatingManager(models.Manager):
+    """Manager for Rating Model"""
+
+    def upsert(self, ratings, batch_size=500):
+        """Insert or update ratings in batched statements.
+
+        ``ratings`` is an iterable of
+        ``(user_id, content_type_id, object_id, value)`` tuples. Rows are
+        keyed on (user, content_type, object_id) and the last value given
+        for a key wins. Stored playlist aggregates are rebuilt afterwards,
+        since the statement bypasses the Rating signal receivers.
+        """
+        latest = {}
+        for user_id, content_type_id, object_id, value in ratings:
+            latest[(user_id, content_type_id, object_id)] = value
+        if not latest:
+            return 0
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        columns = [
+            opts.get_field(name).column
+            for name in ("user", "content_type", "object_id", "value")
+        ]
+        rows = [key + (value,) for key, value in latest.items()]
+        sql = (
+            "INSERT INTO {table} ({columns}) VALUES {values} "
+            "ON CONFLICT ({key}) DO UPDATE SET {value} = EXCLUDED.{value}"
+        )
+        with transaction.atomic(using=self.db):
+            with connection.cursor() as cursor:
+                for start in range(0, len(rows), batch_size):
+                    end = start + batch_size
+                    batch = rows[start:end]
+                    cursor.execute(
+                        sql.format(
+                            table=quote(opts.db_table),
+                            columns=", ".join(map(quote, columns)),
+                            values=", ".join(
+                                ["(%s, %s, %s, %s)"] * len(batch)
+                            ),
+                            key=", ".join(map(quote, columns[:3])),
+                            value=quote(columns[3]),
+                        ),
+                        [param for row in batch for param in row],
+                    )
+            self._rebuild_playlist_aggregates(latest)
+
+        return len(rows)
+
+    def _rebuild_playlist_aggregates(self, keys):
+        playlist_type = ContentType.objects.db_manager(self.db).get_for_model(
+            Playlist
+        )
+        playlist_ids = {
+            object_id
+            for _, content_type_id, object_id in keys
+            if content_type_id == playlist_type.id
+        }
+        if playlist_ids:
+            Playlist.objects.using(self.db).filter(
+                id__in=playlist_ids
+            ).rebuild_rating_aggregates()
 
 
 class Rating(models.Model):
-    """Tag object"""
+    """Rating object"""
 
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
@@ -138,6 +380,21 @@ class Rating(models.Model):
     object_id = models.PositiveIntegerField()
     content_object = GenericForeignKey("content_type", "object_id")
 
+    objects = RatingManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "content_type", "object_id"],
+                name="unique_user_rating",
+            )
+        ]
+
+
+pre_save.connect(rating_pre_save, sender=Rating)
+post_save.connect(rating_post_save, sender=Rating)
+post_delete.connect(rating_post_delete, sender=Rating)
+
 
 class Category(models.Model):
     """Category object"""
@@ -156,6 +413,21 @@ class Category(models.Model):
         return self.title
 
 
+post_save.connect(catalog_changed, sender=Category)
+post_delete.connect(catalog_changed, sender=Category)
+post_save.connect(generations_changed, sender=Category)
+# Before the delete nulls Playlist.category, so the videos are still found.
+pre_delete.connect(generations_changed, sender=Category)
+
+
+def rating_histogram_field(value):
+    """Return the Playlist field counting ratings of the given value."""
+    return f"rating_{value}_count"
+
+
+RATING_VALUES = [value for value in RatingChoices.values if value is not None]
+
+
 class PlaylistQuerySet(models.QuerySet):
     """Query set for Playlist Model"""
 
@@ -165,6 +437,155 @@ class PlaylistQuerySet(models.QuerySet):
             state=PublishStateOptions.PUBLISH, published_timestamp__lte=now
         )
 
+    def apply_rating_change(self, removed=None, added=None):
+        """Move the stored rating aggregates from one value to another.
+
+        Either side may be None, so this covers new, edited and deleted
+        ratings. Min and max are derived from the histogram afterwards,
+        which keeps them correct when the last extreme rating goes away.
+        """
+        if removed == added:
+            return 0
+        count_delta = int(added is not None) - int(removed is not None)
+        updates = {
+            "rating_count": F("rating_count") + count_delta,
+            "rating_sum": F("rating_sum") + (added or 0) - (removed or 0),
+        }
+        if removed is not None:
+            field = rating_histogram_field(removed)
+            updates[field] = F(field) - 1
+        if added is not None:
+            field = rating_histogram_field(added)
+            updates[field] = F(field) + 1
+        rows = self.update(**updates)
+        if rows:
+            self.update(
+                rating_min=self._histogram_bound(RATING_VALUES),
+                rating_max=self._histogram_bound(reversed(RATING_VALUES)),
+            )
+        return rows
+
+    def _counter_updates(self, seasons=True, episodes=True):
+        updates = {}
+        if seasons:
+            updates["season_count"] = count_subquery(
+                Playlist.objects.filter(
+                    type=PlaylistTypeChoices.SEASON
+                ).published(),
+                "parent",
+            )
+        if episodes:
+            updates["episode_count"] = count_subquery(
+                PlaylistItem.objects.all(), "playlist"
+            )
+        return updates
+
+    def refresh_counters(self, seasons=True, episodes=True):
+        """Recount published seasons and episodes in one UPDATE."""
+        return self.update(**self._counter_updates(seasons, episodes))
+
+    def stale_counters(self, seasons=True, episodes=True):
+        """Return the playlists whose stored counters differ from a recount."""
+        updates = self._counter_updates(seasons, episodes)
+        stale = Q()
+        for field, count in updates.items():
+            stale |= ~Q(**{field: F(f"fresh_{field}")})
+        return self.annotate(
+            **{f"fresh_{field}": count for field, count in updates.items()}
+        ).filter(stale)
+
+    def rebuild_rating_aggregates(self):
+        """Recompute the stored rating aggregates from the Rating table.
+
+        All playlists in the queryset are rebuilt with a single GROUP BY
+        over their ratings. Returns the ids of the rebuilt playlists.
+        """
+        ids = list(self.values_list("id", flat=True))
+        if not ids:
+            return ids
+        playlist_type = ContentType.objects.get_for_model(self.model)
+        histogram = {
+            rating_histogram_field(value): Count("id", filter=Q(value=value))
+            for value in RATING_VALUES
+        }
+        rows = (
+            Rating.objects.filter(
+                content_type=playlist_type, object_id__in=ids
+            )
+            .values("object_id")
+            .order_by()
+            .annotate(
+                rating_count=Count("value"),
+                rating_sum=Sum("value"),
+                rating_min=Min("value"),
+                rating_max=Max("value"),
+                **histogram,
+            )
+        )
+        aggregates = {row.pop("object_id"): row for row in rows}
+
+        empty = dict.fromkeys(histogram, 0)
+        empty.update(
+            rating_count=0, rating_sum=0, rating_min=None, rating_max=None
+        )
+        playlists = []
+        for playlist_id in ids:
+            row = {**empty, **aggregates.get(playlist_id, {})}
+            row["rating_sum"] = row["rating_sum"] or 0
+            playlists.append(self.model(id=playlist_id, **row))
+        with transaction.atomic(using=self.db):
+            self.model.objects.using(self.db).bulk_update(
+                playlists, list(empty)
+            )
+        return ids
+
+    def with_episodes(self):
+        """Prefetch published episodes and their videos as ``episodes``.
+
+        Episodes keep the ``PlaylistItem.Meta.ordering`` order and their
+        videos are joined in, so any number of playlists costs one query.
+        """
+        items = PlaylistItem.objects.filter(
+            video__in=Video.objects.published()
+        ).select_related("video")
+        return self.prefetch_related(
+            Prefetch("playlistitem_set", queryset=items, to_attr="episodes")
+        )
+
+    def with_seasons(self):
+        """Prefetch published seasons, with their episodes, as
+        ``published_seasons``.
+        """
+        seasons = (
+            Playlist.objects.published()
+            .order_by("order", "id")
+            .with_episodes()
+        )
+        return self.prefetch_related(
+            Prefetch(
+                "playlist_set", queryset=seasons, to_attr="published_seasons"
+            )
+        )
+
+    def descendants_of(self, playlist):
+        """Every playlist below ``playlist``, at any depth."""
+        return self.filter(path__startswith=playlist.descendant_path)
+
+    def ancestors_of(self, playlist):
+        """The parents of ``playlist``, root first."""
+        return self.filter(id__in=playlist.ancestor_ids).order_by(
+            Length("path")
+        )
+
+    @staticmethod
+    def _histogram_bound(values):
+        """Case expression picking the first value with any ratings."""
+        whens = [
+            When(**{f"{rating_histogram_field(value)}__gt": 0}, then=value)
+            for value in values
+        ]
+        return Case(*whens, default=Value(None))
+
 
 class PlaylistManager(models.Manager):
     """Manager for Playlist Model"""
@@ -178,6 +599,18 @@ class PlaylistManager(models.Manager):
     def featured_playlist(self):
         return self.get_queryset().filter(type=PlaylistTypeChoices.PLAYLIST)
 
+    def with_episodes(self):
+        return self.get_queryset().with_episodes()
+
+    def with_seasons(self):
+        return self.get_queryset().with_seasons()
+
+    def descendants_of(self, playlist):
+        return self.get_queryset().descendants_of(playlist)
+
+    def ancestors_of(self, playlist):
+        return self.get_queryset().ancestors_of(playlist)
+
 
 class Playlist(models.Model):
     """Playlist object"""
@@ -221,30 +654,98 @@ class Playlist(models.Model):
     published_timestamp = models.DateTimeField(
         auto_now_add=False, auto_now=False, blank=True, null=True
     )
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_min = models.PositiveSmallIntegerField(
+        blank=True, null=True, editable=False
+    )
+    rating_max = models.PositiveSmallIntegerField(
+        blank=True, null=True, editable=False
+    )
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+    season_count = models.PositiveIntegerField(default=0, editable=False)
+    episode_count = models.PositiveIntegerField(default=0, editable=False)
+    # Ids of every ancestor, root first, e.g. "/12/40/" for an episode
+    # list under season 40 of show 12. Maintained by the path receivers.
+    path = models.CharField(
+        max_length=255, default="/", editable=False, db_index=True
+    )
     tags = GenericRelation(TaggedItem, related_query_name="playlist")
     ratings = GenericRelation(Rating, related_query_name="playlist")
 
     objects = PlaylistManager()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["parent", "slug"], name="unique_playlist_parent_slug"
+            ),
+            models.UniqueConstraint(
+                fields=["slug"],
+                condition=models.Q(parent__isnull=True),
+                name="unique_playlist_root_slug",
+            ),
+        ]
+        indexes = [
+            # PlaylistQuerySet.published()
+            models.Index(
+                fields=["state", "published_timestamp"],
+                name="playlist_state_published_idx",
+            ),
+            # Movie, show and season managers.
+            models.Index(
+                fields=["type", "parent"], name="playlist_type_parent_idx"
+            ),
+            models.Index(
+                fields=["type", "published_timestamp"],
+                condition=models.Q(state=PublishStateOptions.PUBLISH),
+                name="playlist_published_type_idx",
+            ),
+            # slug__iexact lookups compare UPPER(slug) on Postgres.
+            models.Index(Upper("slug"), name="playlist_slug_upper_idx"),
+        ]
+
     @property
     def is_published(self):
         return self.active
 
+    @property
+    def ancestor_ids(self):
+        return [int(pk) for pk in self.path.split("/") if pk]
+
+    @property
+    def descendant_path(self):
+        """Path prefix shared by every playlist below this one."""
+        return f"{self.path}{self.pk}/"
+
+    def get_ancestors(self):
+        return Playlist.objects.ancestors_of(self)
+
+    def get_descendants(self):
+        return Playlist.objects.descendants_of(self)
+
     def get_rating_avg(self):
-        if not self.ratings:
+        if not self.rating_count:
             return None
-        else:
-            return Playlist.objects.filter(id=self.id).aggregate(
-                average=Avg("ratings__value")
-            )
+        return {"average": self.rating_sum / self.rating_count}
 
     def get_rating_spread(self):
-        if not self.ratings:
+        if not self.rating_count:
             return None
-        else:
-            return Playlist.objects.filter(id=self.id).aggregate(
-                max=Max("ratings__value"), min=Min("ratings__value")
-            )
+        return {"max": self.rating_max, "min": self.rating_min}
+
+    def get_rating_histogram(self):
+        return {
+            value: getattr(self, rating_histogram_field(value))
+            for value in RATING_VALUES
+        }
+
+    def save(self, *args, **kwargs):
+        save_with_unique_slug(self, super().save, *args, **kwargs)
 
     def get_short_display(self):
         return ""
@@ -261,6 +762,12 @@ class PlaylistItem(models.Model):
 
     class Meta:
         ordering = ["order", "-timestamp"]
+        indexes = [
+            models.Index(
+                fields=["playlist", "order", "-timestamp"],
+                name="playlistitem_order_idx",
+            ),
+        ]
 
 
 class MovieProxyManager(PlaylistManager):
@@ -308,10 +815,12 @@ class TVShowProxy(Playlist):
 
     @property
     def seasons(self):
+        if hasattr(self, "published_seasons"):
+            return self.published_seasons
         return self.playlist_set.published()
 
     def get_short_display(self):
-        return f"{self.seasons.count()} Seasons"
+        return f"{self.season_count} Seasons"
 
 
 class TVShowSeasonProxyManager(PlaylistManager):
@@ -335,6 +844,14 @@ class TVShowSeasonProxy(Playlist):
         self.type = PlaylistTypeChoices.SEASON
         super().save(*args, **kwargs)
 
+    def get_short_display(self):
+        return f"{self.episode_count} Episodes"
+
+
+pre_save.connect(playlist_item_pre_save, sender=PlaylistItem)
+post_save.connect(playlist_item_post_save, sender=PlaylistItem)
+post_delete.connect(playlist_item_post_delete, sender=PlaylistItem)
+m2m_changed.connect(playlist_videos_changed, sender=Playlist.videos.through)
 
 pre_save.connect(publish_state_pre_save, sender=Playlist)
 pre_save.connect(unique_slugify_pre_save, sender=Playlist)
@@ -347,3 +864,64 @@ pre_save.connect(unique_slugify_pre_save, sender=TVShowSeasonProxy)
 
 pre_save.connect(publish_state_pre_save, sender=MovieProxy)
 pre_save.connect(unique_slugify_pre_save, sender=MovieProxy)
+
+pre_save.connect(playlist_pre_save, sender=Playlist)
+post_save.connect(playlist_post_save, sender=Playlist)
+post_delete.connect(playlist_post_delete, sender=Playlist)
+pre_save.connect(playlist_path_pre_save, sender=Playlist)
+post_save.connect(playlist_path_post_save, sender=Playlist)
+post_delete.connect(playlist_path_post_delete, sender=Playlist)
+
+pre_save.connect(playlist_pre_save, sender=TVShowProxy)
+post_save.connect(playlist_post_save, sender=TVShowProxy)
+post_delete.connect(playlist_post_delete, sender=TVShowProxy)
+pre_save.connect(playlist_path_pre_save, sender=TVShowProxy)
+post_save.connect(playlist_path_post_save, sender=TVShowProxy)
+post_delete.connect(playlist_path_post_delete, sender=TVShowProxy)
+
+pre_save.connect(playlist_pre_save, sender=TVShowSeasonProxy)
+post_save.connect(playlist_post_save, sender=TVShowSeasonProxy)
+post_delete.connect(playlist_post_delete, sender=TVShowSeasonProxy)
+pre_save.connect(playlist_path_pre_save, sender=TVShowSeasonProxy)
+post_save.connect(playlist_path_post_save, sender=TVShowSeasonProxy)
+post_delete.connect(playlist_path_post_delete, sender=TVShowSeasonProxy)
+
+pre_save.connect(playlist_pre_save, sender=MovieProxy)
+post_save.connect(playlist_post_save, sender=MovieProxy)
+post_delete.connect(playlist_post_delete, sender=MovieProxy)
+pre_save.connect(playlist_path_pre_save, sender=MovieProxy)
+post_save.connect(playlist_path_post_save, sender=MovieProxy)
+post_delete.connect(playlist_path_post_delete, sender=MovieProxy)
+
+post_save.connect(catalog_changed, sender=Playlist)
+post_delete.connect(catalog_changed, sender=Playlist)
+post_save.connect(catalog_changed, sender=TVShowProxy)
+post_delete.connect(catalog_changed, sender=TVShowProxy)
+post_save.connect(catalog_changed, sender=TVShowSeasonProxy)
+post_delete.connect(catalog_changed, sender=TVShowSeasonProxy)
+post_save.connect(catalog_changed, sender=MovieProxy)
+post_delete.connect(catalog_changed, sender=MovieProxy)
+post_save.connect(catalog_changed, sender=PlaylistItem)
+post_delete.connect(catalog_changed, sender=PlaylistItem)
+m2m_changed.connect(catalog_changed, sender=Playlist.videos.through)
+
+post_save.connect(generations_changed, sender=Playlist)
+post_delete.connect(generations_changed, sender=Playlist)
+post_save.connect(generations_changed, sender=TVShowProxy)
+post_delete.connect(generations_changed, sender=TVShowProxy)
+post_save.connect(generations_changed, sender=TVShowSeasonProxy)
+post_delete.connect(generations_changed, sender=TVShowSeasonProxy)
+post_save.connect(generations_changed, sender=MovieProxy)
+post_delete.connect(generations_changed, sender=MovieProxy)
+post_save.connect(generations_changed, sender=PlaylistItem)
+post_delete.connect(generations_changed, sender=PlaylistItem)
+m2m_changed.connect(
+    playlist_videos_generations_changed, sender=Playlist.videos.through
+)
+
+
+post_save.connect(featured_playlist_changed, sender=Playlist)
+post_delete.connect(featured_playlist_changed, sender=Playlist)
+post_save.connect(featured_playlist_changed, sender=TVShowProxy)
+post_save.connect(featured_playlist_changed, sender=TVShowSeasonProxy)
+post_save.connect(featured_playlist_changed, sender=MovieProxy)
@@ -0,0 +1,86 @@
+"""Keyset pagination for the catalog API and HTML lists."""
+
+import json
+
+from django.db import connections
+from django.http import Http404
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for ``queryset``.
+
+    Only Postgres exposes one cheaply; elsewhere None is returned rather
+    than running a ``COUNT(*)``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CatalogCursorPagination(CursorPagination):
+    """Cursor pagination on the primary key, newest first.
+
+    Each page is one ``WHERE id < cursor ORDER BY id DESC LIMIT n`` range
+    scan of the primary key index, so deep pages cost the same as the
+    first and no ``COUNT(*)`` runs. Cursors are opaque. ``?estimate=1``
+    adds the planner's ``estimated_count`` of the whole list.
+    """
+
+    ordering = "-id"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.estimate = request.query_params.get("estimate") in ("1", "true")
+        self.estimate_queryset = queryset
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.estimate:
+            response.data["estimated_count"] = estimate_count(
+                self.estimate_queryset
+            )
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"]["estimated_count"] = {
+            "type": "integer",
+            "nullable": True,
+        }
+        return schema
+
+
+class CursorPageMixin:
+    """Page a ``ListView`` with the API's keyset cursors.
+
+    The template gets ``paginator``, whose ``get_next_link`` and
+    ``get_previous_link`` hold the neighbouring page URLs.
+    """
+
+    paginate_by = 24
+    pagination_class = CatalogCursorPagination
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.pagination_class()
+        paginator.page_size = page_size
+        try:
+            object_list = paginator.paginate_queryset(
+                queryset, Request(self.request)
+            )
+        except NotFound:
+            raise Http404
+        is_paginated = paginator.has_next or paginator.has_previous
+        return paginator, None, object_list, is_paginated
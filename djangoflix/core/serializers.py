@@ -0,0 +1,104 @@
+"""Serializer helpers shared by the API apps."""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.db.models import prefetch_related_objects
+
+from rest_framework import serializers
+
+from core.cache import generation_stamps, representation_cache_key
+
+
+class CachedListSerializer(serializers.ListSerializer):
+    """List serializer that reads its children's representation cache."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        return self.child.to_representation_many(list(iterable))
+
+
+class RepresentationCacheMixin:
+    """Opt-in cache of each object's serialized dict.
+
+    Entries are keyed by model, pk, ``updated`` stamp and stored counters,
+    plus the generations of ``representation_scopes(instance)``. The
+    receivers bump an object's scope once a change to the rows nested in
+    it commits, so tag, category or episode edits miss the cache of just
+    the objects that show them, without deleting anything. Only one
+    cached serializer may exist per model.
+    ``representation_prefetch`` lists the lookups the output needs; they
+    run only for the objects missing from the cache, so a warm page skips
+    the nested queries altogether.
+    Pair the mixin with ``list_serializer_class = CachedListSerializer``
+    so list pages fetch every entry with one ``get_many``.
+    """
+
+    # Only complete representations are cached.
+    representation_cacheable = True
+    representation_prefetch = ()
+
+    def representation_scopes(self, instance):
+        """Return the generation scopes the output of ``instance`` uses."""
+        return ()
+
+    def get_representation_prefetch(self):
+        return self.representation_prefetch
+
+    def to_representation(self, instance):
+        if instance.pk is None or not self.representation_cacheable:
+            return super().to_representation(instance)
+        return self.to_representation_many([instance])[0]
+
+    def to_representation_many(self, instances):
+        if not self.representation_cacheable:
+            return [
+                super(RepresentationCacheMixin, self).to_representation(obj)
+                for obj in instances
+            ]
+        stamps = generation_stamps(
+            self.representation_scopes(instance) for instance in instances
+        )
+        keys = [
+            representation_cache_key(instance, stamp)
+            for instance, stamp in zip(instances, stamps)
+        ]
+        cached = cache.get_many(keys)
+        misses = [
+            instance
+            for key, instance in zip(keys, instances)
+            if key not in cached
+        ]
+        lookups = self.get_representation_prefetch()
+        if misses and lookups:
+            prefetch_related_objects(misses, *lookups)
+        missing = {}
+        results = []
+        for key, instance in zip(keys, instances):
+            data = cached.get(key)
+            if data is None:
+                data = missing[key] = super().to_representation(instance)
+            results.append(data)
+        if missing:
+            cache.set_many(
+                missing,
+                getattr(settings, "REPRESENTATION_CACHE_TIMEOUT", 3600),
+            )
+        return results
+
+
+class SparseFieldsMixin:
+    """Serialize only the field names passed as ``fields``.
+
+    ``Meta.expandable_fields`` lists the relations a client has to ask
+    for by name once it restricts the fields; see
+    ``core.fieldsets.SparseFieldsetMixin``. A restricted serializer skips
+    the representation cache, which only holds complete objects.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+            self.representation_cacheable = False
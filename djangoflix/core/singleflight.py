@@ -0,0 +1,246 @@
+"""Coalesce concurrent recomputations of the same cache key."""
+
+import logging
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connection
+from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.05
+
+# How stale-while-revalidate lookups were answered: fresh, stale or miss.
+revalidation_stats = Counter()
+
+
+class SingleFlight:
+    """Let one thread per key run a computation while the others wait."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def run(self, key, compute, wait):
+        """Return ``(True, compute())`` if this thread led the flight.
+
+        If another thread is already computing ``key``, wait up to
+        ``wait`` seconds for it to land and return ``(False, None)``.
+        """
+        with self._lock:
+            event = self._flights.get(key)
+            leader = event is None
+            if leader:
+                event = self._flights[key] = threading.Event()
+        if not leader:
+            event.wait(wait)
+            return False, None
+        try:
+            return True, compute()
+        finally:
+            with self._lock:
+                del self._flights[key]
+            event.set()
+
+
+flights = SingleFlight()
+
+
+def _previous_key(key):
+    return f"{key}:previous"
+
+
+def _wait_for_other_node(key, wait):
+    """Poll for the value another node is computing, else its previous."""
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return cache.get(_previous_key(key))
+
+
+def _compute(key, compute, timeout, cacheable, shared_lock, wait):
+    # The last leader may have stored the value while we queued.
+    value = cache.get(key)
+    if value is not None:
+        return value
+    lock_key = None
+    if shared_lock:
+        lock_timeout = getattr(settings, "SINGLE_FLIGHT_LOCK_TIMEOUT", 30)
+        if cache.add(f"singleflight:{key}", True, lock_timeout):
+            lock_key = f"singleflight:{key}"
+        else:
+            value = _wait_for_other_node(key, wait)
+            if value is not None:
+                return value
+    try:
+        value = compute()
+        if value is not None and (cacheable is None or cacheable(value)):
+            cache.set(key, value, timeout)
+            if shared_lock:
+                cache.set(_previous_key(key), value, None)
+        return value
+    finally:
+        if lock_key is not None:
+            cache.delete(lock_key)
+
+
+def get_or_compute(
+    key,
+    compute,
+    timeout=DEFAULT_TIMEOUT,
+    cacheable=None,
+    shared_lock=False,
+    wait=None,
+):
+    """Return the cached value of ``key``, computing it at most once.
+
+    On a miss, only one thread per process runs ``compute`` and stores
+    its result; the others wait up to ``wait`` seconds
+    (``SINGLE_FLIGHT_WAIT``) and read it from the cache. With
+    ``shared_lock`` a lock key also keeps other nodes waiting, and they
+    fall back to the previous value if the leader is slow. Results that
+    are None or fail ``cacheable`` are returned but not stored, so
+    waiters then compute their own.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    if wait is None:
+        wait = getattr(settings, "SINGLE_FLIGHT_WAIT", 5)
+
+    def lead():
+        return _compute(key, compute, timeout, cacheable, shared_lock, wait)
+
+    led, value = flights.run(key, lead, wait)
+    if led:
+        return value
+    value = cache.get(key)
+    if value is not None:
+        return value
+    return lead()
+
+
+def single_flight(key_func, timeout=DEFAULT_TIMEOUT, **options):
+    """Cache a function's result under ``key_func(*args, **kwargs)``.
+
+    Misses are coalesced with ``get_or_compute``. Querysets are evaluated
+    to lists and template responses rendered before they are stored. A
+    ``key_func`` returning None calls the function uncached. On methods,
+    ``key_func`` also receives ``self``.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = key_func(*args, **kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+
+            def compute():
+                value = func(*args, **kwargs)
+                if isinstance(value, QuerySet):
+                    value = list(value)
+                elif getattr(value, "is_rendered", True) is False:
+                    value.render()
+                return value
+
+            return get_or_compute(key, compute, timeout, **options)
+
+        return wrapper
+
+    return decorator
+
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _refresh_in_background():
+    # A thread has its own connection and cannot see rows the current
+    # transaction has not committed, so refresh inline inside one.
+    return not connection.in_atomic_block
+
+
+def _start_refresh(key, store):
+    """Run ``store`` on a background thread unless a refresh of ``key``
+    is already running here or, per its lock key, on another node.
+    """
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    lock_key = f"revalidate:{key}"
+    lock_timeout = getattr(settings, "SINGLE_FLIGHT_LOCK_TIMEOUT", 30)
+    if not cache.add(lock_key, True, lock_timeout):
+        with _refreshing_lock:
+            _refreshing.discard(key)
+        return
+
+    def run():
+        try:
+            store()
+        except Exception:
+            logger.exception("Refreshing %s failed", key)
+        finally:
+            cache.delete(lock_key)
+            with _refreshing_lock:
+                _refreshing.discard(key)
+            connection.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_or_revalidate(
+    key, compute, fresh_timeout, stale_timeout, version=None, cacheable=None
+):
+    """Return the cache entry for ``key``, serving stale values at once.
+
+    Entries are dicts of ``value``, ``fresh_until`` and ``version``. They
+    are fresh for ``fresh_timeout`` seconds while ``version`` matches, and
+    kept for ``stale_timeout`` seconds more. A stale entry is returned
+    immediately while one background thread recomputes it; only a
+    missing entry makes the caller wait, coalesced as in
+    ``get_or_compute``.
+    """
+
+    def store():
+        value = compute()
+        entry = {
+            "value": value,
+            "fresh_until": time.time() + fresh_timeout,
+            "version": version,
+        }
+        if cacheable is None or cacheable(value):
+            cache.set(key, entry, fresh_timeout + stale_timeout)
+        return entry
+
+    entry = cache.get(key)
+    if entry is not None:
+        if entry["version"] == version and time.time() < entry["fresh_until"]:
+            revalidation_stats["fresh"] += 1
+            return entry
+        if _refresh_in_background():
+            revalidation_stats["stale"] += 1
+            logger.debug("Serving stale %s", key)
+            _start_refresh(key, store)
+            return entry
+
+    revalidation_stats["miss"] += 1
+    led, entry = flights.run(
+        key, store, getattr(settings, "SINGLE_FLIGHT_WAIT", 5)
+    )
+    if led:
+        return entry
+    entry = cache.get(key)
+    if entry is not None and entry["version"] == version:
+        return entry
+    return store()
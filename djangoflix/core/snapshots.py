@@ -0,0 +1,136 @@
+"""Prebuilt snapshot of the featured home page."""
+
+import json
+import logging
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from core.cache import render_fragments
+from core.db.models import PublishStateOptions
+from core.singleflight import get_or_compute
+
+logger = logging.getLogger(__name__)
+
+HOME_SNAPSHOT_KEY = "catalog:home"
+HOME_TEMPLATE = "playlist_list.html"
+HOME_ROW_TEMPLATE = "playlists/playlist_row.html"
+HOME_TITLE = "Featured"
+
+
+def render_home_snapshot():
+    """Render the home page HTML and JSON together as one dict."""
+    Playlist = apps.get_model("core", "Playlist")
+    now = timezone.now()
+    featured = Playlist.objects.featured_playlist()
+    playlists = list(featured.published().order_by("id"))
+    html = render_to_string(
+        HOME_TEMPLATE,
+        {
+            "title": HOME_TITLE,
+            "object_list": playlists,
+            "rows": render_fragments(HOME_ROW_TEMPLATE, playlists),
+        },
+    )
+    data = json.dumps(
+        [
+            {
+                "id": playlist.id,
+                "title": playlist.title,
+                "slug": playlist.slug,
+                "description": playlist.description,
+                "short_display": playlist.get_short_display(),
+            }
+            for playlist in playlists
+        ]
+    )
+    next_publish = featured.filter(
+        state=PublishStateOptions.PUBLISH, published_timestamp__gt=now
+    ).aggregate(next_publish=Min("published_timestamp"))["next_publish"]
+    return {
+        "html": html,
+        "json": data,
+        "built_at": now.timestamp(),
+        "valid_until": next_publish.timestamp() if next_publish else None,
+    }
+
+
+def build_home_snapshot():
+    """Render the home snapshot and store it as one entry.
+
+    Everything is built in memory before the single ``cache.set``, so
+    readers see either the previous snapshot or the complete new one.
+    """
+    snapshot = render_home_snapshot()
+    cache.set(HOME_SNAPSHOT_KEY, snapshot, timeout=None)
+    return snapshot
+
+
+class SnapshotRebuilder:
+    """Rebuild the home snapshot on a background thread.
+
+    Requests made while a rebuild runs are folded into one more pass
+    after it, so the last change is always reflected. With
+    ``HOME_SNAPSHOT_BACKGROUND`` off the rebuild runs inline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = False
+        self._again = False
+
+    def schedule(self):
+        """Start a rebuild; return the snapshot if it was built inline."""
+        if not getattr(settings, "HOME_SNAPSHOT_BACKGROUND", True):
+            return build_home_snapshot()
+        with self._lock:
+            if self._running:
+                self._again = True
+                return None
+            self._running = True
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+        return None
+
+    def _run(self):
+        try:
+            while True:
+                with self._lock:
+                    self._again = False
+                try:
+                    build_home_snapshot()
+                except Exception:
+                    logger.exception("Home snapshot rebuild failed")
+                with self._lock:
+                    if not self._again:
+                        self._running = False
+                        return
+        finally:
+            connection.close()
+
+
+home_snapshot_rebuilder = SnapshotRebuilder()
+
+
+def get_home_snapshot():
+    """Return the stored snapshot, building it only on a cold cache.
+
+    A cold build runs once across all nodes while the others wait. Once
+    a scheduled ``published_timestamp`` has passed the current snapshot
+    is still served while a fresh one is built.
+    """
+    snapshot = cache.get(HOME_SNAPSHOT_KEY)
+    if snapshot is None:
+        return get_or_compute(
+            HOME_SNAPSHOT_KEY, render_home_snapshot, None, shared_lock=True
+        )
+    valid_until = snapshot["valid_until"]
+    if valid_until is not None and timezone.now().timestamp() >= valid_until:
+        return home_snapshot_rebuilder.schedule() or snapshot
+    return snapshot
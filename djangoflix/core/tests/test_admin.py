@@ -6,6 +6,9 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import Client
 
+from core.admin import TaggedItemForm
+from core.models import Playlist, Tag, TaggedItem
+
 
 class AdminSiteTests(TestCase):
     """Tests for Django admin."""
@@ -43,3 +46,32 @@ class AdminSiteTests(TestCase):
         res = self.client.get(url)
 
         self.assertEqual(res.status_code, 200)
+
+    def test_tagged_item_inline_string_api(self):
+        """Test tags are edited as text on the playlist admin page."""
+        playlist = Playlist.objects.create(title="Sample playlist")
+        playlist.tags.create(tag="drama")
+        url = reverse("admin:core_playlist_change", args=[playlist.id])
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, 'value="drama"')
+
+    def test_tagged_item_form_creates_no_tag(self):
+        """Test validating the tag form does not create Tag rows."""
+        playlist = Playlist.objects.create(title="Sample playlist")
+        playlist.tags.create(tag="drama")
+        form = TaggedItemForm(
+            data={"tag": "comedy"},
+            instance=TaggedItem(content_object=playlist),
+        )
+
+        self.assertTrue(form.is_valid())
+        self.assertFalse(Tag.objects.filter(name="comedy").exists())
+
+        form.save()
+
+        self.assertEqual(
+            playlist.tags.get(tag__name="comedy").tag.name, "comedy"
+        )
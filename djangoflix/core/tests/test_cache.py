@@ -0,0 +1,179 @@
+"""
+Tests for the catalog cache helpers.
+"""
+import threading
+from unittest.mock import Mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.cache import (
+    bump_generations,
+    generation_scope,
+    generation_stamp,
+    get_generations,
+    object_scope,
+    show_scope,
+)
+from core.db.models import PublishStateOptions
+from core.singleflight import get_or_compute, single_flight
+from core.models import (
+    Category,
+    Playlist,
+    PlaylistItem,
+    TVShowProxy,
+    TVShowSeasonProxy,
+    Video,
+)
+
+
+class GenerationTests(TestCase):
+    """Test the per scope generation counters."""
+
+    def setUp(self):
+        cache.clear()
+        self.show = TVShowProxy.objects.create(title="Show")
+        self.season = TVShowSeasonProxy.objects.create(
+            title="Season 1", parent=self.show
+        )
+
+    def test_batched_lookup(self):
+        """Test generations are read with one get_many and stay put."""
+        scopes = [generation_scope(Playlist), generation_scope(Video)]
+
+        first = get_generations(scopes)
+
+        self.assertEqual(set(first), set(scopes))
+        self.assertEqual(get_generations(scopes), first)
+
+    def test_bump(self):
+        """Test bumping one scope leaves the others alone."""
+        playlists, videos = generation_scope(Playlist), "core.video"
+        before = get_generations([playlists, videos])
+
+        bump_generations([playlists])
+
+        after = get_generations([playlists, videos])
+        self.assertEqual(after[playlists], before[playlists] + 1)
+        self.assertEqual(after[videos], before[videos])
+
+    def test_bumped_on_commit(self):
+        """Test saves bump their scopes only once the transaction commits."""
+        scopes = [generation_scope(Playlist), show_scope(self.show.id)]
+        stamp = generation_stamp(scopes)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.season.title = "Renamed"
+            self.season.save()
+            self.assertEqual(generation_stamp(scopes), stamp)
+        for callback in callbacks:
+            callback()
+
+        self.assertNotEqual(generation_stamp(scopes), stamp)
+
+    def test_episode_bumps_show(self):
+        """Test adding an episode bumps its show and video, not others."""
+        video = Video.objects.create(
+            user=get_user_model().objects.create_user(
+                email="user@example.com", password="x"
+            ),
+            title="Pilot",
+            video_id="pilot",
+            state=PublishStateOptions.PUBLISH,
+        )
+        other = TVShowProxy.objects.create(title="Other")
+        scopes = [
+            show_scope(self.show.id),
+            object_scope(Video, video.id),
+            show_scope(other.id),
+        ]
+        before = get_generations(scopes)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PlaylistItem.objects.create(playlist=self.season, video=video)
+
+        after = get_generations(scopes)
+        self.assertGreater(after[scopes[0]], before[scopes[0]])
+        self.assertGreater(after[scopes[1]], before[scopes[1]])
+        self.assertEqual(after[scopes[2]], before[scopes[2]])
+
+    def test_category_scope(self):
+        """Test category changes bump only the category scope."""
+        scopes = [generation_scope(Category), generation_scope(Playlist)]
+        before = get_generations(scopes)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Category.objects.create(title="Drama")
+
+        after = get_generations(scopes)
+        self.assertGreater(after[scopes[0]], before[scopes[0]])
+        self.assertEqual(after[scopes[1]], before[scopes[1]])
+
+
+class SingleFlightTests(TestCase):
+    """Test coalescing of concurrent cache misses."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_compute_once(self):
+        """Test waiting threads get the leader's result."""
+        started, release = threading.Event(), threading.Event()
+
+        def compute():
+            started.set()
+            release.wait(5)
+            return "value"
+
+        compute = Mock(side_effect=compute)
+        results = []
+
+        def fetch():
+            results.append(get_or_compute("key", compute))
+
+        threads = [threading.Thread(target=fetch) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        compute.assert_called_once()
+        self.assertEqual(results, ["value"] * 5)
+
+    def test_uncacheable_not_stored(self):
+        """Test results failing ``cacheable`` are returned only."""
+        value = get_or_compute(
+            "key", lambda: 404, cacheable=lambda v: v < 400
+        )
+
+        self.assertEqual(value, 404)
+        self.assertIsNone(cache.get("key"))
+
+    def test_other_node_previous_value(self):
+        """Test a held shared lock serves the previous value."""
+        cache.set("singleflight:key", True)
+        cache.set("key:previous", "previous")
+        compute = Mock(return_value="value")
+
+        value = get_or_compute("key", compute, shared_lock=True, wait=0.1)
+
+        self.assertEqual(value, "previous")
+        compute.assert_not_called()
+
+    def test_decorated_queryset(self):
+        """Test decorated queryset functions are evaluated and cached."""
+
+        @single_flight(lambda title: f"test:playlists:{title}")
+        def playlists(title):
+            return Playlist.objects.filter(title=title)
+
+        show = TVShowProxy.objects.create(title="Show")
+        self.assertEqual([p.id for p in playlists("Show")], [show.id])
+
+        with self.assertNumQueries(0):
+            result = playlists("Show")
+        self.assertIsInstance(result, list)
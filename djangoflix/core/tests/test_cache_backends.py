@@ -0,0 +1,132 @@
+"""
+Tests for the two tier cache backend.
+"""
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from core.cache_backends import TwoTierCache
+
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache_backends.TwoTierCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"L1_MAX_ENTRIES": 3, "L1_TIMEOUT": 5},
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "two-tier-tests",
+    },
+}
+
+
+@override_settings(CACHES=CACHES)
+class TwoTierCacheTests(TestCase):
+    """Test the in-process LRU in front of the shared cache."""
+
+    def setUp(self):
+        self.cache = caches["default"]
+        self.shared = caches["shared"]
+        self.cache.clear()
+
+    def counts(self):
+        stats = self.cache.stats()
+        return stats["hits"], stats["misses"]
+
+    def test_is_default_backend(self):
+        """Test the backend is usable as the default cache."""
+        self.assertIsInstance(self.cache, TwoTierCache)
+
+    def test_local_hit_skips_shared(self):
+        """Test a repeated get is served without the shared tier."""
+        self.cache.set("key", {"a": 1})
+        hits, misses = self.counts()
+
+        with patch.object(self.shared, "get") as shared_get:
+            self.assertEqual(self.cache.get("key"), {"a": 1})
+        shared_get.assert_not_called()
+        self.assertEqual(self.counts(), (hits + 1, misses))
+
+    def test_miss_fills_local(self):
+        """Test a shared value is kept locally after the first read."""
+        self.shared.set("key", "value")
+        hits, misses = self.counts()
+
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(self.cache.get("key"), "value")
+
+        self.assertEqual(self.counts(), (hits + 1, misses + 1))
+        self.assertEqual(self.cache.get("absent", "default"), "default")
+
+    def test_values_copied(self):
+        """Test mutating a returned value leaves the cached one intact."""
+        self.cache.set("key", ["a"])
+        self.cache.get("key").append("b")
+
+        self.assertEqual(self.cache.get("key"), ["a"])
+
+    def test_lru_bounded(self):
+        """Test the least recently used entry is evicted."""
+        for key in "abc":
+            self.cache.set(key, key)
+        self.cache.get("a")
+        self.cache.set("d", "d")
+
+        self.assertEqual(self.cache.stats()["size"], 3)
+        with patch.object(self.shared, "get", return_value="b") as get:
+            self.cache.get("b")
+            self.cache.get("a")
+        get.assert_called_once()
+
+    def test_local_timeout(self):
+        """Test local entries expire so other nodes' writes show up."""
+        self.cache.set("key", "old")
+        self.shared.set("key", "new")
+        self.assertEqual(self.cache.get("key"), "old")
+
+        with patch("core.cache_backends.time.monotonic", return_value=1e12):
+            self.assertEqual(self.cache.get("key"), "new")
+
+    def test_get_many_set_many(self):
+        """Test batch reads only send local misses to the shared tier."""
+        self.cache.set_many({"a": 1, "b": 2})
+        self.shared.set("c", 3)
+
+        with patch.object(
+            self.shared, "get_many", wraps=self.shared.get_many
+        ) as get_many:
+            values = self.cache.get_many(["a", "b", "c", "d"])
+
+        self.assertEqual(values, {"a": 1, "b": 2, "c": 3})
+        get_many.assert_called_once_with(["c", "d"], version=None)
+
+    def test_delete_and_incr(self):
+        """Test deletes and increments update both tiers."""
+        self.cache.set("key", "value")
+        self.cache.delete("key")
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.shared.get("key"))
+
+        self.cache.set("count", 1)
+        self.assertEqual(self.cache.incr("count"), 2)
+        self.assertEqual(self.cache.get("count"), 2)
+        self.assertEqual(self.shared.get("count"), 2)
+
+    def test_version_bump_invalidates(self):
+        """Test incr_version drops the old local entry."""
+        self.cache.set("key", "value")
+
+        self.cache.incr_version("key")
+
+        self.assertIsNone(self.cache.get("key"))
+        self.assertEqual(self.cache.get("key", version=2), "value")
+
+    def test_clear_local(self):
+        """Test clearing the local tier keeps the shared values."""
+        self.cache.set("key", "value")
+
+        self.cache.clear_local()
+
+        self.assertEqual(self.cache.stats()["size"], 0)
+        self.assertEqual(self.cache.get("key"), "value")
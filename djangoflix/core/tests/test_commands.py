@@ -1,11 +1,27 @@
 """Test custom Django managemaent commands"""
 
+import json
+import os
+import tempfile
+from io import StringIO
 from unittest.mock import patch
 from psycopg2 import OperationalError as Psycopg2Error
 
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
+
+from core.models import (
+    MovieProxy,
+    Playlist,
+    TVShowProxy,
+    TVShowSeasonProxy,
+    Video,
+)
+from video.serializers import VideoSerializer
 
 
 @patch("core.management.commands.wait_for_db.Command.check")
@@ -29,3 +45,213 @@ class CommandTest(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=["default"])
+
+
+class ImportCatalogCommandTest(TestCase):
+    """Test the import_catalog command"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            "importer@example.com", "testpass123"
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as stream:
+            stream.write(content)
+        return path
+
+    def run_import(self, path, **kwargs):
+        call_command(
+            "import_catalog",
+            path,
+            user=self.user.email,
+            stdout=StringIO(),
+            **kwargs,
+        )
+
+    def test_import_jsonl_hierarchy(self):
+        """Test importing a show with seasons and episodes from JSONL"""
+        records = [
+            {"type": "show", "key": "office", "title": "The Office"},
+            {
+                "type": "season",
+                "key": "office-1",
+                "parent": "office",
+                "title": "Season 1",
+                "state": "PU",
+                "order": 1,
+            },
+            {
+                "type": "season",
+                "key": "office-2",
+                "parent": "office",
+                "title": "Season 1",
+                "order": 2,
+            },
+            {
+                "type": "episode",
+                "parent": "office-1",
+                "title": "Pilot",
+                "video_id": "pilot",
+                "state": "PU",
+                "order": 1,
+            },
+            {
+                "type": "episode",
+                "parent": "office-1",
+                "title": "Diversity Day",
+                "video_id": "diversity-day",
+                "order": 2,
+            },
+            {
+                "type": "movie",
+                "title": "The Office Movie",
+                "video_id": "office-movie",
+            },
+        ]
+        path = self.write(
+            "catalog.jsonl", "\n".join(json.dumps(r) for r in records)
+        )
+
+        self.run_import(path, batch_size=2)
+
+        show = TVShowProxy.objects.get(title="The Office")
+        seasons = TVShowSeasonProxy.objects.filter(parent=show).order_by(
+            "order"
+        )
+        self.assertEqual(
+            [s.slug for s in seasons], ["season-1", "season-1-2"]
+        )
+        self.assertIsNotNone(seasons[0].published_timestamp)
+        self.assertIsNone(seasons[1].published_timestamp)
+        self.assertEqual(
+            list(seasons[0].videos.values_list("video_id", flat=True)),
+            ["pilot", "diversity-day"],
+        )
+        pilot = Video.objects.get(video_id="pilot")
+        self.assertEqual(pilot.user, self.user)
+        self.assertEqual(pilot.slug, "pilot")
+        self.assertIsNotNone(pilot.published_timestamp)
+        movie = MovieProxy.objects.all().get()
+        self.assertEqual(movie.video.video_id, "office-movie")
+
+    def test_import_refreshes_counters(self):
+        """Test the stored counters match the imported rows"""
+        records = [
+            {"type": "show", "key": "office", "title": "The Office"},
+            {
+                "type": "season",
+                "key": "office-1",
+                "parent": "office",
+                "title": "Season 1",
+                "state": "PU",
+            },
+            {
+                "type": "episode",
+                "parent": "office-1",
+                "title": "Pilot",
+                "video_id": "pilot",
+            },
+            {
+                "type": "episode",
+                "parent": "office-1",
+                "title": "Diversity Day",
+                "video_id": "diversity-day",
+            },
+            {
+                "type": "playlist",
+                "title": "Pilot mix",
+                "video_id": "pilot",
+            },
+        ]
+        path = self.write(
+            "catalog.jsonl", "\n".join(json.dumps(r) for r in records)
+        )
+
+        self.run_import(path, batch_size=2)
+
+        show = TVShowProxy.objects.get(title="The Office")
+        self.assertEqual(show.season_count, 1)
+        self.assertEqual(show.get_short_display(), "1 Seasons")
+        season = TVShowSeasonProxy.objects.get(parent=show)
+        self.assertEqual(season.episode_count, 2)
+        self.assertEqual(season.get_short_display(), "2 Episodes")
+
+    def test_import_refreshes_cached_videos(self):
+        """Test cached videos show the playlists an import links them to"""
+        cache.clear()
+        video = Video.objects.create(
+            user=self.user, title="Pilot", video_id="pilot"
+        )
+        self.assertEqual(VideoSerializer(video).data["playlist_item"], [])
+        records = [
+            {"type": "movie", "key": "m", "title": "Movie"},
+            {
+                "type": "episode",
+                "parent": "m",
+                "title": "Pilot",
+                "video_id": "pilot",
+            },
+        ]
+        path = self.write(
+            "catalog.jsonl", "\n".join(json.dumps(r) for r in records)
+        )
+
+        self.run_import(path)
+
+        data = VideoSerializer(Video.objects.get(id=video.id)).data
+        self.assertEqual(
+            [p["title"] for p in data["playlist_item"]], ["Movie"]
+        )
+
+    def test_import_csv_reuses_existing_videos(self):
+        """Test importing from CSV links videos that already exist"""
+        Video.objects.create(user=self.user, title="Pilot", video_id="pilot")
+        path = self.write(
+            "catalog.csv",
+            "type,key,parent,title,video_id,order\n"
+            "playlist,mix,,My Mix,,\n"
+            "episode,,mix,Pilot,pilot,1\n",
+        )
+
+        self.run_import(path)
+
+        playlist = Playlist.objects.get(title="My Mix")
+        self.assertEqual(Video.objects.count(), 1)
+        self.assertEqual(playlist.videos.get().video_id, "pilot")
+
+    def test_unknown_parent(self):
+        """Test an episode pointing at a missing parent is rejected"""
+        path = self.write(
+            "catalog.jsonl",
+            json.dumps(
+                {
+                    "type": "episode",
+                    "parent": "missing",
+                    "title": "Pilot",
+                    "video_id": "pilot",
+                }
+            ),
+        )
+
+        with self.assertRaises(CommandError):
+            self.run_import(path)
+        self.assertFalse(Video.objects.exists())
+
+
+class ExplainCatalogQueriesCommandTest(TestCase):
+    """Test the explain_catalog_queries command"""
+
+    def test_seed_and_explain(self):
+        """Test seeding a catalog and printing a plan for each query"""
+        out = StringIO()
+        call_command("explain_catalog_queries", seed=70, repeat=1, stdout=out)
+
+        self.assertEqual(Playlist.objects.count(), 70)
+        self.assertEqual(TVShowSeasonProxy.objects.all().count(), 21)
+        output = out.getvalue()
+        self.assertIn("Season episodes in order", output)
+        self.assertIn("playlistitem_order_idx", output)
@@ -1,11 +1,17 @@
 """
 Tests for models.
 """
+import itertools
 import random
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 from django.test import TestCase
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.apps import apps
-from django.db.models import Avg
+from django.db.models import Avg, Max, Min
+from django.core.management import call_command
 
 from rest_framework.test import APIClient
 from django.utils.text import slugify
@@ -16,6 +22,8 @@ from django.contrib.contenttypes.models import ContentType
 from core.models import (
     MovieProxy,
     Playlist,
+    PlaylistItem,
+    Tag,
     TaggedItem,
     Video,
     Category,
@@ -23,7 +31,10 @@ from core.models import (
     TVShowProxy,
     TVShowSeasonProxy,
 )
+from core.cache import catalog_version
 from core.db.models import PublishStateOptions, RatingChoices
+from core.db.utils import assign_unique_slugs
+from tags.serializers import TagSerializer
 
 User = get_user_model()
 
@@ -618,6 +629,60 @@ class TaggedItemTestCase(TestCase):
         tag = TaggedItem.objects.create(content_object=obj, tag="another1")
         self.assertIsNotNone(tag.pk)
 
+    def test_tag_strings_are_interned(self):
+        """Test tagged items with the same text share one Tag row."""
+        self.assertEqual(Tag.objects.filter(name="new tag").count(), 1)
+        tags = TaggedItem.objects.filter(tag__name="new tag")
+        self.assertEqual(tags.count(), 2)
+        self.assertEqual(len({item.tag_id for item in tags}), 1)
+        self.assertEqual(str(tags.first()), "new tag")
+
+    def test_duplicate_tag_on_object(self):
+        """Test the same tag cannot be added twice to one object."""
+        with self.assertRaises(IntegrityError):
+            self.playlist_obj.tags.create(tag="new tag")
+
+    def test_intern_many(self):
+        """Test interning many names at once."""
+        tags = Tag.objects.intern_many(["new tag", "fresh", "fresh"])
+
+        self.assertEqual(set(tags), {"new tag", "fresh"})
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_tag_interned_on_save(self):
+        """Test assigning a tag name creates no Tag until the item saves."""
+        item = TaggedItem(content_object=self.playlist_obj, tag="unsaved")
+
+        self.assertEqual(str(item), "unsaved")
+        self.assertFalse(Tag.objects.filter(name="unsaved").exists())
+
+        item.save()
+
+        self.assertEqual(item.tag, Tag.objects.get(name="unsaved"))
+
+    def test_failed_save_creates_no_tag(self):
+        """Test a rejected tagged item leaves no Tag row behind."""
+        with self.assertRaises(IntegrityError):
+            TaggedItem.objects.create(tag="orphan")
+
+        self.assertFalse(Tag.objects.filter(name="orphan").exists())
+
+    def test_tag_serializer_string_api(self):
+        """Test the tag serializer reads and writes plain strings."""
+        c_type = ContentType.objects.get_for_model(Playlist)
+        serializer = TagSerializer(
+            data={
+                "tag": "comedy",
+                "content_type": c_type.id,
+                "object_id": self.playlist_obj.id,
+            }
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        item = serializer.save()
+
+        self.assertEqual(item.tag.name, "comedy")
+        self.assertEqual(TagSerializer().to_representation(item), "comedy")
+
 
 class RatingTestCase(TestCase):
     """Test for Rating model."""
@@ -644,10 +709,10 @@ class RatingTestCase(TestCase):
         """Bulk creation of ratings."""
         items = []
         self.rating_totals = []
-        self.rating_count = 1_000
-        for i in range(0, self.rating_count):
-            user_obj = self.users.order_by("?").first()
-            ply_obj = self.playlists.order_by("?").first()
+        pairs = list(itertools.product(self.users, self.playlists))
+        self.rating_count = min(1_000, len(pairs))
+        pairs = random.sample(pairs, self.rating_count)
+        for user_obj, ply_obj in pairs:
             rating_val = random.choice(RatingChoices.choices)[0]
             if rating_val is not None:
                 self.rating_totals.append(rating_val)
@@ -707,3 +772,356 @@ class RatingTestCase(TestCase):
         ]
         self.assertIsNotNone(item_1)
         self.assertTrue(item_1 > 0)
+
+    def test_rebuild_rating_aggregates(self):
+        """Test rebuilding stored aggregates matches a live aggregate."""
+        call_command(
+            "rebuild_rating_aggregates", chunk_size=7, stdout=StringIO()
+        )
+
+        for playlist in Playlist.objects.all():
+            live = Rating.objects.filter(playlist=playlist).aggregate(
+                average=Avg("value"), max=Max("value"), min=Min("value")
+            )
+            if live["average"] is None:
+                self.assertIsNone(playlist.get_rating_avg())
+                continue
+            self.assertAlmostEqual(
+                playlist.get_rating_avg()["average"], live["average"]
+            )
+            self.assertEqual(
+                playlist.get_rating_spread(),
+                {"max": live["max"], "min": live["min"]},
+            )
+
+
+class RatingAggregateTestCase(TestCase):
+    """Test stored rating aggregates kept current by receivers."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.playlist = create_playlist()
+
+    def rate(self, value, email="rater@example.com"):
+        user = create_user(email=email)
+        return Rating.objects.create(
+            user=user, content_object=self.playlist, value=value
+        )
+
+    def test_no_ratings(self):
+        """Test aggregates are empty without ratings."""
+        self.assertIsNone(self.playlist.get_rating_avg())
+        self.assertIsNone(self.playlist.get_rating_spread())
+
+    def test_rating_created(self):
+        """Test creating ratings updates the playlist aggregates."""
+        self.rate(2, email="a@example.com")
+        self.rate(5, email="b@example.com")
+        self.rate(None, email="c@example.com")
+        self.playlist.refresh_from_db()
+
+        self.assertEqual(self.playlist.rating_count, 2)
+        self.assertEqual(self.playlist.get_rating_avg(), {"average": 3.5})
+        self.assertEqual(
+            self.playlist.get_rating_spread(), {"max": 5, "min": 2}
+        )
+        self.assertEqual(
+            self.playlist.get_rating_histogram(),
+            {1: 0, 2: 1, 3: 0, 4: 0, 5: 1},
+        )
+
+    def test_rating_updated(self):
+        """Test changing a rating value moves it within the histogram."""
+        rating = self.rate(5)
+        rating.value = 1
+        rating.save()
+        self.playlist.refresh_from_db()
+
+        self.assertEqual(self.playlist.rating_count, 1)
+        self.assertEqual(self.playlist.rating_sum, 1)
+        self.assertEqual(
+            self.playlist.get_rating_spread(), {"max": 1, "min": 1}
+        )
+        self.assertEqual(self.playlist.rating_5_count, 0)
+
+    def test_rating_deleted(self):
+        """Test deleting the extreme rating recomputes min and max."""
+        self.rate(3, email="a@example.com")
+        rating = self.rate(5, email="b@example.com")
+        rating.delete()
+        self.playlist.refresh_from_db()
+
+        self.assertEqual(self.playlist.rating_count, 1)
+        self.assertEqual(
+            self.playlist.get_rating_spread(), {"max": 3, "min": 3}
+        )
+
+        Rating.objects.get().delete()
+        self.playlist.refresh_from_db()
+        self.assertIsNone(self.playlist.get_rating_avg())
+        self.assertIsNone(self.playlist.get_rating_spread())
+
+
+class UniqueSlugTestCase(TestCase):
+    """Test the unique slug allocator."""
+
+    def test_deterministic_suffix(self):
+        """Test colliding slugs get the lowest free numeric suffix."""
+        slugs = [create_playlist(title="Season 1").slug for _ in range(3)]
+        self.assertEqual(slugs, ["season-1", "season-1-2", "season-1-3"])
+
+    def test_slug_scoped_to_parent(self):
+        """Test the same slug is allowed under different parents."""
+        show_a = TVShowProxy.objects.create(title="Show A")
+        show_b = TVShowProxy.objects.create(title="Show B")
+        season_a = TVShowSeasonProxy.objects.create(
+            title="Season 1", parent=show_a
+        )
+        season_b = TVShowSeasonProxy.objects.create(
+            title="Season 1", parent=show_b
+        )
+
+        self.assertEqual(season_a.slug, "season-1")
+        self.assertEqual(season_b.slug, "season-1")
+
+    def test_slug_fits_max_length(self):
+        """Test suffixed slugs stay within the column length."""
+        title = "a" * 80
+        create_playlist(title=title)
+        playlist = create_playlist(title=title)
+
+        self.assertEqual(len(playlist.slug), 50)
+        self.assertTrue(playlist.slug.endswith("-2"))
+
+    def test_assign_unique_slugs_batch(self):
+        """Test assigning slugs to many unsaved instances in one query."""
+        show = TVShowProxy.objects.create(title="Show")
+        create_playlist(title="Season 1", parent=show)
+        seasons = [
+            Playlist(title="Season 1", parent=show),
+            Playlist(title="Season 1", parent=show),
+            Playlist(title="Season 2", parent=show),
+            Playlist(title="Season 1"),
+        ]
+
+        with self.assertNumQueries(1):
+            assign_unique_slugs(seasons)
+
+        self.assertEqual(
+            [season.slug for season in seasons],
+            ["season-1-2", "season-1-3", "season-2", "season-1"],
+        )
+
+    def test_retry_on_concurrent_clash(self):
+        """Test a slug taken after allocation is re-allocated on save."""
+        first = create_playlist(title="Race")
+        playlist = Playlist(title="Race")
+
+        with patch(
+            "core.db.receivers.get_unique_slug",
+            side_effect=[first.slug, "race-2"],
+        ):
+            playlist.save()
+
+        self.assertEqual(playlist.slug, "race-2")
+
+    def test_explicit_duplicate_slug_raises(self):
+        """Test a user supplied duplicate slug is not silently changed."""
+        create_playlist(title="Taken")
+
+        with self.assertRaises(IntegrityError):
+            create_playlist(title="Other", slug="taken")
+
+
+class CounterCacheTestCase(TestCase):
+    """Test stored season, episode and featured playlist counters."""
+
+    def setUp(self):
+        self.user = create_user()
+        self.video = create_video(self.user, video_id="a")
+        self.show = TVShowProxy.objects.create(title="Show")
+
+    def create_season(self, **kwargs):
+        defaults = {
+            "title": "Season",
+            "parent": self.show,
+            "state": PublishStateOptions.PUBLISH,
+        }
+        defaults.update(kwargs)
+        return TVShowSeasonProxy.objects.create(**defaults)
+
+    def test_season_count(self):
+        """Test only published seasons are counted on the show."""
+        season = self.create_season()
+        self.create_season(state=PublishStateOptions.DRAFT)
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.season_count, 1)
+        self.assertEqual(self.show.get_short_display(), "1 Seasons")
+
+        season.state = PublishStateOptions.DRAFT
+        season.save()
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.season_count, 0)
+
+    def test_season_count_on_reparent_and_delete(self):
+        """Test moving and deleting seasons updates both shows."""
+        other = TVShowProxy.objects.create(title="Other")
+        season = self.create_season()
+
+        season.parent = other
+        season.save()
+        self.show.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.show.season_count, 0)
+        self.assertEqual(other.season_count, 1)
+
+        season.delete()
+        other.refresh_from_db()
+        self.assertEqual(other.season_count, 0)
+
+    def test_episode_count(self):
+        """Test episode counts follow PlaylistItem and m2m changes."""
+        season = self.create_season()
+        video_b = create_video(self.user, video_id="b")
+
+        season.videos.set([self.video, video_b])
+        season.refresh_from_db()
+        self.assertEqual(season.episode_count, 2)
+
+        season.playlistitem_set.get(video=video_b).delete()
+        season.refresh_from_db()
+        self.assertEqual(season.episode_count, 1)
+
+        self.video.playlist_item.clear()
+        season.refresh_from_db()
+        self.assertEqual(season.episode_count, 0)
+
+        PlaylistItem.objects.create(playlist=season, video=video_b)
+        season.refresh_from_db()
+        self.assertEqual(season.episode_count, 1)
+
+    def test_season_short_display(self):
+        """Test a season displays its stored episode count."""
+        season = self.create_season()
+        season.videos.set([self.video])
+        season = TVShowSeasonProxy.objects.get(pk=season.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(season.get_short_display(), "1 Episodes")
+
+    def test_playlist_ids_prefetched(self):
+        """Test prefetched videos list their playlist ids without queries."""
+        playlist = create_playlist(video=self.video)
+        videos = list(Video.objects.prefetch_related("playlist_featured"))
+
+        with self.assertNumQueries(0):
+            ids = [video.get_playlist_ids() for video in videos]
+        self.assertEqual(ids, [[playlist.id]])
+
+    def test_reconcile_counters(self):
+        """Test the reconcile command fixes drifted counters."""
+        season = self.create_season()
+        season.videos.set([self.video])
+        TVShowProxy.objects.update(season_count=7)
+        TVShowSeasonProxy.objects.update(episode_count=7)
+
+        call_command("reconcile_counters", chunk_size=2, stdout=StringIO())
+
+        self.show.refresh_from_db()
+        season.refresh_from_db()
+        self.assertEqual(self.show.season_count, 1)
+        self.assertEqual(season.episode_count, 1)
+
+    def test_scheduled_season_recounted(self):
+        """Test a season is counted once its scheduled publish passes."""
+        cache.clear()
+        publish_at = timezone.now() + timedelta(hours=1)
+        self.create_season(published_timestamp=publish_at)
+        call_command("reconcile_counters", scheduled=True, stdout=StringIO())
+        version = catalog_version()
+
+        call_command("reconcile_counters", scheduled=True, stdout=StringIO())
+        self.assertEqual(catalog_version(), version)
+
+        later = publish_at + timedelta(minutes=1)
+        with patch("django.utils.timezone.now", return_value=later):
+            call_command(
+                "reconcile_counters", scheduled=True, stdout=StringIO()
+            )
+        self.show.refresh_from_db()
+        self.assertEqual(self.show.season_count, 1)
+        self.assertNotEqual(catalog_version(), version)
+
+
+class PlaylistPathTestCase(TestCase):
+    """Test the materialized ancestor path on playlists."""
+
+    def setUp(self):
+        self.show = TVShowProxy.objects.create(title="Show")
+        self.season = TVShowSeasonProxy.objects.create(
+            title="Season", parent=self.show
+        )
+        self.extra = Playlist.objects.create(
+            title="Extra", parent=self.season
+        )
+
+    def refresh(self):
+        for playlist in (self.show, self.season, self.extra):
+            playlist.refresh_from_db()
+
+    def test_path_on_create(self):
+        """Test paths list the ancestor ids, root first."""
+        self.assertEqual(self.show.path, "/")
+        self.assertEqual(self.season.path, f"/{self.show.id}/")
+        self.assertEqual(
+            self.extra.path, f"/{self.show.id}/{self.season.id}/"
+        )
+
+    def test_descendants_and_ancestors(self):
+        """Test tree helpers each run as one query."""
+        Playlist.objects.create(title="Unrelated")
+
+        with self.assertNumQueries(1):
+            descendants = list(
+                Playlist.objects.descendants_of(self.show).order_by("id")
+            )
+        with self.assertNumQueries(1):
+            ancestors = list(self.extra.get_ancestors())
+
+        self.assertEqual(descendants, [self.season, self.extra])
+        self.assertEqual(ancestors, [self.show, self.season])
+        self.assertEqual(list(self.season.get_descendants()), [self.extra])
+        self.assertEqual(list(self.show.get_ancestors()), [])
+
+    def test_reparent_moves_subtree(self):
+        """Test moving a playlist rewrites the paths below it."""
+        other = TVShowProxy.objects.create(title="Other")
+
+        self.season.parent = other
+        self.season.save()
+        self.refresh()
+
+        self.assertEqual(self.season.path, f"/{other.id}/")
+        self.assertEqual(self.extra.path, f"/{other.id}/{self.season.id}/")
+        self.assertEqual(list(Playlist.objects.descendants_of(self.show)), [])
+
+        self.season.parent = None
+        self.season.save()
+        self.refresh()
+        self.assertEqual(self.extra.path, f"/{self.season.id}/")
+
+    def test_delete_parent_detaches_subtree(self):
+        """Test children of a deleted playlist become roots."""
+        self.show.delete()
+        self.season.refresh_from_db()
+        self.extra.refresh_from_db()
+
+        self.assertEqual(self.season.path, "/")
+        self.assertEqual(self.extra.path, f"/{self.season.id}/")
+
+    def test_cycle_rejected(self):
+        """Test a playlist cannot be moved below its own descendant."""
+        self.show.parent = self.extra
+
+        with self.assertRaises(ValueError):
+            self.show.save()
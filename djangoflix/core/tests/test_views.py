@@ -0,0 +1,474 @@
+"""
+Tests for the catalog HTML views.
+"""
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from django.contrib.auth import get_user_model
+
+from core.cache import (
+    catalog_version,
+    fragment_cache_key,
+    page_cache_key,
+    render_fragments,
+)
+from core.models import (
+    MovieProxy,
+    Playlist,
+    PlaylistItem,
+    TVShowProxy,
+    TVShowSeasonProxy,
+    Video,
+)
+from core.db.models import PlaylistTypeChoices, PublishStateOptions
+from core.singleflight import revalidation_stats
+from core.snapshots import HOME_SNAPSHOT_KEY, home_snapshot_rebuilder
+
+
+def create_show(title, seasons=0, **kwargs):
+    """Create and return a published show with published seasons."""
+    show = TVShowProxy.objects.create(
+        title=title, state=PublishStateOptions.PUBLISH, **kwargs
+    )
+    for number in range(1, seasons + 1):
+        TVShowSeasonProxy.objects.create(
+            title=f"Season {number}",
+            parent=show,
+            order=number,
+            state=PublishStateOptions.PUBLISH,
+        )
+    return show
+
+
+class TVShowListViewTests(TestCase):
+    """Test the TV show list page."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_query_count_constant(self):
+        """Test the list page cost does not grow with the show count."""
+        create_show("Show A", seasons=2)
+        with self.assertNumQueries(1):
+            res = self.client.get("/shows/")
+        self.assertContains(res, "2 Seasons")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                create_show(f"Show {i}", seasons=3)
+        with self.assertNumQueries(1):
+            res = self.client.get("/shows/")
+        self.assertContains(res, "3 Seasons", count=5)
+
+
+class TVShowDetailViewTests(TestCase):
+    """Test the TV show and season detail pages."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="x"
+        )
+        self.show = create_show("Show", seasons=1)
+
+    def add_episodes(self, season, count):
+        for number in range(1, count + 1):
+            video = Video.objects.create(
+                user=self.user,
+                title=f"{season.title} episode {number}",
+                video_id=f"{season.id}-{number}",
+                state=PublishStateOptions.PUBLISH,
+            )
+            PlaylistItem.objects.create(
+                playlist=season, video=video, order=number
+            )
+
+    def test_show_query_count_constant(self):
+        """Test the show page cost does not grow with its seasons."""
+        for season in TVShowSeasonProxy.objects.all():
+            self.add_episodes(season, 2)
+        with self.assertNumQueries(3):
+            res = self.client.get(f"/shows/{self.show.slug}/")
+        self.assertContains(res, "Season 1 episode 2")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for number in range(2, 6):
+                season = TVShowSeasonProxy.objects.create(
+                    title=f"Season {number}",
+                    parent=self.show,
+                    order=number,
+                    state=PublishStateOptions.PUBLISH,
+                )
+                self.add_episodes(season, 3)
+        with self.assertNumQueries(3):
+            res = self.client.get(f"/shows/{self.show.slug}/")
+        self.assertContains(res, "Season 5 episode 3")
+
+    def test_season_episodes(self):
+        """Test the season page lists its episodes in two queries."""
+        season = TVShowSeasonProxy.objects.all().get()
+        self.add_episodes(season, 3)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                f"/shows/{self.show.slug}/seasons/{season.slug}/"
+            )
+        self.assertContains(res, "Season 1 episode 3")
+
+
+class CachedPageTests(TestCase):
+    """Test the catalog page cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.show = create_show("Show A", seasons=1)
+
+    def test_anonymous_pages_cached(self):
+        """Test a repeated anonymous request runs no queries."""
+        self.client.get("/shows/")
+
+        with self.assertNumQueries(0):
+            res = self.client.get("/shows/")
+        self.assertContains(res, "Show A")
+
+    def test_catalog_change_invalidates(self):
+        """Test saving a catalog model serves a fresh page."""
+        self.client.get("/shows/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.show.title = "Renamed show"
+            self.show.save()
+        res = self.client.get("/shows/")
+        self.assertContains(res, "Renamed show")
+
+        season = TVShowSeasonProxy.objects.all().get()
+        self.client.get(f"/shows/{self.show.slug}/")
+        with self.captureOnCommitCallbacks(execute=True):
+            video = Video.objects.create(
+                user=get_user_model().objects.create_user(
+                    email="user@example.com", password="x"
+                ),
+                title="Pilot",
+                video_id="pilot",
+                state=PublishStateOptions.PUBLISH,
+            )
+            PlaylistItem.objects.create(playlist=season, video=video)
+        res = self.client.get(f"/shows/{self.show.slug}/")
+        self.assertContains(res, "Pilot")
+
+    def test_version_bumped_on_commit(self):
+        """Test the catalog version moves once the change commits."""
+        version = catalog_version()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.show.title = "Renamed show"
+            self.show.save()
+        self.assertEqual(catalog_version(), version)
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(catalog_version(), version)
+
+    def test_missing_page_not_cached(self):
+        """Test a 404 is not stored as a page."""
+        res = self.client.get("/shows/unknown/")
+
+        self.assertEqual(res.status_code, 404)
+        self.assertIsNone(cache.get(page_cache_key(res.wsgi_request)))
+
+    def test_authenticated_not_cached(self):
+        """Test signed in users always get a rendered page."""
+        user = get_user_model().objects.create_user(
+            email="user@example.com", password="x"
+        )
+        self.client.force_login(user)
+        self.client.get("/shows/")
+
+        with self.assertNumQueries(3):
+            self.client.get("/shows/")
+
+
+class FragmentCacheTests(TestCase):
+    """Test cached list row fragments."""
+
+    template_name = "playlists/playlist_row.html"
+
+    def setUp(self):
+        cache.clear()
+        create_show("Show 0", seasons=1)
+        create_show("Show 1", seasons=1)
+        create_show("Show 2", seasons=1)
+        self.shows = list(TVShowProxy.objects.all().order_by("id"))
+
+    def test_single_get_many(self):
+        """Test all rows are fetched with one get_many and stored once."""
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get:
+            rows = render_fragments(self.template_name, self.shows)
+
+        get.assert_called_once()
+        self.assertIn("Show 0", rows[0])
+        self.assertIn("1 Seasons", rows[0])
+        keys = [fragment_cache_key(self.template_name, s) for s in self.shows]
+        self.assertEqual(len(cache.get_many(keys)), 3)
+
+    def test_only_changed_row_rendered(self):
+        """Test an unchanged row is served from the cache."""
+        render_fragments(self.template_name, self.shows)
+        for show in self.shows:
+            cache.set(fragment_cache_key(self.template_name, show), "cached")
+
+        changed = self.shows[1]
+        changed.title = "Renamed"
+        changed.save()
+        rows = render_fragments(self.template_name, self.shows)
+
+        self.assertEqual(rows[0], "cached")
+        self.assertIn("Renamed", rows[1])
+        self.assertEqual(rows[2], "cached")
+
+    def test_counter_change_rerenders(self):
+        """Test a show row changes when its season count does."""
+        render_fragments(self.template_name, self.shows)
+        show = self.shows[0]
+        TVShowSeasonProxy.objects.create(
+            title="Season 2",
+            parent=show,
+            state=PublishStateOptions.PUBLISH,
+        )
+        show.refresh_from_db()
+
+        rows = render_fragments(self.template_name, [show])
+
+        self.assertIn("2 Seasons", rows[0])
+
+
+class MissingObjectCacheTests(TestCase):
+    """Test the negative cache for unknown detail slugs."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@example.com", password="x"
+        )
+
+    def test_unknown_slug_cached(self):
+        """Test repeated misses on every detail route skip the database."""
+        urls = [
+            "/movies/unknown/",
+            "/shows/unknown/",
+            "/shows/unknown/seasons/season-1/",
+        ]
+        for url in urls:
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+        with self.assertNumQueries(0):
+            for url in urls:
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_authenticated_misses_cached(self):
+        """Test signed in users share the negative cache."""
+        self.client.get("/movies/unknown/")
+        self.client.force_login(self.user)
+
+        # Session and user lookups only.
+        with self.assertNumQueries(2):
+            res = self.client.get("/movies/unknown/")
+        self.assertEqual(res.status_code, 404)
+
+    def test_created_slug_clears_miss(self):
+        """Test creating or publishing the missing object serves it."""
+        self.assertEqual(self.client.get("/shows/new-show/").status_code, 404)
+        with self.captureOnCommitCallbacks(execute=True):
+            show = create_show("New show")
+        self.assertEqual(self.client.get("/shows/new-show/").status_code, 200)
+
+        season = TVShowSeasonProxy.objects.create(title="Extras", parent=show)
+        url = f"/shows/{show.slug}/seasons/{season.slug}/"
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.captureOnCommitCallbacks(execute=True):
+            season.state = PublishStateOptions.PUBLISH
+            season.save()
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_season_slug_case_insensitive(self):
+        """Test season lookups ignore the case of both slugs."""
+        show = create_show("Show", seasons=1)
+
+        res = self.client.get(f"/shows/{show.slug.upper()}/seasons/SEASON-1/")
+
+        self.assertEqual(res.status_code, 200)
+
+    def test_mixed_case_miss_keeps_slug(self):
+        """Test a miss on a mixed-case slug does not hide the real one."""
+        with self.captureOnCommitCallbacks(execute=True):
+            movie = MovieProxy.objects.create(
+                title="My Movie", state=PublishStateOptions.PUBLISH
+            )
+            show = create_show("My Show")
+
+        for url in [f"/movies/{movie.slug}/", f"/shows/{show.slug}/"]:
+            mixed = url.replace("my-", "My-")
+            self.assertEqual(self.client.get(mixed).status_code, 404)
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+
+@override_settings(HOME_SNAPSHOT_BACKGROUND=False)
+class HomeSnapshotTests(TestCase):
+    """Test the prebuilt featured home page snapshot."""
+
+    def setUp(self):
+        cache.clear()
+
+    def create_featured(self, title, **kwargs):
+        kwargs.setdefault("state", PublishStateOptions.PUBLISH)
+        return Playlist.objects.create(
+            type=PlaylistTypeChoices.PLAYLIST, title=title, **kwargs
+        )
+
+    def test_served_without_queries(self):
+        """Test the home page is served from the snapshot."""
+        self.create_featured("Staff picks")
+        self.client.get("/")
+
+        with self.assertNumQueries(0):
+            res = self.client.get("/")
+        self.assertContains(res, "Staff picks")
+
+    def test_featured_change_rebuilds(self):
+        """Test a committed featured change shows up on the home page."""
+        self.client.get("/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            playlist = self.create_featured("Staff picks")
+        self.assertContains(self.client.get("/"), "Staff picks")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            playlist.delete()
+        self.assertNotContains(self.client.get("/"), "Staff picks")
+
+    def test_other_types_ignored(self):
+        """Test non featured saves leave the snapshot alone."""
+        self.client.get("/")
+        snapshot = cache.get(HOME_SNAPSHOT_KEY)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            create_show("Show")
+        self.assertNotIn(home_snapshot_rebuilder.schedule, callbacks)
+        self.assertEqual(cache.get(HOME_SNAPSHOT_KEY), snapshot)
+
+    def test_scheduled_publish_rebuilds(self):
+        """Test the snapshot is rebuilt once a scheduled publish passes."""
+        publish_at = timezone.now() + timedelta(hours=1)
+        self.create_featured("Premiere", published_timestamp=publish_at)
+        self.assertNotContains(self.client.get("/"), "Premiere")
+
+        later = publish_at + timedelta(minutes=1)
+        with patch("core.snapshots.timezone.now", return_value=later):
+            self.client.get("/")
+            res = self.client.get("/")
+        self.assertContains(res, "Premiere")
+
+    def test_cold_build_read_only(self):
+        """Test a cold home build writes nothing and keeps the caches."""
+        show = create_show("Show", seasons=1)
+        TVShowProxy.objects.update(season_count=7)
+        version = catalog_version()
+
+        self.client.get("/")
+
+        show.refresh_from_db()
+        self.assertEqual(show.season_count, 7)
+        self.assertEqual(catalog_version(), version)
+
+    def test_json(self):
+        """Test the JSON snapshot lists the featured playlists."""
+        playlist = self.create_featured("Staff picks")
+
+        res = self.client.get("/featured.json")
+
+        self.assertEqual(res["Content-Type"], "application/json")
+        data = json.loads(res.content)
+        self.assertEqual([p["id"] for p in data], [playlist.id])
+        self.assertEqual(data[0]["title"], "Staff picks")
+
+
+class StalePageTests(TestCase):
+    """Test stale-while-revalidate on the movie and show lists."""
+
+    def setUp(self):
+        cache.clear()
+        MovieProxy.objects.create(
+            title="Old movie", state=PublishStateOptions.PUBLISH
+        )
+
+    def test_stale_served_while_refreshing(self):
+        """Test a changed list is served stale once, then refreshed."""
+        res = self.client.get("/movies/")
+        self.assertIn("stale-while-revalidate=60", res["Cache-Control"])
+        with self.captureOnCommitCallbacks(execute=True):
+            MovieProxy.objects.create(
+                title="New movie", state=PublishStateOptions.PUBLISH
+            )
+        stale = revalidation_stats["stale"]
+
+        with patch(
+            "core.singleflight._refresh_in_background", return_value=True
+        ), patch("core.singleflight.threading.Thread") as thread:
+            res = self.client.get("/movies/")
+            self.client.get("/movies/")
+
+        self.assertNotContains(res, "New movie")
+        self.assertEqual(revalidation_stats["stale"], stale + 2)
+        # Only one refresh is started for both stale requests.
+        thread.assert_called_once()
+        with patch("core.singleflight.connection.close"):
+            thread.call_args.kwargs["target"]()
+        with self.assertNumQueries(0):
+            res = self.client.get("/movies/")
+        self.assertContains(res, "New movie")
+
+    def test_stale_refreshed_inline_in_transaction(self):
+        """Test a refresh inside a transaction waits for the new page."""
+        self.client.get("/shows/")
+        with self.captureOnCommitCallbacks(execute=True):
+            create_show("New show")
+
+        self.assertContains(self.client.get("/shows/"), "New show")
+
+
+class CursorPageTests(TestCase):
+    """Test keyset pagination of the HTML lists."""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(30):
+            MovieProxy.objects.create(
+                title=f"Movie {i}", state=PublishStateOptions.PUBLISH
+            )
+
+    def test_pages_follow_cursors(self):
+        """Test pages are newest first and linked by opaque cursors."""
+        with self.assertNumQueries(1):
+            res = self.client.get("/movies/")
+        self.assertContains(res, "Movie 29")
+        self.assertEqual(len(res.context["object_list"]), 24)
+        self.assertNotContains(res, "Previous")
+        next_url = res.context["paginator"].get_next_link()
+
+        with self.assertNumQueries(1):
+            res = self.client.get(next_url)
+        self.assertContains(res, "Movie 0")
+        self.assertNotContains(res, "Movie 29")
+        self.assertContains(res, "Previous")
+        self.assertNotContains(res, "Next")
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is a 404."""
+        res = self.client.get("/movies/", {"cursor": "bogus"})
+
+        self.assertEqual(res.status_code, 404)
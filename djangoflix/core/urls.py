@@ -5,6 +5,7 @@ app_name = "std"
 
 urlpatterns = [
     path("", views.FeaturedPlaylistListView.as_view()),
+    path("featured.json", views.featured_playlist_json),
     path("media/<int:pk>/", views.PlaylistDetailView.as_view()),
     path("playlists/", views.PlaylistListView.as_view()),
     path("movies/<slug:slug>/", views.MovieDetailView.as_view()),
@@ -1,26 +1,39 @@
 from django.views.generic import ListView, DetailView
-from django.http import Http404
-from django.utils import timezone
+from django.http import Http404, HttpResponse
+from core.cache import (
+    CachedPageMixin,
+    MissingObjectCacheMixin,
+    render_fragments,
+)
 from core.models import Playlist, MovieProxy, TVShowProxy, TVShowSeasonProxy
-from core.db.models import PublishStateOptions
+from core.pagination import CursorPageMixin
+from core.snapshots import get_home_snapshot
 
 
-class PlaylistMixin:
+class PlaylistMixin(CachedPageMixin):
     template_name = "playlist_list.html"
+    row_template_name = "playlists/playlist_row.html"
     title = None
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
         if self.title is not None:
             context["title"] = self.title
-        print(context)
+        if "object_list" in context:
+            context["rows"] = render_fragments(
+                self.row_template_name, context["object_list"]
+            )
+        elif context.get("object") is not None:
+            context["row"] = render_fragments(
+                self.row_template_name, [context["object"]]
+            )[0]
         return context
 
     def get_queryset(self):
         return super().get_queryset().published()
 
 
-class PlaylistListView(PlaylistMixin, ListView):
+class PlaylistListView(CursorPageMixin, PlaylistMixin, ListView):
     queryset = Playlist.objects.all()
     title = "Playlist"
 
@@ -33,53 +46,68 @@ class PlaylistDetailView(PlaylistMixin, DetailView):
 class FeaturedPlaylistListView(PlaylistMixin, ListView):
     queryset = Playlist.objects.featured_playlist()
     title = "Featured"
+    # Served from the home snapshot, which is rebuilt on change.
+    page_cache_enabled = False
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(get_home_snapshot()["html"])
+
+
+def featured_playlist_json(request):
+    """JSON twin of the featured home page, from the same snapshot."""
+    return HttpResponse(
+        get_home_snapshot()["json"], content_type="application/json"
+    )
 
 
-class MovieListView(PlaylistMixin, ListView):
+class MovieListView(CursorPageMixin, PlaylistMixin, ListView):
     queryset = MovieProxy.objects.all()
     title = "Movies"
+    page_cache_stale = True
 
 
-class MovieDetailView(PlaylistMixin, DetailView):
+class MovieDetailView(MissingObjectCacheMixin, PlaylistMixin, DetailView):
     template_name = "playlists/movie_detail.html"
     queryset = MovieProxy.objects.all()
     title = "Movies"
 
 
-class TVShowListView(PlaylistMixin, ListView):
+class TVShowListView(CursorPageMixin, PlaylistMixin, ListView):
     queryset = TVShowProxy.objects.all()
     title = "TV Show"
+    page_cache_stale = True
 
 
-class TVShowDetailView(PlaylistMixin, DetailView):
+class TVShowDetailView(MissingObjectCacheMixin, PlaylistMixin, DetailView):
     template_name = "playlists/tvshow_detail.html"
     queryset = TVShowProxy.objects.all()
     title = "TV Show"
 
+    def get_queryset(self):
+        return super().get_queryset().with_seasons()
+
 
-class TVShowSeasonDetailView(PlaylistMixin, DetailView):
+class TVShowSeasonDetailView(
+    MissingObjectCacheMixin, PlaylistMixin, DetailView
+):
     template_name = "playlists/season_detail.html"
     queryset = TVShowSeasonProxy.objects.all()
     title = "TV Show"
-
-    def get_object(self):
-        kwargs = self.kwargs
-        show_slug = kwargs.get("showSlug")
-        season_slug = kwargs.get("seasonSlug")
-        now = timezone.now()
-        try:
-            obj = TVShowSeasonProxy.objects.get(
-                state=PublishStateOptions.PUBLISH,
-                published_timestamp__lte=now,
-                parent__slug__iexact=show_slug,
-                slug__iexact=season_slug,
+    missing_object_ignore_case = True
+
+    def get_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        # Slugs are matched case-insensitively, so several rows can match.
+        obj = (
+            queryset.with_episodes()
+            .filter(
+                parent__slug__iexact=self.kwargs.get("showSlug"),
+                slug__iexact=self.kwargs.get("seasonSlug"),
             )
-        except TVShowSeasonProxy.MultipleObjectsReturned:
-            qs = TVShowSeasonProxy.objects.filter(
-                parent__slug__iexact=show_slug, slug__iexact=season_slug
-            ).publish()
-            obj = qs.first()
-        except Exception:
+            .order_by("id")
+            .first()
+        )
+        if obj is None:
             raise Http404
-
         return obj
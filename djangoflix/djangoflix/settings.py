@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     "categories",
     "tags",
     "ratings",
+    "user",
 ]
 
 MIDDLEWARE = [
@@ -95,6 +96,68 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# The default cache keeps hot keys in a per-process LRU (L1_MAX_ENTRIES
+# entries, at most L1_TIMEOUT seconds) in front of the "shared" cache, so
+# writes on another node are seen within L1_TIMEOUT.
+CACHES = {
+    "default": {
+        "BACKEND": "core.cache_backends.TwoTierCache",
+        "LOCATION": "shared",
+        "OPTIONS": {"L1_MAX_ENTRIES": 1000, "L1_TIMEOUT": 5},
+    },
+    "shared": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", "djangoflix"),
+    },
+}
+
+# Anonymous catalog pages are cached until the catalog changes, or for at
+# most CATALOG_CACHE_TIMEOUT seconds so scheduled publishing shows up.
+CATALOG_CACHE_TIMEOUT = 300
+
+# Lists that allow it keep serving their last response for up to
+# CATALOG_STALE_TIMEOUT seconds after it goes stale, while one background
+# thread refreshes it.
+CATALOG_STALE_TIMEOUT = 60
+
+# Detail lookups that 404 are remembered for this long, or until the
+# catalog changes.
+MISSING_OBJECT_CACHE_TIMEOUT = 60
+
+# The home page is served from a prebuilt snapshot, rebuilt on a background
+# thread after featured playlists change or a scheduled publish passes.
+HOME_SNAPSHOT_BACKGROUND = True
+
+# Concurrent misses on one cache key are computed once. Other threads wait
+# up to SINGLE_FLIGHT_WAIT seconds for the result; where a shared lock is
+# used it expires after SINGLE_FLIGHT_LOCK_TIMEOUT seconds.
+SINGLE_FLIGHT_WAIT = 5
+SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+
+# Rendered list rows are keyed on each object's updated stamp and counters,
+# so they only need to expire to make room.
+FRAGMENT_CACHE_TIMEOUT = 3600
+
+# API tokens are resolved from an in-process LRU (TOKEN_CACHE_SIZE entries,
+# TOKEN_CACHE_TTL seconds) backed by the shared cache, which never holds
+# password hashes. Saving a user or deleting a token evicts it once the
+# change commits; other processes catch up within the TTL.
+# Bulk user updates must call token_cache.evict_users().
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL = 10
+TOKEN_SHARED_CACHE_TIMEOUT = 300
+
+# Serialized playlists and videos are cached per object, keyed on the
+# object's updated stamp and the generations of its own scope, which are
+# bumped when the rows nested in it change.
+REPRESENTATION_CACHE_TIMEOUT = 3600
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -138,10 +201,25 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "core.User"
 
+# List endpoints return PAGE_SIZE rows per page with keyset cursors; see
+# core.pagination.
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.CatalogCursorPagination",
+    "PAGE_SIZE": 50,
 }
 
+# Rating submissions are buffered in-process and upserted in batches once
+# the buffer holds RATING_BUFFER_SIZE ratings or RATING_BUFFER_DELAY
+# seconds have passed. A delay of 0 writes every rating immediately.
+RATING_BUFFER_SIZE = 500
+RATING_BUFFER_DELAY = 1.0
+
+# Tag browsing reads per-tag lists of published playlist ids kept in
+# memory. Edits refresh the affected tags; the whole index is reloaded
+# after TAG_POSTINGS_TTL seconds to pick up scheduled publishing.
+TAG_POSTINGS_TTL = 300
+
 # LOGGING = {
 #     "version": 1,
 #     "disable_existing_loggers": False,
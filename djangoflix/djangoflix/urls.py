@@ -35,4 +35,5 @@ urlpatterns = [
     path("api/playlist/", include("playlist.urls")),
     path("api/category/", include("categories.urls")),
     path("api/tags/", include("tags.urls")),
+    path("api/ratings/", include("ratings.urls")),
 ]
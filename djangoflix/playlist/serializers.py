@@ -1,18 +1,93 @@
 """Serializer class for video API."""
 
 from rest_framework import serializers
-from core.models import Playlist
+from core.models import (
+    Category,
+    Playlist,
+    PlaylistItem,
+    TVShowProxy,
+    Video,
+)
+from core.cache import object_scope
+from core.serializers import (
+    CachedListSerializer,
+    RepresentationCacheMixin,
+    SparseFieldsMixin,
+)
 from tags.serializers import TagSerializer
 from categories.serializers import CategorySerializer
 
 
-class PlaylistSerializer(serializers.ModelSerializer):
+class PlaylistSerializer(
+    SparseFieldsMixin, RepresentationCacheMixin, serializers.ModelSerializer
+):
     """Serializer for playlist."""
 
     tags = TagSerializer(many=True, read_only=True)
     category = CategorySerializer(many=False, read_only=True)
 
+    representation_prefetch = ["tags"]
+
     class Meta:
         model = Playlist
         fields = ["title", "description", "type", "id", "category", "tags"]
         read_only_fields = ["id"]
+        list_serializer_class = CachedListSerializer
+        expandable_fields = ["category", "tags"]
+
+    def representation_scopes(self, instance):
+        # Tag edits bump the playlist's scope, category edits their own.
+        return [
+            object_scope(Playlist, instance.pk),
+            object_scope(Category, instance.category_id),
+        ]
+
+
+class EpisodeVideoSerializer(serializers.ModelSerializer):
+    """Serializer for the video of an episode."""
+
+    class Meta:
+        model = Video
+        fields = ["id", "title", "description", "slug", "video_id"]
+        read_only_fields = fields
+
+
+class EpisodeSerializer(serializers.ModelSerializer):
+    """Serializer for an ordered episode of a season."""
+
+    video = EpisodeVideoSerializer(read_only=True)
+
+    class Meta:
+        model = PlaylistItem
+        fields = ["id", "order", "video"]
+        read_only_fields = fields
+
+
+class SeasonSerializer(serializers.ModelSerializer):
+    """Serializer for a season and its episodes."""
+
+    episodes = EpisodeSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Playlist
+        fields = ["id", "title", "slug", "order", "episodes"]
+        read_only_fields = fields
+
+
+class TVShowSerializer(serializers.ModelSerializer):
+    """Serializer for TV shows."""
+
+    class Meta:
+        model = TVShowProxy
+        fields = ["id", "title", "description", "slug", "season_count"]
+        read_only_fields = fields
+
+
+class TVShowDetailSerializer(TVShowSerializer):
+    """Serializer for a TV show with its seasons and episodes."""
+
+    seasons = SeasonSerializer(many=True, read_only=True)
+
+    class Meta(TVShowSerializer.Meta):
+        fields = TVShowSerializer.Meta.fields + ["seasons"]
+        read_only_fields = fields
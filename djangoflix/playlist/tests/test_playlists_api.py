@@ -1,17 +1,31 @@
 """Test for the playlists API."""
 
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 
-from rest_framework import status
+from rest_framework import serializers, status
 from rest_framework.test import APIClient
 
-from core.models import Playlist, Video
+from core.models import (
+    Category,
+    Playlist,
+    PlaylistItem,
+    TaggedItem,
+    TVShowProxy,
+    TVShowSeasonProxy,
+    Video,
+)
 from playlist.serializers import PlaylistSerializer
 from core.db.models import PublishStateOptions
 
 PLAYLIST_URL = reverse("playlist:playlist-list")
+SHOWS_URL = reverse("playlist:tvshow-list")
 
 
 def detail_url(playlist_id):
@@ -19,6 +33,11 @@ def detail_url(playlist_id):
     return reverse("playlist:playlist-detail", args=[playlist_id])
 
 
+def show_url(show_id):
+    """Create and return a TV show detail URL."""
+    return reverse("playlist:tvshow-detail", args=[show_id])
+
+
 def create_playlist(**kwargs):
     """Create and return a sample playlist."""
     defaults = {
@@ -55,6 +74,7 @@ class PrivatePlaylistApiTests(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
         self.user = create_user(
@@ -83,7 +103,7 @@ class PrivatePlaylistApiTests(TestCase):
         serializer = PlaylistSerializer(playlists, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_get_playlist_detail(self):
         """Test get playlist detail."""
@@ -157,3 +177,470 @@ class PrivatePlaylistApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Playlist.objects.filter(id=playlist.id).exists())
+
+
+@override_settings(HOME_SNAPSHOT_BACKGROUND=False)
+class TVShowApiTests(TestCase):
+    """Test the TV show API."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        self.show = TVShowProxy.objects.create(
+            title="Show", state=PublishStateOptions.PUBLISH
+        )
+        self.videos = 0
+
+    def add_season(self, order, episodes=2, **kwargs):
+        defaults = {"state": PublishStateOptions.PUBLISH}
+        defaults.update(kwargs)
+        season = TVShowSeasonProxy.objects.create(
+            title=f"Season {order}", parent=self.show, order=order, **defaults
+        )
+        for number in range(episodes, 0, -1):
+            self.videos += 1
+            video = Video.objects.create(
+                user=self.user,
+                title=f"Episode {number}",
+                video_id=f"video-{self.videos}",
+                state=PublishStateOptions.PUBLISH,
+            )
+            PlaylistItem.objects.create(
+                playlist=season, video=video, order=number
+            )
+        return season
+
+    def test_list_shows(self):
+        """Test only published shows are listed, without seasons."""
+        TVShowProxy.objects.create(title="Draft show")
+
+        res = self.client.get(SHOWS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        results = res.data["results"]
+        self.assertEqual([show["id"] for show in results], [self.show.id])
+        self.assertNotIn("seasons", results[0])
+
+    def test_show_detail_tree(self):
+        """Test the detail nests published seasons and episodes in order."""
+        season_two = self.add_season(2)
+        season_one = self.add_season(1)
+        self.add_season(3, state=PublishStateOptions.DRAFT)
+        draft_video = Video.objects.create(
+            user=self.user, title="Draft", video_id="draft"
+        )
+        PlaylistItem.objects.create(playlist=season_one, video=draft_video)
+
+        res = self.client.get(show_url(self.show.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        seasons = res.data["seasons"]
+        self.assertEqual(
+            [season["id"] for season in seasons],
+            [season_one.id, season_two.id],
+        )
+        self.assertEqual(
+            [episode["video"]["title"] for episode in seasons[0]["episodes"]],
+            ["Episode 1", "Episode 2"],
+        )
+
+    def test_show_detail_query_count(self):
+        """Test the detail cost does not grow with the season count."""
+        # One query for the ETag validators, three for the tree.
+        self.add_season(1)
+        with self.assertNumQueries(4):
+            self.client.get(show_url(self.show.id))
+
+        for order in range(2, 7):
+            self.add_season(order, episodes=4)
+        with self.assertNumQueries(4):
+            res = self.client.get(show_url(self.show.id))
+        self.assertEqual(len(res.data["seasons"]), 6)
+
+    def test_show_etag_follows_show_scope(self):
+        """Test the detail ETag moves with the show, not the catalog."""
+        season = self.add_season(1)
+        etag = self.client.get(show_url(self.show.id))["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_playlist(title="Elsewhere")
+        res = self.client.get(show_url(self.show.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            video = Video.objects.filter(
+                playlistitem__playlist=season
+            ).first()
+            video.title = "Renamed"
+            video.save()
+        res = self.client.get(show_url(self.show.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "Renamed",
+            [e["video"]["title"] for e in res.data["seasons"][0]["episodes"]],
+        )
+
+
+class PlaylistQueryCountTests(TestCase):
+    """Test the playlist API cost does not grow with the playlists."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+
+    def create_playlists(self, count):
+        for i in range(count):
+            category = Category.objects.create(title=f"Category {i}")
+            playlist = create_playlist(title=f"P{i}", category=category)
+            playlist.tags.create(tag=f"tag-{i}")
+            playlist.tags.create(tag="common")
+
+    def test_list_query_count_constant(self):
+        """Test categories are joined and tags prefetched in one query."""
+        self.create_playlists(2)
+        cache.clear()
+        # Page validators, the joined page and the tags.
+        with self.assertNumQueries(3):
+            self.client.get(PLAYLIST_URL)
+
+        self.create_playlists(20)
+        cache.clear()
+        with self.assertNumQueries(3):
+            res = self.client.get(PLAYLIST_URL)
+        item = res.data["results"][0]
+        self.assertEqual(item["category"], "Category 19")
+        self.assertEqual(sorted(item["tags"]), ["common", "tag-19"])
+
+    def test_warm_cache_skips_tags(self):
+        """Test cached playlists are served without the tag query."""
+        self.create_playlists(3)
+        cache.clear()
+        self.client.get(PLAYLIST_URL)
+
+        # A new URL misses the list cache but every row is cached.
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PLAYLIST_URL, {"repeat": 1})
+
+        self.assertEqual(len(queries), 2)
+        sql = " ".join(q["sql"] for q in queries)
+        self.assertNotIn(TaggedItem._meta.db_table, sql)
+        self.assertNotIn("DISTINCT", sql)
+        self.assertEqual(
+            sorted(res.data["results"][0]["tags"]), ["common", "tag-2"]
+        )
+
+    def test_tags_loaded_for_misses_only(self):
+        """Test the tag query covers just the rows missing from the cache."""
+        self.create_playlists(3)
+        cache.clear()
+        self.client.get(PLAYLIST_URL)
+        playlist = Playlist.objects.get(title="P1")
+        playlist.title = "Renamed"
+        playlist.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PLAYLIST_URL, {"repeat": 1})
+
+        tag_queries = [
+            q["sql"] for q in queries if TaggedItem._meta.db_table in q["sql"]
+        ]
+        self.assertEqual(len(tag_queries), 1)
+        self.assertIn(f"IN ({playlist.id})", tag_queries[0])
+        item = res.data["results"][1]
+        self.assertEqual(item["title"], "Renamed")
+        self.assertEqual(sorted(item["tags"]), ["common", "tag-1"])
+
+    def test_detail_query_count(self):
+        """Test the detail loads its category and tags in two queries."""
+        self.create_playlists(1)
+        playlist = Playlist.objects.get()
+        cache.clear()
+
+        # ETag validators, the joined row and the tags.
+        with self.assertNumQueries(3):
+            res = self.client.get(detail_url(playlist.id))
+        self.assertEqual(res.data["category"], "Category 0")
+
+
+@override_settings(HOME_SNAPSHOT_BACKGROUND=False)
+class ConditionalGetTests(TestCase):
+    """Test ETag and Last-Modified handling on the playlist API."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        self.playlist = create_playlist(title="abc")
+
+    def test_list_not_modified(self):
+        """Test a matching If-None-Match gets 304 without serializing."""
+        res = self.client.get(PLAYLIST_URL)
+        etag = res["ETag"]
+
+        # The list and its validators are cached together.
+        with self.assertNumQueries(0):
+            res = self.client.get(PLAYLIST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+    def test_detail_not_modified_since(self):
+        """Test If-Modified-Since is honoured on detail responses."""
+        res = self.client.get(detail_url(self.playlist.id))
+
+        res = self.client.get(
+            detail_url(self.playlist.id),
+            HTTP_IF_MODIFIED_SINCE=res["Last-Modified"],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_invalidate_etag(self):
+        """Test own and nested changes produce a new ETag."""
+        etag = self.client.get(detail_url(self.playlist.id))["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.playlist.tags.create(tag="anime")
+        res = self.client.get(
+            detail_url(self.playlist.id), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+        etag = self.client.get(PLAYLIST_URL)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            create_playlist(title="new")
+        res = self.client.get(PLAYLIST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
+
+    def test_stale_list_keeps_its_etag(self):
+        """Test a stale list is served with its own validators."""
+        res = self.client.get(PLAYLIST_URL)
+        etag = res["ETag"]
+        self.assertIn("private", res["Cache-Control"])
+        self.assertIn("stale-while-revalidate", res["Cache-Control"])
+        with self.captureOnCommitCallbacks(execute=True):
+            create_playlist(title="new")
+
+        with patch(
+            "core.singleflight._refresh_in_background", return_value=True
+        ), patch("core.singleflight.threading.Thread") as thread:
+            res = self.client.get(PLAYLIST_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res["ETag"], etag)
+        thread.assert_called_once()
+
+    def test_missing_detail_not_found(self):
+        """Test a stale ETag for a deleted playlist gets 404."""
+        url = detail_url(self.playlist.id)
+        etag = self.client.get(url)["ETag"]
+        self.playlist.delete()
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(HOME_SNAPSHOT_BACKGROUND=False)
+class RepresentationCacheTests(TestCase):
+    """Test the per-object playlist and video representation cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        self.category = Category.objects.create(title="Drama")
+        self.playlists = [
+            create_playlist(title=f"Playlist {i}", category=self.category)
+            for i in range(3)
+        ]
+        for playlist in self.playlists:
+            playlist.tags.create(tag="anime")
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list is rebuilt from the cached dicts."""
+        res = self.client.get(PLAYLIST_URL)
+
+        # A new URL misses the list cache; ETag validators and the joined
+        # playlist rows only.
+        with patch.object(
+            serializers.ModelSerializer,
+            "to_representation",
+            side_effect=AssertionError("serialized again"),
+        ), self.assertNumQueries(2):
+            cached = self.client.get(PLAYLIST_URL, {"repeat": 1})
+        self.assertEqual(cached.data, res.data)
+
+    def test_tag_and_category_edits_invalidate(self):
+        """Test related edits refresh the playlists that use them."""
+        self.client.get(PLAYLIST_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.playlists[0].tags.create(tag="comedy")
+            self.category.title = "Thriller"
+            self.category.save()
+        res = self.client.get(detail_url(self.playlists[0].id))
+
+        self.assertEqual(sorted(res.data["tags"]), ["anime", "comedy"])
+        self.assertEqual(res.data["category"], "Thriller")
+
+    def test_unrelated_edits_keep_cache(self):
+        """Test a tag edit re-serializes only the playlist it tags."""
+        self.client.get(PLAYLIST_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.playlists[0].tags.create(tag="comedy")
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PLAYLIST_URL, {"repeat": 1})
+
+        tag_queries = [
+            q["sql"] for q in queries if TaggedItem._meta.db_table in q["sql"]
+        ]
+        self.assertEqual(len(tag_queries), 1)
+        self.assertIn(f"IN ({self.playlists[0].id})", tag_queries[0])
+        item = res.data["results"][-1]
+        self.assertEqual(sorted(item["tags"]), ["anime", "comedy"])
+
+    def test_uncommitted_edits_keep_key(self):
+        """Test cached entries move to a new key once a change commits."""
+        self.client.get(detail_url(self.playlists[0].id))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.category.title = "Thriller"
+            self.category.save()
+        # Until the commit readers keep using, and storing, the old key.
+        res = self.client.get(detail_url(self.playlists[0].id), {"a": 1})
+        self.assertEqual(res.data["category"], "Drama")
+        for callback in callbacks:
+            callback()
+
+        res = self.client.get(detail_url(self.playlists[0].id), {"b": 1})
+        self.assertEqual(res.data["category"], "Thriller")
+
+    def test_playlist_edit_invalidates_videos(self):
+        """Test a cached video picks up changes to its playlists."""
+        video = Video.objects.create(
+            user=self.user, title="Pilot", video_id="pilot"
+        )
+        playlist = self.playlists[0]
+        PlaylistItem.objects.create(playlist=playlist, video=video)
+        url = reverse("video:video-detail", args=[video.id])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            playlist.title = "Renamed"
+            playlist.save()
+        res = self.client.get(url)
+        self.assertEqual(res.data["playlist_item"][0]["title"], "Renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            playlist.tags.create(tag="comedy")
+            self.category.title = "Thriller"
+            self.category.save()
+        res = self.client.get(url, {"repeat": 1})
+        nested = res.data["playlist_item"][0]
+        self.assertEqual(sorted(nested["tags"]), ["anime", "comedy"])
+        self.assertEqual(nested["category"], "Thriller")
+
+
+class PlaylistPaginationTests(TestCase):
+    """Test keyset pagination of the playlist API."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        self.playlists = [
+            create_playlist(title=f"Playlist {i}") for i in range(5)
+        ]
+
+    def test_pages_without_count(self):
+        """Test pages are bounded, linked and never run COUNT(*)."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PLAYLIST_URL, {"page_size": 2})
+
+        self.assertNotIn("COUNT", " ".join(q["sql"] for q in queries))
+        ids = [item["id"] for item in res.data["results"]]
+        self.assertEqual(ids, [p.id for p in self.playlists[:-3:-1]])
+        self.assertIsNone(res.data["previous"])
+
+        seen = list(ids)
+        url = res.data["next"]
+        while url:
+            res = self.client.get(url)
+            seen += [item["id"] for item in res.data["results"]]
+            url = res.data["next"]
+        self.assertEqual(seen, [p.id for p in reversed(self.playlists)])
+
+    def test_estimated_count(self):
+        """Test the optional estimate is only added when asked for."""
+        res = self.client.get(PLAYLIST_URL)
+        self.assertNotIn("estimated_count", res.data)
+
+        res = self.client.get(PLAYLIST_URL, {"estimate": 1})
+        self.assertIn("estimated_count", res.data)
+
+
+class SparseFieldsetTests(TestCase):
+    """Test ?fields= and ?expand= on the playlist API."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(title="Drama")
+        for i in range(3):
+            playlist = create_playlist(title=f"P{i}", category=category)
+            playlist.tags.create(tag="anime")
+
+    def test_fields_only(self):
+        """Test only the listed fields are loaded and returned."""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PLAYLIST_URL, {"fields": "id,title"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        for item in res.data["results"]:
+            self.assertEqual(set(item), {"id", "title"})
+        # Page validators and the page rows; no tag or category lookups.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("description", queries[-1]["sql"])
+
+    def test_expand(self):
+        """Test expand adds only the named relations to plain fields."""
+        with self.assertNumQueries(2):
+            res = self.client.get(PLAYLIST_URL, {"expand": "category"})
+
+        item = res.data["results"][0]
+        self.assertEqual(item["category"], "Drama")
+        self.assertIn("description", item)
+        self.assertNotIn("tags", item)
+
+        res = self.client.get(
+            detail_url(item["id"]), {"fields": "id", "expand": "tags"}
+        )
+        self.assertEqual(res.data, {"id": item["id"], "tags": ["anime"]})
+
+    def test_default_unchanged(self):
+        """Test requests without the parameters get every field."""
+        res = self.client.get(PLAYLIST_URL)
+
+        self.assertEqual(
+            set(res.data["results"][0]),
+            {"title", "description", "type", "id", "category", "tags"},
+        )
+
+    def test_unknown_names_rejected(self):
+        """Test unknown fields and expansions are a 400."""
+        res = self.client.get(PLAYLIST_URL, {"fields": "id,secret"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(PLAYLIST_URL, {"expand": "title"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
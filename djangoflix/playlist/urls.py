@@ -4,6 +4,7 @@ from playlist import views
 
 router = DefaultRouter()
 router.register("playlist", views.PlaylistViewSet)
+router.register("shows", views.TVShowViewSet, basename="tvshow")
 
 app_name = "playlist"
 
@@ -1,20 +1,72 @@
 """Views for Playlist API."""
-from playlist.serializers import PlaylistSerializer
+from playlist.serializers import (
+    PlaylistSerializer,
+    TVShowDetailSerializer,
+    TVShowSerializer,
+)
 
-from rest_framework import authentication, permissions
+from rest_framework import permissions
 from rest_framework import viewsets
 
-from core.models import Playlist
+from core.cache import generation_stamp, show_scope
+from core.conditional import StaleWhileRevalidateMixin
+from core.fieldsets import SparseFieldsetMixin
+from core.models import Playlist, TVShowProxy
+from user.authentication import CachedTokenAuthentication
 
 
-class PlaylistViewSet(viewsets.ModelViewSet):
-    """View for playlist APIs."""
+class PlaylistViewSet(
+    SparseFieldsetMixin, StaleWhileRevalidateMixin, viewsets.ModelViewSet
+):
+    """View for playlist APIs.
+
+    Reads accept ``?fields=`` and ``?expand=category,tags``.
+    """
 
     serializer_class = PlaylistSerializer
     queryset = Playlist.objects.all()
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        queryset = self.queryset
-        return queryset.all().order_by("-id").distinct()
+        # The category rides along in the join; the serializer batches
+        # the tags of uncached rows. Neither multiplies rows, so no
+        # DISTINCT is needed.
+        return self.queryset.all().select_related("category").order_by("-id")
+
+    def get_expansions(self):
+        return {
+            "category": lambda queryset: queryset.select_related("category"),
+            "tags": lambda queryset: queryset.prefetch_related("tags"),
+        }
+
+
+class TVShowViewSet(StaleWhileRevalidateMixin, viewsets.ReadOnlyModelViewSet):
+    """View for published TV shows.
+
+    The detail payload nests published seasons, their ordered episodes
+    and videos, loaded in three queries whatever the number of seasons.
+    """
+
+    serializer_class = TVShowDetailSerializer
+    queryset = TVShowProxy.objects.all()
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = self.queryset.all().published().order_by("-id")
+        if self.action == "retrieve":
+            queryset = queryset.with_seasons()
+        return queryset
+
+    def get_validator_version(self):
+        # A show's detail only moves with the show's own scope.
+        if self.action == "retrieve":
+            lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return generation_stamp([show_scope(lookup)])
+        return super().get_validator_version()
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return TVShowSerializer
+        return self.serializer_class
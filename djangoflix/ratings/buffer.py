@@ -0,0 +1,117 @@
+"""Write-behind buffer for rating submissions."""
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, DataError, IntegrityError, connection
+
+from core.models import Rating
+
+logger = logging.getLogger(__name__)
+
+
+class RatingBuffer:
+    """Collect rating writes in memory and flush them as bulk upserts.
+
+    Writes are keyed on (user, content_type, object_id), so repeated
+    clicks on the same object collapse to the latest value before they
+    reach the database. The buffer flushes once it holds ``max_size``
+    ratings or ``max_delay`` seconds after the first pending write. A
+    ``max_delay`` of zero or less flushes every write immediately.
+    A batch the database rejects is halved until the failing rows are
+    isolated, and only those are dropped; rows that fail for any other
+    database error go back into the buffer for the next flush.
+    """
+
+    def __init__(self, max_size=None, max_delay=None):
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, "RATING_BUFFER_SIZE", 500)
+
+    @property
+    def max_delay(self):
+        if self._max_delay is not None:
+            return self._max_delay
+        return getattr(settings, "RATING_BUFFER_DELAY", 1.0)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, user_id, content_type_id, object_id, value):
+        """Queue a rating, flushing when the buffer is full."""
+        with self._lock:
+            self._pending[(user_id, content_type_id, object_id)] = value
+            full = len(self._pending) >= self.max_size
+            if not full:
+                self._schedule()
+        if full or self.max_delay <= 0:
+            self.flush()
+
+    def _schedule(self):
+        # Called with the lock held.
+        if self.max_delay > 0 and self._timer is None:
+            self._timer = threading.Timer(
+                self.max_delay, self._flush_in_background
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _requeue(self, pending):
+        """Put a failed batch back, keeping any newer value for a key."""
+        with self._lock:
+            for key, value in pending.items():
+                self._pending.setdefault(key, value)
+            self._schedule()
+
+    def flush(self):
+        """Write every pending rating and return how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not pending:
+            return 0
+        written = 0
+        batches = [[key + (value,) for key, value in pending.items()]]
+        while batches:
+            rows = batches.pop()
+            try:
+                written += Rating.objects.upsert(
+                    rows, batch_size=self.max_size
+                )
+            except (IntegrityError, DataError):
+                if len(rows) == 1:
+                    logger.exception("Dropped buffered rating %r", rows[0])
+                    continue
+                middle = len(rows) // 2
+                batches += [rows[middle:], rows[:middle]]
+            except DatabaseError:
+                unwritten = [row for batch in batches for row in batch]
+                unwritten += rows
+                logger.exception(
+                    "Requeued %d buffered ratings", len(unwritten)
+                )
+                self._requeue({row[:3]: row[3] for row in unwritten})
+                break
+        return written
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+
+rating_buffer = RatingBuffer()
+atexit.register(rating_buffer.flush)
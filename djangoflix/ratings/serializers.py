@@ -0,0 +1,14 @@
+"""Serializer class for rating API."""
+
+from rest_framework import serializers
+
+from core.models import Rating
+
+
+class RatingSerializer(serializers.ModelSerializer):
+    """Serializer for ratings."""
+
+    class Meta:
+        model = Rating
+        fields = ["id", "content_type", "object_id", "value"]
+        read_only_fields = ["id"]
@@ -0,0 +1,217 @@
+"""Test for the ratings API."""
+
+from unittest.mock import patch
+
+from django.db import IntegrityError, OperationalError
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Playlist, Rating
+from ratings.buffer import RatingBuffer
+
+RATINGS_URL = reverse("ratings:rating-list")
+BULK_URL = reverse("ratings:rating-bulk")
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class PublicRatingApiTests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        """Test auth is required to call API."""
+        res = self.client.get(RATINGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(RATING_BUFFER_DELAY=0)
+class PrivateRatingApiTests(TestCase):
+    """Test authenticated API requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(
+            email="user@example.com",
+            password="test123",
+        )
+        self.client.force_authenticate(self.user)
+        self.playlist = Playlist.objects.create(title="Sample playlist")
+        self.c_type = ContentType.objects.get_for_model(Playlist)
+
+    def payload(self, value, playlist=None):
+        playlist = playlist or self.playlist
+        return {
+            "content_type": self.c_type.id,
+            "object_id": playlist.id,
+            "value": value,
+        }
+
+    def test_create_rating(self):
+        """Test submitting a rating stores it."""
+        res = self.client.post(RATINGS_URL, self.payload(4))
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        rating = Rating.objects.get(user=self.user)
+        self.assertEqual(rating.value, 4)
+        self.playlist.refresh_from_db()
+        self.assertEqual(self.playlist.get_rating_avg(), {"average": 4})
+
+    def test_create_rating_updates_existing(self):
+        """Test rating the same object twice keeps one row."""
+        self.client.post(RATINGS_URL, self.payload(4))
+        self.client.post(RATINGS_URL, self.payload(2))
+
+        ratings = Rating.objects.filter(user=self.user)
+        self.assertEqual(ratings.count(), 1)
+        self.assertEqual(ratings.get().value, 2)
+        self.playlist.refresh_from_db()
+        self.assertEqual(self.playlist.rating_count, 1)
+        self.assertEqual(self.playlist.rating_sum, 2)
+
+    def test_invalid_value(self):
+        """Test a value outside the rating choices is rejected."""
+        res = self.client.post(RATINGS_URL, self.payload(9))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Rating.objects.exists())
+
+    def test_bulk_upsert(self):
+        """Test submitting many ratings in one request."""
+        other = Playlist.objects.create(title="Other playlist")
+        Rating.objects.create(
+            user=self.user, content_object=self.playlist, value=1
+        )
+        payload = [self.payload(5), self.payload(3, playlist=other)]
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(Rating.objects.count(), 2)
+        self.playlist.refresh_from_db()
+        self.assertEqual(
+            self.playlist.get_rating_spread(), {"max": 5, "min": 5}
+        )
+
+    def test_list_limited_to_user(self):
+        """Test list of ratings is limited to authenticated user."""
+        other_user = create_user(email="other@example.com", password="x")
+        Rating.objects.create(
+            user=other_user, content_object=self.playlist, value=1
+        )
+        Rating.objects.create(
+            user=self.user, content_object=self.playlist, value=3
+        )
+
+        res = self.client.get(RATINGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["value"], 3)
+
+
+class RatingBufferTests(TestCase):
+    """Test the write-behind rating buffer."""
+
+    def setUp(self):
+        self.user = create_user(email="user@example.com", password="x")
+        self.playlist = Playlist.objects.create(title="Sample playlist")
+        self.c_type = ContentType.objects.get_for_model(Playlist)
+        self.buffer = RatingBuffer(max_size=3, max_delay=60)
+
+    def tearDown(self):
+        self.buffer.flush()
+
+    def test_writes_are_buffered(self):
+        """Test ratings stay in memory until the buffer is flushed."""
+        self.buffer.add(self.user.id, self.c_type.id, self.playlist.id, 2)
+
+        self.assertEqual(len(self.buffer), 1)
+        self.assertFalse(Rating.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(Rating.objects.get().value, 2)
+
+    def test_repeated_writes_collapse(self):
+        """Test the latest value for a key wins inside the buffer."""
+        for value in (1, 2, 5):
+            self.buffer.add(
+                self.user.id, self.c_type.id, self.playlist.id, value
+            )
+
+        self.assertEqual(len(self.buffer), 1)
+        self.buffer.flush()
+        self.assertEqual(Rating.objects.get().value, 5)
+
+    def test_flush_when_full(self):
+        """Test the buffer flushes once it reaches its size limit."""
+        playlists = [
+            Playlist.objects.create(title=f"Playlist {i}") for i in range(3)
+        ]
+        for playlist in playlists:
+            self.buffer.add(self.user.id, self.c_type.id, playlist.id, 3)
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(Rating.objects.count(), 3)
+
+    def test_operational_error_requeues(self):
+        """Test a batch is kept for the next flush if the database fails."""
+        self.buffer.add(self.user.id, self.c_type.id, self.playlist.id, 2)
+
+        with patch.object(
+            Rating.objects, "upsert", side_effect=OperationalError
+        ), self.assertLogs("ratings.buffer", "ERROR"):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(len(self.buffer), 1)
+
+        self.buffer.add(self.user.id, self.c_type.id, self.playlist.id, 4)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(Rating.objects.get().value, 4)
+
+    def test_integrity_error_drops(self):
+        """Test a batch the database rejects is not retried."""
+        self.buffer.add(self.user.id, self.c_type.id, self.playlist.id, 2)
+
+        with patch.object(
+            Rating.objects, "upsert", side_effect=IntegrityError
+        ), self.assertLogs("ratings.buffer", "ERROR"):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_integrity_error_drops_failing_rows(self):
+        """Test only the rows the database rejects are dropped."""
+        buffer = RatingBuffer(max_size=10, max_delay=60)
+        playlists = [
+            Playlist.objects.create(title=f"Playlist {i}") for i in range(4)
+        ]
+        for playlist in playlists:
+            buffer.add(self.user.id, self.c_type.id, playlist.id, 3)
+        deleted_user_id = self.user.id + 1000
+        buffer.add(deleted_user_id, self.c_type.id, self.playlist.id, 1)
+        upsert = Rating.objects.upsert
+
+        def reject_deleted_user(rows, **kwargs):
+            if any(row[0] == deleted_user_id for row in rows):
+                raise IntegrityError
+            return upsert(rows, **kwargs)
+
+        with patch.object(
+            Rating.objects, "upsert", side_effect=reject_deleted_user
+        ), self.assertLogs("ratings.buffer", "ERROR") as logs:
+            self.assertEqual(buffer.flush(), 4)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(Rating.objects.count(), 4)
+        self.assertEqual(len(buffer), 0)
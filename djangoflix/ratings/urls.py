@@ -0,0 +1,12 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from ratings import views
+
+router = DefaultRouter()
+router.register("ratings", views.RatingViewSet)
+
+app_name = "ratings"
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
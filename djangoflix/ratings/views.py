@@ -1,3 +1,58 @@
-from django.shortcuts import render  # noqa
+"""Views for Rating API."""
+from ratings.buffer import rating_buffer
+from ratings.serializers import RatingSerializer
 
-# Create your views here.
+from rest_framework import mixins, permissions, status
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from core.models import Rating
+from user.authentication import CachedTokenAuthentication
+
+
+class RatingViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """View for rating APIs.
+
+    Ratings are upserted per (user, content_type, object_id). Single
+    submissions go through the write-behind buffer and are accepted
+    before they are stored.
+    """
+
+    serializer_class = RatingSerializer
+    queryset = Rating.objects.all()
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        """Filter queryset to authenticated user."""
+        return self.queryset.filter(user=self.request.user).order_by("-id")
+
+    def create(self, request, *args, **kwargs):
+        """Queue a rating for the authenticated user."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        rating_buffer.add(
+            request.user.id,
+            data["content_type"].id,
+            data["object_id"],
+            data.get("value"),
+        )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        """Upsert many ratings for the authenticated user at once."""
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        count = Rating.objects.upsert(
+            (
+                request.user.id,
+                item["content_type"].id,
+                item["object_id"],
+                item.get("value"),
+            )
+            for item in serializer.validated_data
+        )
+        return Response({"count": count}, status=status.HTTP_200_OK)
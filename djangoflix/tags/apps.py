@@ -1,6 +1,33 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class TagsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tags"
+
+    def ready(self):
+        from core.models import (
+            MovieProxy,
+            Playlist,
+            Tag,
+            TaggedItem,
+            TVShowProxy,
+            TVShowSeasonProxy,
+        )
+        from tags.receivers import (
+            playlist_changed,
+            tag_changed,
+            tag_pre_save,
+            tagged_item_changed,
+        )
+
+        pre_save.connect(tag_pre_save, sender=Tag)
+        post_save.connect(tag_changed, sender=Tag)
+        post_delete.connect(tag_changed, sender=Tag)
+        post_save.connect(tagged_item_changed, sender=TaggedItem)
+        post_delete.connect(tagged_item_changed, sender=TaggedItem)
+        post_save.connect(playlist_changed, sender=Playlist)
+        post_save.connect(playlist_changed, sender=TVShowProxy)
+        post_save.connect(playlist_changed, sender=TVShowSeasonProxy)
+        post_save.connect(playlist_changed, sender=MovieProxy)
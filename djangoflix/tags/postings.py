@@ -0,0 +1,209 @@
+"""In-process postings lists of published playlist ids per tag."""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import bump_generations, get_generations
+from core.db.models import PublishStateOptions
+from core.models import TaggedItem
+
+# Generation of the shared change log; entry n lists what change n touched.
+CHANGES_SCOPE = "tags:postings"
+# Further behind than this, a node rebuilds instead of replaying the log.
+MAX_CHANGES = 1000
+
+
+def _change_key(generation):
+    return f"tags:postings:change:{generation}"
+
+
+def publish_changes(tags=(), playlists=(), timeout=None):
+    """Log changed tag names and playlist ids for every node to replay."""
+    if timeout is None:
+        timeout = getattr(settings, "TAG_POSTINGS_TTL", 300)
+    generation = bump_generations([CHANGES_SCOPE])[CHANGES_SCOPE]
+    cache.set(
+        _change_key(generation), (sorted(tags), sorted(playlists)), timeout
+    )
+
+
+def intersect(lists):
+    """Intersect sorted id arrays, smallest first, by galloping search."""
+    if not lists:
+        return array("q")
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        if not result:
+            break
+        result = _gallop_intersect(result, other)
+    return result
+
+
+def _gallop_intersect(small, large):
+    """Return the ids of ``small`` also present in ``large``.
+
+    Each lookup doubles its step from the previous match position before
+    bisecting, so the cost is O(len(small) * log(len(large) / len(small)))
+    rather than a full merge of both lists.
+    """
+    result = array("q")
+    size = len(large)
+    low = 0
+    for value in small:
+        bound = 1
+        while low + bound < size and large[low + bound] < value:
+            bound *= 2
+        low = bisect_left(
+            large, value, low + bound // 2, min(low + bound + 1, size)
+        )
+        if low >= size:
+            break
+        if large[low] == value:
+            result.append(value)
+    return result
+
+
+class TagPostings:
+    """Sorted ``array('q')`` of published playlist ids for every tag.
+
+    The whole index is loaded with one query and rebuilt after
+    ``TAG_POSTINGS_TTL`` seconds, which also picks up scheduled publish
+    times. In between, changed tags and playlists are marked dirty by
+    signal receivers and only their lists are reloaded on the next read.
+    Once a change commits it is also added to a shared change log, which
+    the other nodes replay the same way. A node only rebuilds everything
+    if it fell too far behind the log.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lists = {}
+        self._built_at = None
+        self._generation = None
+        self._dirty_tags = set()
+        self._dirty_playlists = set()
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "TAG_POSTINGS_TTL", 300)
+
+    def clear(self):
+        """Drop the index; the next read rebuilds it."""
+        with self._lock:
+            self._lists = {}
+            self._built_at = None
+
+    def invalidate_tags(self, names):
+        names = set(names)
+        with self._lock:
+            self._dirty_tags.update(names)
+        transaction.on_commit(partial(publish_changes, tags=names))
+
+    def invalidate_playlists(self, ids):
+        ids = set(ids)
+        with self._lock:
+            self._dirty_playlists.update(ids)
+        transaction.on_commit(partial(publish_changes, playlists=ids))
+
+    def get(self, name):
+        return self._current().get(name, array("q"))
+
+    def counts(self):
+        """Return {tag name: number of published playlists}."""
+        return {name: len(ids) for name, ids in self._current().items()}
+
+    def playlist_ids(self, names):
+        """Return sorted ids of published playlists tagged with all names."""
+        lists = self._current()
+        return intersect([lists.get(name, array("q")) for name in names])
+
+    def _current(self):
+        generation = get_generations([CHANGES_SCOPE])[CHANGES_SCOPE]
+        with self._lock:
+            expired = (
+                self._built_at is None
+                or time.monotonic() - self._built_at > self.ttl
+                or not self._replay(generation)
+            )
+            if expired:
+                self._lists = self._load()
+                self._built_at = time.monotonic()
+                self._generation = generation
+                self._dirty_tags.clear()
+                self._dirty_playlists.clear()
+            elif self._dirty_tags or self._dirty_playlists:
+                self._refresh_dirty()
+            return self._lists
+
+    def _replay(self, generation):
+        """Mark what the logged changes up to ``generation`` touched as
+        dirty; return False if part of the log is missing.
+        """
+        if generation == self._generation:
+            return True
+        if not 0 < generation - self._generation <= MAX_CHANGES:
+            return False
+        keys = [
+            _change_key(n)
+            for n in range(self._generation + 1, generation + 1)
+        ]
+        changes = cache.get_many(keys)
+        if len(changes) != len(keys):
+            return False
+        for tags, playlists in changes.values():
+            self._dirty_tags.update(tags)
+            self._dirty_playlists.update(playlists)
+        self._generation = generation
+        return True
+
+    def _refresh_dirty(self):
+        names = set(self._dirty_tags)
+        if self._dirty_playlists:
+            names.update(
+                TaggedItem.objects.filter(
+                    playlist__id__in=self._dirty_playlists
+                ).values_list("tag__name", flat=True)
+            )
+        self._dirty_tags.clear()
+        self._dirty_playlists.clear()
+        if not names:
+            return
+        lists = {
+            name: ids
+            for name, ids in self._lists.items()
+            if name not in names
+        }
+        lists.update(self._load(names))
+        self._lists = lists
+
+    def _load(self, names=None):
+        queryset = TaggedItem.objects.filter(
+            playlist__state=PublishStateOptions.PUBLISH,
+            playlist__published_timestamp__lte=timezone.now(),
+        )
+        if names is not None:
+            queryset = queryset.filter(tag__name__in=names)
+        rows = (
+            queryset.order_by("tag__name", "object_id")
+            .values_list("tag__name", "object_id")
+            .distinct()
+        )
+        lists = {}
+        for name, object_id in rows.iterator():
+            lists.setdefault(name, array("q")).append(object_id)
+        return lists
+
+
+tag_postings = TagPostings()
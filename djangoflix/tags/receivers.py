@@ -0,0 +1,27 @@
+"""Keep the tag postings lists in step with tag and playlist changes."""
+
+from tags.postings import tag_postings
+
+
+def tag_pre_save(sender, instance, *args, **kwargs):
+    instance._previous_name = None
+    if instance.pk is not None:
+        instance._previous_name = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("name", flat=True)
+            .first()
+        )
+
+
+def tag_changed(sender, instance, *args, **kwargs):
+    """A rename moves the tag's postings list to its new name."""
+    names = {instance.name, getattr(instance, "_previous_name", None)}
+    tag_postings.invalidate_tags(names - {None})
+
+
+def tagged_item_changed(sender, instance, *args, **kwargs):
+    tag_postings.invalidate_tags([instance.tag.name])
+
+
+def playlist_changed(sender, instance, *args, **kwargs):
+    tag_postings.invalidate_playlists([instance.pk])
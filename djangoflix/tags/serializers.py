@@ -2,9 +2,18 @@ from rest_framework import serializers
 from core.models import TaggedItem
 
 
+class TagNameField(serializers.SlugField):
+    """Tag name, stored on TaggedItem as a reference to a Tag row."""
+
+    def to_representation(self, value):
+        return str(value)
+
+
 class TagSerializer(serializers.ModelSerializer):
     """Serializer for videos."""
 
+    tag = TagNameField(max_length=50)
+
     class Meta:
         model = TaggedItem
         fields = ["tag", "content_type", "object_id"]
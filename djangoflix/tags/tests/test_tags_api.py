@@ -0,0 +1,245 @@
+"""Test for the tags API."""
+
+from array import array
+from unittest.mock import patch
+
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.cache import bump_generations
+from core.db.models import PublishStateOptions
+from core.models import Playlist, Tag, TaggedItem
+from tags.postings import (
+    CHANGES_SCOPE,
+    TagPostings,
+    intersect,
+    publish_changes,
+    tag_postings,
+)
+
+BROWSE_URL = reverse("tags:taggeditem-browse")
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_playlist(tags=(), **kwargs):
+    """Create and return a published playlist with ``tags``."""
+    defaults = {"title": "Sample", "state": PublishStateOptions.PUBLISH}
+    defaults.update(kwargs)
+    playlist = Playlist.objects.create(**defaults)
+    for name in tags:
+        playlist.tags.create(tag=name)
+    return playlist
+
+
+class IntersectTests(TestCase):
+    """Test the galloping intersection of postings lists."""
+
+    def test_intersect(self):
+        """Test only ids present in every list are returned, in order."""
+        lists = [
+            array("q", range(0, 1000, 2)),
+            array("q", range(0, 1000, 3)),
+            array("q", [6, 7, 12, 500, 996, 2000]),
+        ]
+
+        self.assertEqual(list(intersect(lists)), [6, 12, 996])
+
+    def test_intersect_matches_sets(self):
+        """Test the result equals a plain set intersection."""
+        small = array("q", [1, 5, 99, 100, 4097, 9999])
+        large = array("q", range(0, 10000, 7))
+
+        expected = sorted(set(small) & set(large))
+        self.assertEqual(list(intersect([large, small])), expected)
+
+    def test_intersect_empty(self):
+        """Test an empty or missing list empties the result."""
+        self.assertEqual(list(intersect([])), [])
+        self.assertEqual(
+            list(intersect([array("q", [1, 2]), array("q")])), []
+        )
+
+
+class PublicTagApiTests(TestCase):
+    """Test unauthenticated API requests."""
+
+    def test_auth_required(self):
+        """Test auth is required to browse tags."""
+        res = APIClient().get(BROWSE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(HOME_SNAPSHOT_BACKGROUND=False)
+class TagBrowseApiTests(TestCase):
+    """Test browsing published playlists by tag."""
+
+    def setUp(self):
+        tag_postings.clear()
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        self.anime = create_playlist(title="Anime", tags=["anime"])
+        self.both = create_playlist(
+            title="Anime comedy", tags=["anime", "comedy"]
+        )
+        self.draft = create_playlist(
+            title="Draft",
+            tags=["anime", "comedy"],
+            state=PublishStateOptions.DRAFT,
+        )
+
+    def tearDown(self):
+        tag_postings.clear()
+
+    def test_tag_counts(self):
+        """Test browsing without tags lists published playlists per tag."""
+        res = self.client.get(BROWSE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"anime": 2, "comedy": 1})
+
+    def test_browse_intersection(self):
+        """Test only published playlists with every tag are returned."""
+        res = self.client.get(BROWSE_URL, {"tags": "anime,comedy"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 1)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [self.both.id]
+        )
+
+    def test_browse_newest_first_with_limit(self):
+        """Test matches are returned newest first up to ``limit``."""
+        res = self.client.get(BROWSE_URL, {"tags": "anime", "limit": 1})
+
+        self.assertEqual(res.data["count"], 2)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [self.both.id]
+        )
+
+    def test_browse_invalid_limit(self):
+        """Test a non-numeric limit is rejected."""
+        res = self.client.get(BROWSE_URL, {"tags": "anime", "limit": "x"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_postings_follow_tag_changes(self):
+        """Test adding and removing tags updates the built index."""
+        self.assertEqual(list(tag_postings.get("comedy")), [self.both.id])
+
+        self.anime.tags.create(tag="comedy")
+        TaggedItem.objects.filter(object_id=self.both.id).delete()
+
+        self.assertEqual(list(tag_postings.get("comedy")), [self.anime.id])
+        self.assertEqual(list(tag_postings.get("anime")), [self.anime.id])
+
+    def test_postings_follow_publishing(self):
+        """Test publishing and unpublishing a playlist updates the index."""
+        self.assertEqual(
+            list(tag_postings.playlist_ids(["anime", "comedy"])),
+            [self.both.id],
+        )
+
+        self.draft.state = PublishStateOptions.PUBLISH
+        self.draft.save()
+        self.both.state = PublishStateOptions.DRAFT
+        self.both.save()
+
+        self.assertEqual(
+            list(tag_postings.playlist_ids(["anime", "comedy"])),
+            [self.draft.id],
+        )
+
+    def test_postings_follow_tag_rename(self):
+        """Test renaming a tag moves its list to the new name."""
+        tag_postings.counts()
+
+        tag = Tag.objects.get(name="comedy")
+        tag.name = "sitcom"
+        tag.save()
+
+        counts = tag_postings.counts()
+        self.assertEqual(counts["sitcom"], 1)
+        self.assertNotIn("comedy", counts)
+
+    def test_incremental_refresh_single_query(self):
+        """Test a tag change reloads only the affected list."""
+        tag_postings.counts()
+        self.anime.tags.create(tag="drama")
+
+        with self.assertNumQueries(1):
+            counts = tag_postings.counts()
+        self.assertEqual(counts["drama"], 1)
+
+    def test_local_change_not_rebuilt(self):
+        """Test a committed playlist edit reloads only its tags."""
+        tag_postings.counts()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.both.title = "Renamed"
+            self.both.save()
+
+        with patch.object(
+            TagPostings, "_load", autospec=True, return_value={}
+        ) as load:
+            tag_postings.counts()
+        load.assert_called_once_with(tag_postings, {"anime", "comedy"})
+
+    def test_postings_follow_other_nodes(self):
+        """Test changes logged by another node refresh only their tags."""
+        tag_postings.counts()
+        # Another node unpublishes; no signal reaches this process.
+        Playlist.objects.filter(id=self.both.id).update(
+            state=PublishStateOptions.DRAFT
+        )
+        self.assertEqual(tag_postings.counts()["comedy"], 1)
+
+        publish_changes(playlists=[self.both.id])
+
+        # The playlist's tag names and their lists.
+        with self.assertNumQueries(2):
+            counts = tag_postings.counts()
+        self.assertNotIn("comedy", counts)
+        self.assertEqual(counts["anime"], 1)
+
+    def test_gap_in_log_rebuilds(self):
+        """Test a node that missed logged changes rebuilds the index."""
+        tag_postings.counts()
+        Playlist.objects.filter(id=self.both.id).update(
+            state=PublishStateOptions.DRAFT
+        )
+
+        bump_generations([CHANGES_SCOPE])
+
+        self.assertNotIn("comedy", tag_postings.counts())
+
+
+class TagRenameTests(TestCase):
+    """Test renaming a Tag reaches the cached API responses."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+        self.playlist = create_playlist(tags=["anime"])
+
+    def test_rename_shows_in_playlist(self):
+        """Test a renamed tag is served on the playlist right away."""
+        url = reverse("playlist:playlist-detail", args=[self.playlist.id])
+        self.assertEqual(self.client.get(url).data["tags"], ["anime"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = Tag.objects.get(name="anime")
+            tag.name = "animation"
+            tag.save()
+
+        self.assertEqual(self.client.get(url).data["tags"], ["animation"])
@@ -1,16 +1,64 @@
+from tags.postings import tag_postings
 from tags.serializers import TagSerializer
 
-from rest_framework import authentication, permissions
+from rest_framework import permissions
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 
-from core.models import TaggedItem
+from core.conditional import StaleWhileRevalidateMixin
+from core.models import Playlist, TaggedItem
+from user.authentication import CachedTokenAuthentication
+from playlist.serializers import PlaylistSerializer
+
+BROWSE_LIMIT = 50
+BROWSE_MAX_LIMIT = 500
 
 
 # Create your views here.
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(StaleWhileRevalidateMixin, viewsets.ModelViewSet):
     """View for tag APIs."""
 
     serializer_class = TagSerializer
     queryset = TaggedItem.objects.all()
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    # Tagged items have no timestamp; the catalog version covers edits.
+    last_modified_field = None
+
+    @action(detail=False, methods=["get"])
+    def browse(self, request, *args, **kwargs):
+        """Published playlists carrying every tag in ``?tags=a,b``.
+
+        Without ``tags`` the number of published playlists per tag is
+        returned. Matches come from the in-memory postings lists, newest
+        first, and only the ``limit`` playlists shown are loaded.
+        """
+        names = [
+            name.strip()
+            for name in request.query_params.get("tags", "").split(",")
+            if name.strip()
+        ]
+        if not names:
+            return Response(tag_postings.counts())
+        try:
+            limit = int(request.query_params.get("limit", BROWSE_LIMIT))
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+        limit = max(0, min(limit, BROWSE_MAX_LIMIT))
+
+        ids = tag_postings.playlist_ids(names)
+        start = max(len(ids) - limit, 0)
+        playlists = (
+            Playlist.objects.filter(id__in=ids[start:].tolist())
+            .select_related("category")
+            .prefetch_related("tags")
+            .order_by("-id")
+        )
+        return Response(
+            {
+                "count": len(ids),
+                "results": PlaylistSerializer(playlists, many=True).data,
+            }
+        )
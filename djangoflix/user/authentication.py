@@ -0,0 +1,168 @@
+"""Token authentication backed by an in-process and a shared cache."""
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+def token_cache_key(key):
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f"auth:token:{digest}"
+
+
+def _user_fields():
+    # The password hash never leaves the process; it is deferred and
+    # only read from the database if something asks for it.
+    return [
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname != "password"
+    ]
+
+
+def dump_token(token):
+    """Return the plain data stored for ``token`` in the shared cache."""
+    fields = _user_fields()
+    return {
+        "key": token.key,
+        "created": token.created,
+        "user_fields": fields,
+        "user_values": [getattr(token.user, name) for name in fields],
+    }
+
+
+def load_token(data):
+    """Rebuild a Token and its User from ``dump_token`` output."""
+    Token = apps.get_model("authtoken", "Token")
+    User = get_user_model()
+    if data["user_fields"] != _user_fields():
+        return None
+    user = User.from_db(
+        router.db_for_read(User), data["user_fields"], data["user_values"]
+    )
+    token = Token.from_db(
+        router.db_for_read(Token),
+        ["key", "user_id", "created"],
+        [data["key"], user.pk, data["created"]],
+    )
+    token.user = user
+    return token
+
+
+class TokenCache:
+    """Least recently used map of token key -> Token, with a TTL.
+
+    Misses fall through to the shared cache before the database. Tokens
+    are stored pickled, so every request gets its own Token and User to
+    modify. The shared cache holds them as plain data without the
+    password hash. Entries are evicted from both tiers once the deletion
+    of the token or the save of its user commits; other processes drop
+    their copy after at most ``TOKEN_CACHE_TTL`` seconds. Bulk
+    ``update()`` calls on users send no signal and must call
+    ``evict_users`` themselves.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, "TOKEN_CACHE_SIZE", 10000)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, "TOKEN_CACHE_TTL", 10)
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                pickled, expires = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    return pickle.loads(pickled)
+                del self._entries[key]
+        data = cache.get(token_cache_key(key))
+        if data is None:
+            return None
+        token = load_token(data)
+        if token is not None:
+            self._remember(key, token)
+        return token
+
+    def set(self, key, token):
+        cache.set(
+            token_cache_key(key),
+            dump_token(token),
+            getattr(settings, "TOKEN_SHARED_CACHE_TIMEOUT", 300),
+        )
+        self._remember(key, token)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        cache.delete_many([token_cache_key(key) for key in keys])
+
+    def evict_users(self, user_ids):
+        """Drop the cached tokens of ``user_ids``."""
+        Token = apps.get_model("authtoken", "Token")
+        keys = list(
+            Token.objects.filter(user_id__in=user_ids).values_list(
+                "key", flat=True
+            )
+        )
+        if keys:
+            self.delete(*keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, token):
+        pickled = pickle.dumps(token, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (pickled, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in TokenAuthentication that skips the token lookup query."""
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is not None:
+            if not token.user.is_active:
+                token_cache.delete(key)
+                raise exceptions.AuthenticationFailed(
+                    _("User inactive or deleted.")
+                )
+            return (token.user, token)
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, token)
+        return (user, token)
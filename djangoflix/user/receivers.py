@@ -0,0 +1,21 @@
+"""Evict cached tokens when they or their users change."""
+
+from functools import partial
+
+from django.db import transaction
+
+from user.authentication import token_cache
+
+
+def token_deleted(sender, instance, *args, **kwargs):
+    """Evict the token once the delete commits.
+
+    Evicting earlier would let a concurrent request read the old row and
+    cache it again for ``TOKEN_SHARED_CACHE_TIMEOUT`` seconds.
+    """
+    transaction.on_commit(partial(token_cache.delete, instance.key))
+
+
+def user_changed(sender, instance, *args, **kwargs):
+    # Covers deactivation, password changes and profile edits alike.
+    transaction.on_commit(partial(token_cache.evict_users, [instance.pk]))
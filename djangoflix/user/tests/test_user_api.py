@@ -1,12 +1,16 @@
 """Test for the User API."""
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from user.authentication import TokenCache, token_cache, token_cache_key
+
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
 ME_URL = reverse("user:me")
@@ -149,3 +153,142 @@ class PrivateUSerApiTest(TestCase):
         self.assertEqual(self.user.name, payload["name"])
         self.assertTrue(self.user.check_password(payload["password"]))
         self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test token authentication through the token cache."""
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user = create_user(
+            email="test@example.com", password="testpass123", name="Test"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_token_lookup_cached(self):
+        """Test only the first request looks the token up."""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_shared_cache_fallback(self):
+        """Test a process with a cold LRU reads the shared cache."""
+        self.client.get(ME_URL)
+        token_cache.clear()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token stops working at once."""
+        self.client.get(ME_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.token.delete()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test deactivating the user evicts the cached token."""
+        self.client.get(ME_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_eviction_waits_for_commit(self):
+        """Test the token is evicted only once the user change commits."""
+        self.client.get(ME_URL)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.is_active = False
+            self.user.save()
+        # A reader before the commit would cache the old row again.
+        self.assertIsNotNone(token_cache.get(self.token.key))
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_shared_cache_omits_password(self):
+        """Test the shared tier never stores the password hash."""
+        self.client.get(ME_URL)
+        token_cache.clear()
+
+        data = cache.get(token_cache_key(self.token.key))
+        self.assertNotIn(self.user.password, repr(data))
+        token = token_cache.get(self.token.key)
+        self.assertEqual(token.user.email, self.user.email)
+        with self.assertNumQueries(1):
+            self.assertTrue(token.user.check_password("testpass123"))
+
+    def test_cached_user_not_shared(self):
+        """Test each request gets its own copy of the cached user."""
+        token_cache.set(self.token.key, self.token)
+
+        first = token_cache.get(self.token.key)
+        first.user.name = "Unsaved"
+
+        second = token_cache.get(self.token.key)
+        self.assertIsNot(second.user, first.user)
+        self.assertEqual(second.user.name, "Test")
+
+    def test_inactive_cached_user_rejected(self):
+        """Test a hit for an inactive user is rejected and evicted."""
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+        token = Token.objects.select_related("user").get(pk=self.token.pk)
+        token_cache.set(self.token.key, token)
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_evict_users(self):
+        """Test tokens can be evicted after a bulk update."""
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk).update(
+            is_active=False
+        )
+
+        token_cache.evict_users([self.user.pk])
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_evicts(self):
+        """Test a password change through the API refreshes the user."""
+        self.client.get(ME_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(ME_URL, {"password": "newpassword123"})
+
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is dropped when full."""
+        lru = TokenCache(max_size=2, ttl=60)
+        for key in ("a", "b"):
+            lru._remember(key, key)
+        lru.get("a")
+        lru._remember("c", "c")
+
+        self.assertEqual(list(lru._entries), ["a", "c"])
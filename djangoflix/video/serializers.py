@@ -1,11 +1,36 @@
 """Serializer class for video API."""
 
+from django.db.models import Prefetch
+
 from rest_framework import serializers
 from playlist.serializers import PlaylistSerializer
-from core.models import Video, Playlist
+from core.models import Playlist, TaggedItem, Video
+from core.cache import object_scope
+from core.serializers import (
+    CachedListSerializer,
+    RepresentationCacheMixin,
+    SparseFieldsMixin,
+)
+
+
+def playlists_prefetch():
+    """Prefetch each video's playlists with their category and tags.
 
+    Playlists come back in ``PlaylistItem`` order, read from the join
+    table the prefetch already goes through, so the whole graph is three
+    queries however many videos are listed.
+    """
+    playlists = (
+        Playlist.objects.select_related("category")
+        .prefetch_related(Prefetch("tags", queryset=TaggedItem.objects.all()))
+        .order_by("playlistitem__order", "-playlistitem__timestamp")
+    )
+    return Prefetch("playlist_item", queryset=playlists)
 
-class VideoSerializer(serializers.ModelSerializer):
+
+class VideoSerializer(
+    SparseFieldsMixin, RepresentationCacheMixin, serializers.ModelSerializer
+):
     """Serializer for videos."""
 
     playlist_item = PlaylistSerializer(many=True, required=False)
@@ -14,6 +39,15 @@ class VideoSerializer(serializers.ModelSerializer):
         model = Video
         fields = ["title", "description", "id", "video_id", "playlist_item"]
         read_only_fields = ["id"]
+        list_serializer_class = CachedListSerializer
+        expandable_fields = ["playlist_item"]
+
+    def get_representation_prefetch(self):
+        return [playlists_prefetch()]
+
+    def representation_scopes(self, instance):
+        # Bumped by changes to the video's playlists and what they nest.
+        return [object_scope(Video, instance.pk)]
 
     def update(self, instance, validated_data):
 
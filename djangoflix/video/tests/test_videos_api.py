@@ -1,13 +1,18 @@
 """Test for the videos API."""
+from datetime import timedelta
 
+from django.core.cache import cache
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import Video
+from core.models import Category, Playlist, PlaylistItem, Video
 from video.serializers import VideoSerializer
 from core.db.models import PublishStateOptions
 
@@ -55,6 +60,7 @@ class PrivateVideoApiTests(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = create_user(
             email="user@example.com",
@@ -77,7 +83,7 @@ class PrivateVideoApiTests(TestCase):
         serializer = VideoSerializer(videos, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_video_list_limited_to_user(self):
         """Test list of videos is limited to authenticated user."""
@@ -93,7 +99,7 @@ class PrivateVideoApiTests(TestCase):
         videos = Video.objects.filter(user=self.user)
         serializer = VideoSerializer(videos, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data["results"], serializer.data)
 
     def test_get_video_detail(self):
         """Test get video detail."""
@@ -196,3 +202,100 @@ class PrivateVideoApiTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
         self.assertTrue(Video.objects.filter(id=video.id).exists())
+
+    def test_sparse_fields_skip_playlists(self):
+        """Test unrequested playlists are neither queried nor returned."""
+        video = create_video(user=self.user, video_id="abc")
+        playlist = Playlist.objects.create(title="Mix")
+        playlist.tags.create(tag="anime")
+        video.playlist_item.add(playlist)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(VIDEOS_URL, {"fields": "id,title"})
+        self.assertEqual(
+            res.data["results"], [{"id": video.id, "title": video.title}]
+        )
+
+        res = self.client.get(
+            VIDEOS_URL, {"fields": "id", "expand": "playlist_item"}
+        )
+        item = res.data["results"][0]
+        self.assertEqual(item["playlist_item"][0]["tags"], ["anime"])
+
+
+class VideoQueryCountTests(TestCase):
+    """Test the video API cost does not grow with the nested playlists."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email="user@example.com", password="x")
+        self.client.force_authenticate(self.user)
+
+    def create_videos(self, count):
+        start = Video.objects.count()
+        for i in range(start, start + count):
+            video = create_video(user=self.user, video_id=f"v{i}")
+            for order in (2, 1):
+                category = Category.objects.create(title=f"C{i}-{order}")
+                playlist = Playlist.objects.create(
+                    title=f"P{i}-{order}", category=category
+                )
+                playlist.tags.create(tag=f"tag-{i}-{order}")
+                PlaylistItem.objects.create(
+                    playlist=playlist, video=video, order=order
+                )
+
+    def test_list_query_count_constant(self):
+        """Test playlists, categories and tags are prefetched together."""
+        self.create_videos(2)
+        cache.clear()
+        # Page validators, the page, its playlists and their tags.
+        with self.assertNumQueries(4):
+            self.client.get(VIDEOS_URL)
+
+        self.create_videos(20)
+        cache.clear()
+        with self.assertNumQueries(4):
+            res = self.client.get(VIDEOS_URL)
+        playlists = res.data["results"][0]["playlist_item"]
+        self.assertEqual([p["title"] for p in playlists], ["P21-1", "P21-2"])
+        self.assertEqual(playlists[0]["category"], "C21-1")
+        self.assertEqual(playlists[0]["tags"], ["tag-21-1"])
+
+    def test_playlists_in_item_order(self):
+        """Test nested playlists follow item order, newest first on ties."""
+        video = create_video(user=self.user)
+        now = timezone.now()
+        for title, order, age in [
+            ("Old", 1, 2),
+            ("First", 0, 0),
+            ("New", 1, 1),
+        ]:
+            item = PlaylistItem.objects.create(
+                playlist=Playlist.objects.create(title=title),
+                video=video,
+                order=order,
+            )
+            PlaylistItem.objects.filter(id=item.id).update(
+                timestamp=now - timedelta(days=age)
+            )
+        cache.clear()
+
+        res = self.client.get(detail_url(video.id))
+
+        titles = [p["title"] for p in res.data["playlist_item"]]
+        self.assertEqual(titles, ["First", "New", "Old"])
+
+    def test_warm_cache_skips_playlists(self):
+        """Test cached videos are served without the nested queries."""
+        self.create_videos(3)
+        cache.clear()
+        res = self.client.get(VIDEOS_URL)
+
+        # A new URL misses the list cache; validators and the page only.
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(VIDEOS_URL, {"repeat": 1})
+
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("DISTINCT", " ".join(q["sql"] for q in queries))
+        self.assertEqual(cached.data["results"], res.data["results"])
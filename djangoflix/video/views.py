@@ -1,27 +1,41 @@
 """Views for Video API."""
-from video.serializers import VideoSerializer
+from video.serializers import VideoSerializer, playlists_prefetch
 
-from rest_framework import authentication, permissions
+from rest_framework import permissions
 from rest_framework import viewsets
 
+from core.conditional import StaleWhileRevalidateMixin
+from core.fieldsets import SparseFieldsetMixin
 from core.models import Video
+from user.authentication import CachedTokenAuthentication
 
 
-class VideoViewSet(viewsets.ModelViewSet):
-    """View for video APIs."""
+class VideoViewSet(
+    SparseFieldsetMixin, StaleWhileRevalidateMixin, viewsets.ModelViewSet
+):
+    """View for video APIs.
+
+    Reads accept ``?fields=`` and ``?expand=playlist_item``.
+    """
 
     serializer_class = VideoSerializer
     queryset = Video.objects.all()
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        """Filter queryset to authenticated user."""
-        return (
-            Video.objects.filter(user=self.request.user)
-            .order_by("-id")
-            .distinct()
-        )
+        """Filter queryset to authenticated user.
+
+        The serializer prefetches the playlists of uncached videos.
+        """
+        return Video.objects.filter(user=self.request.user).order_by("-id")
+
+    def get_expansions(self):
+        return {
+            "playlist_item": lambda queryset: queryset.prefetch_related(
+                playlists_prefetch()
+            ),
+        }
 
     def perform_create(self, serializer):
         """Create a new video."""